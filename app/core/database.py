@@ -1,7 +1,11 @@
 """Database connection module"""
-from pymongo import MongoClient
+from pymongo import MongoClient, monitoring
 from pymongo.errors import ServerSelectionTimeoutError
+from collections import defaultdict
+from contextlib import contextmanager
+from threading import Lock, local
 import os
+import time
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -9,39 +13,216 @@ load_dotenv()
 MONGO_URI = os.getenv("MONGO_URI", "mongodb://localhost:27017")
 DB_NAME = os.getenv("DB_NAME", "texium_db")
 
+# Client tuning. Size the pool for API executor threads plus scheduler and ingest workers.
+MONGO_MAX_POOL_SIZE = int(os.getenv("MONGO_MAX_POOL_SIZE", "100"))
+MONGO_MIN_POOL_SIZE = int(os.getenv("MONGO_MIN_POOL_SIZE", "0"))
+MONGO_MAX_IDLE_TIME_MS = os.getenv("MONGO_MAX_IDLE_TIME_MS")
+MONGO_WAIT_QUEUE_TIMEOUT_MS = os.getenv("MONGO_WAIT_QUEUE_TIMEOUT_MS")
+MONGO_SERVER_SELECTION_TIMEOUT_MS = int(os.getenv("MONGO_SERVER_SELECTION_TIMEOUT_MS", "5000"))
+MONGO_COMPRESSORS = os.getenv("MONGO_COMPRESSORS")  # e.g. "zstd,snappy,zlib"
+MONGO_WRITE_CONCERN = os.getenv("MONGO_WRITE_CONCERN")  # e.g. "majority" or "1"
+MONGO_READ_PREFERENCE = os.getenv("MONGO_READ_PREFERENCE")  # e.g. "primaryPreferred"
+MONGO_APP_NAME = os.getenv("MONGO_APP_NAME", "texium-api")
+
 # MongoDB client
 client = None
 db = None
+_client_lock = Lock()
 
 print("MONGO URI:", MONGO_URI)
 print("DB NAME:", DB_NAME)
 
+
+class PoolStatsListener(monitoring.ConnectionPoolListener):
+    """Collects connection pool (CMAP) statistics per server address"""
+
+    def __init__(self):
+        self._lock = Lock()
+        self._local = local()
+        self._pools = defaultdict(lambda: {
+            "open_connections": 0,
+            "checked_out": 0,
+            "total_checkouts": 0,
+            "checkout_failures": 0,
+            "wait_ms_total": 0.0,
+            "wait_ms_max": 0.0,
+            "pool_cleared": 0,
+        })
+
+    def _update(self, address, **changes):
+        with self._lock:
+            pool = self._pools[f"{address[0]}:{address[1]}"]
+            for key, delta in changes.items():
+                pool[key] += delta
+
+    def _wait_ms(self) -> float:
+        started = getattr(self._local, "checkout_started", None)
+        self._local.checkout_started = None
+        return (time.perf_counter() - started) * 1000 if started is not None else 0.0
+
+    def pool_created(self, event):
+        pass
+
+    def pool_ready(self, event):
+        pass
+
+    def pool_cleared(self, event):
+        self._update(event.address, pool_cleared=1)
+
+    def pool_closed(self, event):
+        pass
+
+    def connection_created(self, event):
+        self._update(event.address, open_connections=1)
+
+    def connection_ready(self, event):
+        pass
+
+    def connection_closed(self, event):
+        self._update(event.address, open_connections=-1)
+
+    def connection_check_out_started(self, event):
+        self._local.checkout_started = time.perf_counter()
+
+    def connection_check_out_failed(self, event):
+        self._wait_ms()
+        self._update(event.address, checkout_failures=1)
+
+    def connection_checked_out(self, event):
+        wait_ms = self._wait_ms()
+        with self._lock:
+            pool = self._pools[f"{event.address[0]}:{event.address[1]}"]
+            pool["checked_out"] += 1
+            pool["total_checkouts"] += 1
+            pool["wait_ms_total"] += wait_ms
+            pool["wait_ms_max"] = max(pool["wait_ms_max"], wait_ms)
+
+    def connection_checked_in(self, event):
+        self._update(event.address, checked_out=-1)
+
+    def snapshot(self) -> dict:
+        """Copy of the current per-address statistics"""
+        with self._lock:
+            pools = {}
+            for address, pool in self._pools.items():
+                stats = dict(pool)
+                checkouts = stats["total_checkouts"]
+                stats["wait_ms_avg"] = round(stats["wait_ms_total"] / checkouts, 3) if checkouts else 0.0
+                stats["wait_ms_total"] = round(stats["wait_ms_total"], 3)
+                stats["wait_ms_max"] = round(stats["wait_ms_max"], 3)
+                pools[address] = stats
+            return pools
+
+
+class CommandCounter(monitoring.CommandListener):
+    """Counts commands (server round trips) issued inside count_round_trips() on the current thread"""
+
+    def __init__(self):
+        self._local = local()
+
+    def started(self, event):
+        tracker = getattr(self._local, "tracker", None)
+        if tracker is not None:
+            tracker["round_trips"] += 1
+
+    def succeeded(self, event):
+        pass
+
+    def failed(self, event):
+        pass
+
+    @contextmanager
+    def count(self):
+        previous = getattr(self._local, "tracker", None)
+        tracker = {"round_trips": 0}
+        self._local.tracker = tracker
+        try:
+            yield tracker
+        finally:
+            self._local.tracker = previous
+            if previous is not None:
+                previous["round_trips"] += tracker["round_trips"]
+
+
+pool_stats_listener = PoolStatsListener()
+command_counter = CommandCounter()
+
+
+def count_round_trips():
+    """
+    Context manager yielding {"round_trips": n} for MongoDB commands run on this thread
+
+    Example:
+        with count_round_trips() as tracker:
+            Job.find_job_by_id(job_id)
+        tracker["round_trips"]  # 1
+    """
+    return command_counter.count()
+
+
+def build_client_options() -> dict:
+    """Build MongoClient keyword arguments from the environment"""
+    options = {
+        "serverSelectionTimeoutMS": MONGO_SERVER_SELECTION_TIMEOUT_MS,
+        "maxPoolSize": MONGO_MAX_POOL_SIZE,
+        "minPoolSize": MONGO_MIN_POOL_SIZE,
+        "appname": MONGO_APP_NAME,
+        "event_listeners": [pool_stats_listener, command_counter],
+    }
+    if MONGO_MAX_IDLE_TIME_MS:
+        options["maxIdleTimeMS"] = int(MONGO_MAX_IDLE_TIME_MS)
+    if MONGO_WAIT_QUEUE_TIMEOUT_MS:
+        options["waitQueueTimeoutMS"] = int(MONGO_WAIT_QUEUE_TIMEOUT_MS)
+    if MONGO_COMPRESSORS:
+        options["compressors"] = MONGO_COMPRESSORS
+    if MONGO_WRITE_CONCERN:
+        options["w"] = int(MONGO_WRITE_CONCERN) if MONGO_WRITE_CONCERN.isdigit() else MONGO_WRITE_CONCERN
+    if MONGO_READ_PREFERENCE:
+        options["readPreference"] = MONGO_READ_PREFERENCE
+    return options
+
+
 def connect_to_mongo():
     """Establish connection to MongoDB"""
     global client, db
-    try:
-        client = MongoClient(MONGO_URI, serverSelectionTimeoutMS=5000)
-        # Test the connection
-        client.admin.command('ping')
-        db = client[DB_NAME]
-        print(f"✓ Connected to MongoDB: {DB_NAME}")
-        return db
-    except ServerSelectionTimeoutError:
-        print("✗ Failed to connect to MongoDB. Make sure MongoDB is running.")
-        raise
+    with _client_lock:
+        if db is not None:
+            return db
+        try:
+            new_client = MongoClient(MONGO_URI, **build_client_options())
+            # Test the connection
+            new_client.admin.command('ping')
+            client = new_client
+            db = client[DB_NAME]
+            print(f"✓ Connected to MongoDB: {DB_NAME} (maxPoolSize={MONGO_MAX_POOL_SIZE})")
+            return db
+        except ServerSelectionTimeoutError:
+            print("✗ Failed to connect to MongoDB. Make sure MongoDB is running.")
+            raise
 
 
 def get_db():
     """Get database instance"""
-    global db
     if db is None:
-        connect_to_mongo()
+        return connect_to_mongo()
     return db
 
 
+def get_pool_stats() -> dict:
+    """Connection pool configuration and live statistics"""
+    return {
+        "max_pool_size": MONGO_MAX_POOL_SIZE,
+        "min_pool_size": MONGO_MIN_POOL_SIZE,
+        "pools": pool_stats_listener.snapshot(),
+    }
+
+
 def close_mongo_connection():
     """Close MongoDB connection"""
-    global client
-    if client:
-        client.close()
-        print("✓ MongoDB connection closed")
+    global client, db
+    with _client_lock:
+        if client:
+            client.close()
+            client = None
+            db = None
+            print("✓ MongoDB connection closed")
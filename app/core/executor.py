@@ -0,0 +1,47 @@
+"""Thread pool for running blocking database work from async routes"""
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from threading import Lock
+import asyncio
+import os
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# Worker threads available to async routes for blocking pymongo calls
+DB_EXECUTOR_WORKERS = int(os.getenv("DB_EXECUTOR_WORKERS", "32"))
+
+_executor = None
+_executor_lock = Lock()
+
+
+def get_executor() -> ThreadPoolExecutor:
+    """Get the shared blocking-call executor, creating it on first use"""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=DB_EXECUTOR_WORKERS,
+                thread_name_prefix="db-executor",
+            )
+        return _executor
+
+
+async def run_blocking(func, *args, **kwargs):
+    """
+    Run a blocking function on the shared executor and await its result
+
+    Keeps synchronous service/model calls (pymongo I/O) off the event loop
+    so one slow query does not stall every other request on the worker.
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(get_executor(), partial(func, *args, **kwargs))
+
+
+def shutdown_executor():
+    """Shut down the shared executor"""
+    global _executor
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown(wait=True)
+            _executor = None
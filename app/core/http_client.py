@@ -0,0 +1,246 @@
+"""Shared outbound HTTP client - pooled keep-alive sessions per host with retries"""
+from collections import defaultdict
+from threading import BoundedSemaphore, Lock
+from typing import Dict, Optional, Tuple
+from urllib.parse import urlsplit
+import email.utils
+import os
+import random
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# Timeouts for establishing a connection and for each read from the socket
+HTTP_CONNECT_TIMEOUT_SECONDS = float(os.getenv("HTTP_CONNECT_TIMEOUT_SECONDS", "5"))
+HTTP_READ_TIMEOUT_SECONDS = float(os.getenv("HTTP_READ_TIMEOUT_SECONDS", "10"))
+# Retries after the first attempt, on connection errors and retryable statuses
+HTTP_MAX_RETRIES = int(os.getenv("HTTP_MAX_RETRIES", "2"))
+# Full-jitter exponential backoff: sleep uniform(0, min(max, base * 2 ** retry))
+HTTP_BACKOFF_BASE_SECONDS = float(os.getenv("HTTP_BACKOFF_BASE_SECONDS", "0.5"))
+HTTP_BACKOFF_MAX_SECONDS = float(os.getenv("HTTP_BACKOFF_MAX_SECONDS", "8"))
+# Keep-alive connections kept per host, and concurrent requests allowed per host
+HTTP_POOL_MAXSIZE = int(os.getenv("HTTP_POOL_MAXSIZE", "10"))
+HTTP_MAX_CONCURRENCY_PER_HOST = int(os.getenv("HTTP_MAX_CONCURRENCY_PER_HOST", "4"))
+# Longest a request waits for a free per-host slot
+HTTP_HOST_WAIT_TIMEOUT_SECONDS = float(os.getenv("HTTP_HOST_WAIT_TIMEOUT_SECONDS", "30"))
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+IDEMPOTENT_METHODS = {"GET", "HEAD", "OPTIONS", "PUT", "DELETE"}
+
+
+class HostBusyError(requests.exceptions.RequestException):
+    """No per-host concurrency slot became free in time"""
+
+
+def _host_key(url: str) -> str:
+    parts = urlsplit(url)
+    return f"{parts.scheme}://{parts.netloc}".lower()
+
+
+def _retry_after_seconds(response: requests.Response) -> Optional[float]:
+    """Delay requested by a Retry-After header (seconds or HTTP date)"""
+    value = response.headers.get("Retry-After")
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        parsed = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        # Malformed: fall back to the jittered backoff
+        return None
+    return max(0.0, parsed.timestamp() - time.time()) if parsed else None
+
+
+class HttpClient:
+    """
+    One keep-alive requests.Session per host, so repeated calls skip DNS,
+    TCP and TLS setup. Requests to a host are capped by a semaphore and
+    retried with jittered backoff on connection errors, 429 and 5xx.
+    """
+
+    def __init__(
+        self,
+        connect_timeout: float = HTTP_CONNECT_TIMEOUT_SECONDS,
+        read_timeout: float = HTTP_READ_TIMEOUT_SECONDS,
+        max_retries: int = HTTP_MAX_RETRIES,
+        pool_maxsize: int = HTTP_POOL_MAXSIZE,
+        max_concurrency_per_host: int = HTTP_MAX_CONCURRENCY_PER_HOST,
+    ):
+        self._timeout = (connect_timeout, read_timeout)
+        self._max_retries = max_retries
+        self._pool_maxsize = pool_maxsize
+        self._max_concurrency = max_concurrency_per_host
+        self._lock = Lock()
+        self._sessions: Dict[str, requests.Session] = {}
+        self._semaphores: Dict[str, BoundedSemaphore] = {}
+        self._stats = defaultdict(lambda: {
+            "requests": 0,
+            "attempts": 0,
+            "retries": 0,
+            "failures": 0,
+            "new_connections": 0,
+            "in_flight": 0,
+            "total_ms": 0.0,
+        })
+
+    def _host(self, host: str) -> Tuple[requests.Session, BoundedSemaphore]:
+        with self._lock:
+            session = self._sessions.get(host)
+            if session is None:
+                session = requests.Session()
+                # Retries are handled here, with backoff and per-attempt timings
+                adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self._pool_maxsize, max_retries=0)
+                session.mount("http://", adapter)
+                session.mount("https://", adapter)
+                self._sessions[host] = session
+                self._semaphores[host] = BoundedSemaphore(self._max_concurrency)
+            return session, self._semaphores[host]
+
+    def _count(self, host: str, **changes):
+        with self._lock:
+            stats = self._stats[host]
+            for key, delta in changes.items():
+                stats[key] += delta
+
+    @staticmethod
+    def _open_connections(session: requests.Session, url: str) -> int:
+        """Connections opened so far by the pool serving url (to tell reuse from new connects)"""
+        try:
+            return session.get_adapter(url).poolmanager.connection_from_url(url).num_connections
+        except Exception:
+            return 0
+
+    def request(
+        self,
+        method: str,
+        url: str,
+        timeout: Optional[Tuple[float, float]] = None,
+        retry: Optional[bool] = None,
+        **kwargs,
+    ) -> Tuple[requests.Response, Dict]:
+        """
+        Send a request through the host's pooled session
+        Returns (response, timings). Timings hold wait_ms (per-host slot),
+        ttfb_ms (until response headers), total_ms, backoff_ms, attempts and
+        new_connections. Raises requests exceptions once retries are exhausted.
+        retry defaults to True for idempotent methods only.
+        """
+        host = _host_key(url)
+        session, semaphore = self._host(host)
+        retry = method.upper() in IDEMPOTENT_METHODS if retry is None else retry
+        max_attempts = 1 + (self._max_retries if retry else 0)
+        timings = {"wait_ms": 0.0, "ttfb_ms": None, "total_ms": 0.0, "backoff_ms": 0.0, "attempts": 0, "new_connections": 0}
+
+        started = time.perf_counter()
+        if not semaphore.acquire(timeout=HTTP_HOST_WAIT_TIMEOUT_SECONDS):
+            self._count(host, requests=1, failures=1)
+            raise HostBusyError(f"Too many concurrent requests to {host}")
+        timings["wait_ms"] = round((time.perf_counter() - started) * 1000, 3)
+        self._count(host, requests=1, in_flight=1)
+
+        try:
+            for attempt in range(max_attempts):
+                timings["attempts"] += 1
+                connections_before = self._open_connections(session, url)
+                try:
+                    response = session.request(method, url, timeout=timeout or self._timeout, **kwargs)
+                    error = None
+                except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+                    response = None
+                    error = e
+                finally:
+                    timings["new_connections"] += max(0, self._open_connections(session, url) - connections_before)
+
+                retryable = error is not None or response.status_code in RETRY_STATUSES
+                if not retryable or attempt == max_attempts - 1:
+                    break
+
+                delay = random.uniform(0, min(HTTP_BACKOFF_MAX_SECONDS, HTTP_BACKOFF_BASE_SECONDS * 2 ** attempt))
+                if response is not None:
+                    retry_after = _retry_after_seconds(response)
+                    if retry_after is not None:
+                        delay = min(HTTP_BACKOFF_MAX_SECONDS, retry_after)
+                    response.close()
+                timings["backoff_ms"] += round(delay * 1000, 3)
+                self._count(host, retries=1)
+                time.sleep(delay)
+
+            if response is not None:
+                timings["ttfb_ms"] = round(response.elapsed.total_seconds() * 1000, 3)
+            timings["total_ms"] = round((time.perf_counter() - started) * 1000, 3)
+            self._count(
+                host,
+                attempts=timings["attempts"],
+                new_connections=timings["new_connections"],
+                total_ms=timings["total_ms"],
+                failures=1 if error is not None else 0,
+            )
+            if error is not None:
+                raise error
+            return response, timings
+        finally:
+            self._count(host, in_flight=-1)
+            semaphore.release()
+
+    def stats(self) -> Dict:
+        """Per-host request counters"""
+        with self._lock:
+            hosts = {}
+            for host, stats in self._stats.items():
+                host_stats = dict(stats)
+                host_stats["avg_ms"] = round(stats["total_ms"] / stats["requests"], 3) if stats["requests"] else 0.0
+                host_stats["total_ms"] = round(stats["total_ms"], 3)
+                hosts[host] = host_stats
+            return {
+                "max_concurrency_per_host": self._max_concurrency,
+                "pool_maxsize": self._pool_maxsize,
+                "hosts": hosts,
+            }
+
+    def close(self):
+        """Close every pooled session"""
+        with self._lock:
+            for session in self._sessions.values():
+                session.close()
+            self._sessions.clear()
+            self._semaphores.clear()
+
+
+_client = None
+_client_lock = Lock()
+
+
+def get_http_client() -> HttpClient:
+    """Return the shared HTTP client, creating it on first use"""
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = HttpClient()
+        return _client
+
+
+def http_request(method: str, url: str, **kwargs) -> Tuple[requests.Response, Dict]:
+    """Send a request through the shared client; see HttpClient.request"""
+    return get_http_client().request(method, url, **kwargs)
+
+
+def get_http_stats() -> Dict:
+    """Statistics of the shared client"""
+    with _client_lock:
+        return _client.stats() if _client is not None else {}
+
+
+def close_http_client():
+    """Close the shared client's sessions"""
+    global _client
+    with _client_lock:
+        if _client is not None:
+            _client.close()
+            _client = None
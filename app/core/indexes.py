@@ -0,0 +1,143 @@
+"""Central MongoDB index registry"""
+from pymongo import ASCENDING, DESCENDING, IndexModel
+from pymongo.errors import OperationFailure
+from core.database import get_db
+from typing import Dict, List
+import os
+import sys
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# "create" builds missing indexes at startup, "check" only reports them, "off" skips the bootstrap
+MONGO_INDEX_MODE = os.getenv("MONGO_INDEX_MODE", "create")
+
+# Every index the application relies on, keyed by collection.
+# Compound indexes mirror the real query shapes (equality fields first, then the sort key).
+INDEX_REGISTRY: Dict[str, List[IndexModel]] = {
+    "users": [
+        IndexModel([("email", ASCENDING)], unique=True),
+        IndexModel([("user_name", ASCENDING)], unique=True),
+    ],
+    "servers": [
+        IndexModel([("user_id", ASCENDING)]),
+        IndexModel([("name", ASCENDING)]),
+        IndexModel([("hostname", ASCENDING)]),
+    ],
+    "integration": [
+        IndexModel([("connectionName", ASCENDING)], unique=True),
+        IndexModel([("type", ASCENDING)]),
+        IndexModel([("environment", ASCENDING)]),
+    ],
+    "scheduler_jobs": [
+        IndexModel([("user_id", ASCENDING)]),
+        IndexModel([("name", ASCENDING)]),
+        IndexModel([("is_enabled", ASCENDING)]),
+        # Job.find_jobs_updated_since: polling fallback of the scheduler sync
+        IndexModel([("updated_at", ASCENDING)]),
+    ],
+    "scheduler_executions": [
+        IndexModel([("user_id", ASCENDING)]),
+        IndexModel([("created_at", ASCENDING)]),
+        IndexModel([("status", ASCENDING)]),
+        # JobExecution.find_executions: every filter combination, sorted by created_at desc
+        IndexModel([("job_id", ASCENDING), ("status", ASCENDING), ("created_at", DESCENDING)]),
+        IndexModel([("job_id", ASCENDING), ("created_at", DESCENDING)]),
+        IndexModel([("status", ASCENDING), ("created_at", DESCENDING)]),
+    ],
+    "scheduler_audit_logs": [
+        IndexModel([("user_id", ASCENDING)]),
+        IndexModel([("created_at", ASCENDING)]),
+        # JobAuditLog.find_logs: every filter combination, sorted by created_at desc
+        IndexModel([("job_id", ASCENDING), ("event_type", ASCENDING), ("created_at", DESCENDING)]),
+        IndexModel([("job_id", ASCENDING), ("created_at", DESCENDING)]),
+        IndexModel([("event_type", ASCENDING), ("created_at", DESCENDING)]),
+    ],
+    "scheduler_metrics": [
+        # ExecutionMetrics.record upserts one bucket per job, granularity and start
+        IndexModel([("job_id", ASCENDING), ("granularity", ASCENDING), ("bucket_start", ASCENDING)], unique=True),
+        IndexModel([("granularity", ASCENDING), ("bucket_start", ASCENDING)]),
+        IndexModel([("job_class_string", ASCENDING), ("granularity", ASCENDING), ("bucket_start", ASCENDING)]),
+        # Buckets carry their own expiry (minute buckets are kept shorter than hour buckets)
+        IndexModel([("expires_at", ASCENDING)], expireAfterSeconds=0),
+    ],
+    "scheduler_leases": [
+        IndexModel([("expires_at", ASCENDING)], expireAfterSeconds=0),
+    ],
+    "scheduler_fire_claims": [
+        IndexModel([("expires_at", ASCENDING)], expireAfterSeconds=0),
+    ],
+    "ingest_jobs": [
+        IndexModel([("status", ASCENDING)]),
+        # Heartbeats and stale-ingest recovery
+        IndexModel([("owner", ASCENDING), ("status", ASCENDING)]),
+        IndexModel([("created_at", DESCENDING)]),
+    ],
+}
+
+
+def _key_pattern(keys) -> tuple:
+    """Normalise an index key list so registry and server patterns compare equal"""
+    return tuple(
+        (field, int(direction) if isinstance(direction, (int, float)) else direction)
+        for field, direction in keys
+    )
+
+
+def ensure_collection_indexes(collection_name: str, check_only: bool = False) -> Dict:
+    """
+    Create (or, with check_only, just detect) the registered indexes missing on a collection
+    Indexes are matched on their key pattern, so existing indexes with other names are recognised.
+    """
+    db = get_db()
+    collection = db[collection_name]
+    expected = INDEX_REGISTRY.get(collection_name, [])
+
+    existing = {_key_pattern(info["key"]) for info in collection.index_information().values()}
+    missing = [index for index in expected if _key_pattern(index.document["key"].items()) not in existing]
+
+    report = {
+        "missing": [index.document["name"] for index in missing],
+        "created": [],
+        "error": None,
+    }
+    if missing and not check_only:
+        try:
+            report["created"] = collection.create_indexes(missing)
+            report["missing"] = []
+        except OperationFailure as e:
+            report["error"] = str(e)
+    return report
+
+
+def ensure_indexes(check_only: bool = False) -> Dict:
+    """Create or check every registered index; returns a per-collection report"""
+    return {
+        collection_name: ensure_collection_indexes(collection_name, check_only=check_only)
+        for collection_name in INDEX_REGISTRY
+    }
+
+
+def bootstrap_indexes(mode: str = None) -> Dict:
+    """Run the index registry once at startup according to MONGO_INDEX_MODE"""
+    mode = mode or MONGO_INDEX_MODE
+    if mode == "off":
+        return {}
+
+    report = ensure_indexes(check_only=(mode == "check"))
+    for collection_name, result in report.items():
+        if result["created"]:
+            print(f"✓ Created indexes on {collection_name}: {', '.join(result['created'])}")
+        if result["missing"]:
+            print(f"✗ Missing indexes on {collection_name}: {', '.join(result['missing'])}")
+        if result["error"]:
+            print(f"✗ Failed to create indexes on {collection_name}: {result['error']}")
+    return report
+
+
+if __name__ == "__main__":
+    # python -m core.indexes [--check]
+    check = "--check" in sys.argv
+    results = bootstrap_indexes("check" if check else "create")
+    if check and any(result["missing"] for result in results.values()):
+        sys.exit(1)
@@ -0,0 +1,92 @@
+"""Upload handling helpers"""
+from fastapi import HTTPException, UploadFile
+from fastapi.responses import JSONResponse
+from io import BytesIO
+from typing import BinaryIO, Iterable
+import os
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# Largest upload accepted by file ingest endpoints
+MAX_UPLOAD_SIZE_MB = int(os.getenv("MAX_UPLOAD_SIZE_MB", "50"))
+
+
+def max_upload_bytes(max_size_mb: int = None) -> int:
+    return (max_size_mb or MAX_UPLOAD_SIZE_MB) * 1024 * 1024
+
+
+def _too_large(max_bytes: int) -> HTTPException:
+    return HTTPException(
+        status_code=413,
+        detail=f"File exceeds the maximum upload size of {max_bytes // (1024 * 1024)} MB"
+    )
+
+
+class UploadSizeLimitMiddleware:
+    """
+    Reject oversized request bodies on upload paths before they are parsed
+
+    A declared Content-Length over the limit is answered with 413 without
+    reading the body. Bodies without one (chunked) are counted as they arrive
+    and cut off with 413 once the limit is crossed, so the multipart parser
+    never spools more than the limit to disk.
+    """
+
+    def __init__(self, app, paths: Iterable[str], max_size_mb: int = None):
+        self.app = app
+        self.paths = set(paths)
+        self.max_bytes = max_upload_bytes(max_size_mb)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"] not in self.paths:
+            await self.app(scope, receive, send)
+            return
+
+        headers = dict(scope.get("headers") or [])
+        content_length = headers.get(b"content-length")
+        if content_length and content_length.isdigit() and int(content_length) > self.max_bytes:
+            error = _too_large(self.max_bytes)
+            response = JSONResponse({"detail": error.detail}, status_code=error.status_code)
+            await response(scope, receive, send)
+            return
+
+        received = 0
+
+        async def limited_receive():
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > self.max_bytes:
+                    raise _too_large(self.max_bytes)
+            return message
+
+        await self.app(scope, limited_receive, send)
+
+
+def upload_stream(file: UploadFile, max_size_mb: int = None) -> BinaryIO:
+    """
+    The upload's own spooled file, rewound, for parsing in place
+
+    Starlette has already spooled the body (in memory up to 1 MB, on disk
+    beyond), so it is read from there rather than copied again. Starlette
+    closes it once the response is sent. Raises 413 over the size limit.
+    """
+    max_bytes = max_upload_bytes(max_size_mb)
+    if file.size is not None and file.size > max_bytes:
+        raise _too_large(max_bytes)
+    file.file.seek(0)
+    return file.file
+
+
+def detach_upload(file: UploadFile, max_size_mb: int = None) -> BinaryIO:
+    """
+    Take ownership of the upload's spooled file so it outlives the request
+
+    For background processing: the caller must close the returned file.
+    The UploadFile is left holding an empty placeholder for Starlette to close.
+    """
+    stream = upload_stream(file, max_size_mb)
+    file.file = BytesIO()
+    return stream
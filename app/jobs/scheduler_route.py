@@ -6,6 +6,7 @@ Separate router for hourly scheduling endpoints
 from fastapi import APIRouter, HTTPException
 from typing import Dict
 from services.scheduler_service import SchedulerService
+from core.executor import run_blocking
 
 router = APIRouter(
     prefix="/api/scheduler",
@@ -39,7 +40,7 @@ async def schedule_job_hourly(job_id: str, minute: int):
             "day_of_week": "*",
         }
 
-        result = SchedulerService.update_job(job_id, cron_config)
+        result = await run_blocking(SchedulerService.update_job, job_id, cron_config)
 
         if result.get("success"):
             return {
@@ -1,7 +1,7 @@
 """Connection model for MongoDB - External system integrations"""
 
-from pymongo import ASCENDING
 from core.database import get_db
+from core.indexes import ensure_collection_indexes
 from datetime import datetime
 from bson import ObjectId
 
@@ -13,12 +13,7 @@ class Connection:
 
     @staticmethod
     def create_indexes():
-        db = get_db()
-        collection = db[Connection.COLLECTION]
-
-        collection.create_index([("connectionName", ASCENDING)], unique=True)
-        collection.create_index([("type", ASCENDING)])
-        collection.create_index([("environment", ASCENDING)])
+        return ensure_collection_indexes(Connection.COLLECTION)
 
     @staticmethod
     def insert_connection(connection_data: dict):
@@ -72,6 +67,20 @@ class Connection:
 
         return list(collection.find())
 
+    @staticmethod
+    def find_connections(connection_type: str = None, environment: str = None):
+
+        db = get_db()
+        collection = db[Connection.COLLECTION]
+
+        query = {}
+        if connection_type:
+            query["type"] = connection_type
+        if environment:
+            query["environment"] = environment
+
+        return list(collection.find(query))
+
     @staticmethod
     def update_connection(connection_id: str, connection_data: dict):
 
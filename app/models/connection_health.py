@@ -0,0 +1,48 @@
+"""Connection health model for MongoDB - last known probe result per connection"""
+
+from core.database import get_db
+from datetime import datetime
+from typing import Dict, List
+
+
+class ConnectionHealth:
+    """ConnectionHealth model - cached connection test results keyed by connection id"""
+
+    COLLECTION = "integration_health"
+
+    @staticmethod
+    def find_health_many(connection_ids: List[str]) -> Dict[str, dict]:
+
+        db = get_db()
+        collection = db[ConnectionHealth.COLLECTION]
+
+        return {doc["_id"]: doc for doc in collection.find({"_id": {"$in": connection_ids}})}
+
+    @staticmethod
+    def upsert_health(connection_id: str, config_hash: str, result: dict):
+
+        db = get_db()
+        collection = db[ConnectionHealth.COLLECTION]
+
+        timings = result.get("timings") or {}
+        collection.update_one(
+            {"_id": connection_id},
+            {"$set": {
+                "config_hash": config_hash,
+                "success": result["success"],
+                "status_code": result["status_code"],
+                "latency_ms": timings.get("total_ms"),
+                "timings": result["timings"],
+                "error": result["error"],
+                "checked_at": datetime.utcnow()
+            }},
+            upsert=True
+        )
+
+    @staticmethod
+    def delete_health(connection_id: str):
+
+        db = get_db()
+        collection = db[ConnectionHealth.COLLECTION]
+
+        collection.delete_one({"_id": connection_id})
@@ -0,0 +1,131 @@
+"""Ingest job model for MongoDB - background user ingestion progress"""
+from core.database import get_db
+from core.indexes import ensure_collection_indexes
+from datetime import datetime
+from bson import ObjectId
+from typing import List, Optional
+import os
+
+# Maximum number of row errors kept on an ingest job document
+INGEST_MAX_ERRORS = int(os.getenv("INGEST_MAX_ERRORS", "100"))
+
+
+class IngestJob:
+    """IngestJob model - tracks a background bulk user ingest"""
+
+    COLLECTION = "ingest_jobs"
+
+    @staticmethod
+    def create_indexes():
+        """Create indexes on ingest jobs collection"""
+        return ensure_collection_indexes(IngestJob.COLLECTION)
+
+    @staticmethod
+    def insert_ingest(ingest_data: dict):
+        """Insert a new queued ingest job"""
+        db = get_db()
+        ingest_collection = db[IngestJob.COLLECTION]
+
+        ingest_doc = {
+            "source": ingest_data.get("source"),
+            "filename": ingest_data.get("filename"),
+            # Process that accepted the ingest; it keeps heartbeat_at fresh until the ingest ends
+            "owner": ingest_data.get("owner"),
+            "status": "queued",
+            "total_rows": ingest_data.get("total_rows"),
+            "processed": 0,
+            "successful": 0,
+            "failed": 0,
+            "errors": [],
+            "error": None,
+            "created_at": datetime.utcnow(),
+            "started_at": None,
+            "completed_at": None,
+            "updated_at": datetime.utcnow(),
+            "heartbeat_at": datetime.utcnow()
+        }
+        result = ingest_collection.insert_one(ingest_doc)
+        return result.inserted_id
+
+    @staticmethod
+    def find_ingest_by_id(ingest_id: str):
+        """Find an ingest job by ID"""
+        db = get_db()
+        ingest_collection = db[IngestJob.COLLECTION]
+        try:
+            return ingest_collection.find_one({"_id": ObjectId(ingest_id)})
+        except:
+            return None
+
+    @staticmethod
+    def mark_running(ingest_id: str) -> bool:
+        """Mark a queued ingest job as picked up by a worker; False if it is no longer queued"""
+        db = get_db()
+        ingest_collection = db[IngestJob.COLLECTION]
+        now = datetime.utcnow()
+        result = ingest_collection.update_one(
+            {"_id": ObjectId(ingest_id), "status": "queued"},
+            {"$set": {"status": "running", "started_at": now, "updated_at": now, "heartbeat_at": now}}
+        )
+        return result.modified_count > 0
+
+    @staticmethod
+    def heartbeat(owner: str) -> int:
+        """Refresh heartbeat_at on the owner's queued and running ingests"""
+        db = get_db()
+        ingest_collection = db[IngestJob.COLLECTION]
+        result = ingest_collection.update_many(
+            {"owner": owner, "status": {"$in": ["queued", "running"]}},
+            {"$set": {"heartbeat_at": datetime.utcnow()}}
+        )
+        return result.modified_count
+
+    @staticmethod
+    def record_batch(ingest_id: str, successful: int, failed: int, errors: List[dict]):
+        """Atomically add one processed batch to the job counters"""
+        db = get_db()
+        ingest_collection = db[IngestJob.COLLECTION]
+
+        update = {
+            "$inc": {"processed": successful + failed, "successful": successful, "failed": failed},
+            "$set": {"updated_at": datetime.utcnow()}
+        }
+        if errors:
+            update["$push"] = {"errors": {"$each": errors, "$slice": INGEST_MAX_ERRORS}}
+
+        ingest_collection.update_one({"_id": ObjectId(ingest_id)}, update)
+
+    @staticmethod
+    def mark_finished(ingest_id: str, status: str, error: Optional[str] = None):
+        """Mark an ingest job as completed, failed or interrupted"""
+        db = get_db()
+        ingest_collection = db[IngestJob.COLLECTION]
+        now = datetime.utcnow()
+        ingest_collection.update_one(
+            {"_id": ObjectId(ingest_id)},
+            {"$set": {"status": status, "error": error, "completed_at": now, "updated_at": now}}
+        )
+
+    @staticmethod
+    def interrupt_stale(heartbeat_before: datetime) -> int:
+        """Mark queued or running ingests whose owner stopped heartbeating before heartbeat_before as interrupted"""
+        db = get_db()
+        ingest_collection = db[IngestJob.COLLECTION]
+        now = datetime.utcnow()
+        result = ingest_collection.update_many(
+            {
+                "status": {"$in": ["queued", "running"]},
+                "$or": [
+                    {"heartbeat_at": {"$lt": heartbeat_before}},
+                    # Stored before ingests carried heartbeats
+                    {"heartbeat_at": {"$exists": False}, "updated_at": {"$lt": heartbeat_before}},
+                ],
+            },
+            {"$set": {
+                "status": "interrupted",
+                "error": "Interrupted by a server restart",
+                "completed_at": now,
+                "updated_at": now
+            }}
+        )
+        return result.modified_count
@@ -1,14 +1,38 @@
 """Job model for MongoDB - Scheduler jobs"""
-from pymongo import ASCENDING
+from pymongo import ReturnDocument, UpdateOne
+from gridfs import GridFSBucket
+from gridfs.errors import NoFile
 from core.database import get_db
+from core.indexes import ensure_collection_indexes
 from datetime import datetime
 from bson import ObjectId
-from typing import Optional, List, Dict
+from typing import Iterator, Optional, List, Dict
+import os
+import zlib
+
+# Execution output/error larger than this (UTF-8 bytes) is moved to GridFS, zlib-compressed
+EXECUTION_OUTPUT_INLINE_LIMIT = int(os.getenv("EXECUTION_OUTPUT_INLINE_LIMIT", str(64 * 1024)))
+# Characters of offloaded output kept inline as a preview
+EXECUTION_OUTPUT_PREVIEW_CHARS = int(os.getenv("EXECUTION_OUTPUT_PREVIEW_CHARS", "4096"))
+EXECUTION_OUTPUT_FIELDS = ("output", "error")
 
 
 class Job:
     """Job model for MongoDB storage - represents scheduled jobs"""
     
+    # Fields needed to restore a job into the scheduler
+    SCHEDULE_PROJECTION = {
+        "minute": 1,
+        "hour": 1,
+        "day_of_month": 1,
+        "month": 1,
+        "day_of_week": 1,
+        "week": 1,
+        "is_enabled": 1,
+        "is_paused": 1,
+        "next_run_time": 1,
+    }
+    
     def __init__(self, 
                  user_id: str,
                  job_class_string: str,
@@ -44,11 +68,7 @@ class Job:
     @staticmethod
     def create_indexes():
         """Create indexes on jobs collection"""
-        db = get_db()
-        jobs_collection = db['scheduler_jobs']
-        jobs_collection.create_index([("user_id", ASCENDING)])
-        jobs_collection.create_index([("name", ASCENDING)])
-        jobs_collection.create_index([("is_enabled", ASCENDING)])
+        return ensure_collection_indexes('scheduler_jobs')
     
     @staticmethod
     def insert_job(job_data: dict):
@@ -91,11 +111,76 @@ class Job:
             return None
     
     @staticmethod
-    def find_all_jobs():
+    def find_all_jobs(projection: Optional[Dict] = None):
         """Find all jobs"""
         db = get_db()
         jobs_collection = db['scheduler_jobs']
-        return list(jobs_collection.find())
+        return list(jobs_collection.find({}, projection))
+    
+    @staticmethod
+    def find_jobs_by_ids(job_ids: List[str], projection: Optional[Dict] = None):
+        """Find several jobs by ID in one query; invalid IDs are skipped"""
+        db = get_db()
+        jobs_collection = db['scheduler_jobs']
+        object_ids = [ObjectId(job_id) for job_id in job_ids if ObjectId.is_valid(job_id)]
+        return list(jobs_collection.find({"_id": {"$in": object_ids}}, projection))
+    
+    @staticmethod
+    def find_jobs_updated_since(since: datetime):
+        """Find jobs whose updated_at is at or after since"""
+        db = get_db()
+        jobs_collection = db['scheduler_jobs']
+        return list(jobs_collection.find({"updated_at": {"$gte": since}}))
+    
+    @staticmethod
+    def find_job_ids() -> List[str]:
+        """IDs of all jobs (covered by the _id index)"""
+        db = get_db()
+        jobs_collection = db['scheduler_jobs']
+        return [str(job["_id"]) for job in jobs_collection.find({}, {"_id": 1})]
+    
+    @staticmethod
+    def watch_jobs(
+        pipeline: Optional[List[Dict]] = None,
+        resume_after: Optional[Dict] = None,
+        start_at_operation_time=None,
+        max_await_time_ms: int = 1000,
+    ):
+        """
+        Open a change stream on the jobs collection with full documents for inserts and updates
+        Resumes after resume_after when given, else starts at start_at_operation_time (or now).
+        """
+        db = get_db()
+        jobs_collection = db['scheduler_jobs']
+        return jobs_collection.watch(
+            pipeline or [],
+            full_document="updateLookup",
+            resume_after=resume_after,
+            start_at_operation_time=None if resume_after else start_at_operation_time,
+            max_await_time_ms=max_await_time_ms
+        )
+    
+    @staticmethod
+    def current_operation_time():
+        """The cluster's latest operation time (None on a standalone server)"""
+        db = get_db()
+        return db.command("ping").get("operationTime")
+    
+    @staticmethod
+    def set_next_run_times(next_run_times: Dict[str, Optional[datetime]]):
+        """
+        Store derived next_run_time values in one bulk_write
+        updated_at is left alone: it tracks user edits, which the scheduler sync watches.
+        """
+        if not next_run_times:
+            return 0
+        db = get_db()
+        jobs_collection = db['scheduler_jobs']
+        requests = [
+            UpdateOne({"_id": ObjectId(job_id)}, {"$set": {"next_run_time": next_run_time}})
+            for job_id, next_run_time in next_run_times.items()
+        ]
+        return jobs_collection.bulk_write(requests, ordered=False).modified_count
     
     @staticmethod
     def find_jobs_by_user(user_id: str):
@@ -125,14 +210,13 @@ class Job:
     
     @staticmethod
     def delete_job(job_id: str):
-        """Delete a job"""
+        """Delete a job; returns the deleted document or None"""
         db = get_db()
         jobs_collection = db['scheduler_jobs']
         try:
-            result = jobs_collection.delete_one({"_id": ObjectId(job_id)})
-            return result.deleted_count > 0
+            return jobs_collection.find_one_and_delete({"_id": ObjectId(job_id)})
         except:
-            return False
+            return None
     
     @staticmethod
     def pause_job(job_id: str):
@@ -148,6 +232,53 @@ class Job:
         except:
             return False
     
+    @staticmethod
+    def aggregate_stats(user_id: Optional[str] = None) -> Dict:
+        """Count total, enabled and paused jobs in a single aggregation"""
+        db = get_db()
+        jobs_collection = db['scheduler_jobs']
+        
+        pipeline = []
+        if user_id:
+            pipeline.append({"$match": {"user_id": ObjectId(user_id) if isinstance(user_id, str) else user_id}})
+        pipeline.append({"$group": {
+            "_id": None,
+            "total_jobs": {"$sum": 1},
+            "enabled_jobs": {"$sum": {"$cond": [{"$eq": ["$is_enabled", True]}, 1, 0]}},
+            "paused_jobs": {"$sum": {"$cond": [{"$eq": ["$is_paused", True]}, 1, 0]}},
+        }})
+        
+        result = next(jobs_collection.aggregate(pipeline), None) or {}
+        return {
+            "total_jobs": result.get("total_jobs", 0),
+            "enabled_jobs": result.get("enabled_jobs", 0),
+            "paused_jobs": result.get("paused_jobs", 0),
+        }
+    
+    @staticmethod
+    def record_execution(job_id: str, next_run_time, completed_at=None):
+        """
+        Record the outcome of a run in a single atomic update
+        Successful runs (completed_at set) also bump total_executions with $inc
+        instead of read-modify-write. Returns the updated job document.
+        """
+        db = get_db()
+        jobs_collection = db['scheduler_jobs']
+        
+        update = {"$set": {"next_run_time": next_run_time}}
+        if completed_at is not None:
+            update["$set"]["last_run_time"] = completed_at
+            update["$inc"] = {"total_executions": 1}
+        
+        try:
+            return jobs_collection.find_one_and_update(
+                {"_id": ObjectId(job_id)},
+                update,
+                return_document=ReturnDocument.AFTER
+            )
+        except:
+            return None
+    
     @staticmethod
     def resume_job(job_id: str):
         """Resume a paused job"""
@@ -166,6 +297,18 @@ class Job:
 class JobExecution:
     """JobExecution model - represents a single job execution"""
     
+    # Fields returned by history listings; output/error are only loaded for a single execution
+    LIST_PROJECTION = {
+        "job_id": 1,
+        "user_id": 1,
+        "job_name": 1,
+        "job_class_string": 1,
+        "status": 1,
+        "started_at": 1,
+        "completed_at": 1,
+        "created_at": 1,
+    }
+    
     def __init__(self, 
                  job_id: str,
                  user_id: str,
@@ -188,20 +331,16 @@ class JobExecution:
     @staticmethod
     def create_indexes():
         """Create indexes on executions collection"""
-        db = get_db()
-        executions_collection = db['scheduler_executions']
-        executions_collection.create_index([("user_id", ASCENDING)])
-        executions_collection.create_index([("job_id", ASCENDING)])
-        executions_collection.create_index([("created_at", ASCENDING)])
-        executions_collection.create_index([("status", ASCENDING)])
+        return ensure_collection_indexes('scheduler_executions')
     
     @staticmethod
     def insert_execution(execution_data: dict):
-        """Insert a new execution record"""
+        """Insert a new execution record (under execution_data["_id"] when given)"""
         db = get_db()
         executions_collection = db['scheduler_executions']
         
         execution_doc = {
+            "_id": ObjectId(execution_data["_id"]) if execution_data.get("_id") else ObjectId(),
             "job_id": ObjectId(execution_data.get("job_id")) if isinstance(execution_data.get("job_id"), str) else execution_data.get("job_id"),
             "user_id": ObjectId(execution_data.get("user_id")) if isinstance(execution_data.get("user_id"), str) else execution_data.get("user_id"),
             "job_name": execution_data.get("job_name"),
@@ -211,6 +350,8 @@ class JobExecution:
             "error": execution_data.get("error", ""),
             "started_at": execution_data.get("started_at"),
             "completed_at": execution_data.get("completed_at"),
+            # Counted in the scheduler counters when it finishes; older executions are seeded instead
+            "counted": True,
             "created_at": datetime.utcnow()
         }
         result = executions_collection.insert_one(execution_doc)
@@ -227,30 +368,56 @@ class JobExecution:
             return None
     
     @staticmethod
-    def find_executions_by_job(job_id: str, limit: int = 50):
-        """Find all executions for a job"""
+    def find_executions(job_id: Optional[str] = None, status: Optional[str] = None, limit: int = 50, projection: Optional[Dict] = None):
+        """Find the most recent executions with optional job and status filters"""
         db = get_db()
         executions_collection = db['scheduler_executions']
+        
+        query = {}
         try:
-            job_obj_id = ObjectId(job_id) if isinstance(job_id, str) else job_id
-            return list(executions_collection.find({"job_id": job_obj_id}).sort("created_at", -1).limit(limit))
+            if job_id:
+                query["job_id"] = ObjectId(job_id) if isinstance(job_id, str) else job_id
         except:
             return []
+        
+        if status:
+            query["status"] = status
+        
+        return list(executions_collection.find(query, projection).sort("created_at", -1).limit(limit))
     
     @staticmethod
-    def find_executions_by_status(status: str, limit: int = 50):
-        """Find all executions by status"""
+    def aggregate_status_counts(user_id: Optional[str] = None, group_by_user: bool = False, uncounted_only: bool = False) -> List[Dict]:
+        """
+        Count executions per status (optionally per user) in a single aggregation
+        uncounted_only restricts it to executions stored before runs were counted as they finish.
+        Returns [{"_id": {"status": ..., "user_id": ...}, "count": n}, ...]
+        """
         db = get_db()
         executions_collection = db['scheduler_executions']
-        return list(executions_collection.find({"status": status}).sort("created_at", -1).limit(limit))
+        
+        match = {}
+        if user_id:
+            match["user_id"] = ObjectId(user_id) if isinstance(user_id, str) else user_id
+        if uncounted_only:
+            match["counted"] = {"$ne": True}
+        pipeline = [{"$match": match}] if match else []
+        group_key = {"status": "$status"}
+        if group_by_user:
+            group_key["user_id"] = "$user_id"
+        pipeline.append({"$group": {"_id": group_key, "count": {"$sum": 1}}})
+        
+        return list(executions_collection.aggregate(pipeline))
     
     @staticmethod
     def update_execution(execution_id: str, execution_data: dict):
-        """Update an execution record"""
+        """Update an execution record; large output/error text is offloaded to GridFS"""
         db = get_db()
         executions_collection = db['scheduler_executions']
         
         update_data = {k: v for k, v in execution_data.items() if k not in ["_id", "created_at"]}
+        for field in EXECUTION_OUTPUT_FIELDS:
+            if isinstance(update_data.get(field), str):
+                update_data.update(ExecutionOutput.offload(execution_id, field, update_data[field]))
         
         try:
             result = executions_collection.update_one({"_id": ObjectId(execution_id)}, {"$set": update_data})
@@ -259,26 +426,170 @@ class JobExecution:
             return False
 
 
+class ExecutionOutput:
+    """ExecutionOutput model - zlib-compressed execution output/error stored in GridFS"""
+    
+    BUCKET = "execution_outputs"
+    CHUNK_SIZE = 64 * 1024
+    
+    @staticmethod
+    def _bucket() -> GridFSBucket:
+        return GridFSBucket(get_db(), bucket_name=ExecutionOutput.BUCKET)
+    
+    @staticmethod
+    def offload(execution_id: str, field: str, text: str) -> Dict:
+        """
+        Execution fields to $set for a piece of output
+        Small text stays inline; larger text is stored compressed and replaced by a preview.
+        """
+        data = text.encode("utf-8")
+        if len(data) <= EXECUTION_OUTPUT_INLINE_LIMIT:
+            return {field: text, f"{field}_blob_id": None, f"{field}_size": len(data)}
+        
+        file_id = ExecutionOutput._bucket().upload_from_stream(
+            f"{execution_id}.{field}.zz",
+            zlib.compress(data),
+            metadata={"execution_id": ObjectId(execution_id), "field": field, "encoding": "zlib", "size": len(data)},
+        )
+        return {
+            field: text[:EXECUTION_OUTPUT_PREVIEW_CHARS],
+            f"{field}_blob_id": file_id,
+            f"{field}_size": len(data),
+        }
+    
+    @staticmethod
+    def iter_chunks(file_id) -> Iterator[bytes]:
+        """Yield the decompressed content of a stored output in chunks"""
+        grid_out = ExecutionOutput._bucket().open_download_stream(file_id)
+        decompressor = zlib.decompressobj()
+        try:
+            while True:
+                chunk = grid_out.read(ExecutionOutput.CHUNK_SIZE)
+                if not chunk:
+                    break
+                data = decompressor.decompress(chunk)
+                if data:
+                    yield data
+            tail = decompressor.flush()
+            if tail:
+                yield tail
+        finally:
+            grid_out.close()
+    
+    @staticmethod
+    def read_text(file_id) -> str:
+        """Full decompressed content of a stored output"""
+        return b"".join(ExecutionOutput.iter_chunks(file_id)).decode("utf-8")
+    
+    @staticmethod
+    def delete_files(file_ids: List) -> int:
+        """Delete stored outputs; missing files are ignored"""
+        bucket = ExecutionOutput._bucket()
+        deleted = 0
+        for file_id in file_ids:
+            try:
+                bucket.delete(file_id)
+                deleted += 1
+            except NoFile:
+                pass
+        return deleted
+
+
+class SchedulerCounters:
+    """
+    SchedulerCounters model - execution counts per scope (global and per user)
+    status_counts are $inc-ed as runs finish (batched by the metrics writer);
+    seeded_counts hold the executions stored before counting began and are
+    only ever $set by the seed, so the two never overwrite each other.
+    Counts outlive the jobs and executions they came from.
+    """
+    
+    COLLECTION = "scheduler_counters"
+    GLOBAL_SCOPE = "global"
+    # Marker written once seeded_counts are complete; increments never create it
+    SEED_MARKER = "seed"
+    
+    @staticmethod
+    def user_scope(user_id) -> str:
+        return f"user:{user_id}"
+    
+    @staticmethod
+    def scopes(user_id) -> List[str]:
+        """Scopes a run of user_id's job is counted in"""
+        scopes = [SchedulerCounters.GLOBAL_SCOPE]
+        if user_id:
+            scopes.append(SchedulerCounters.user_scope(user_id))
+        return scopes
+    
+    @staticmethod
+    def apply_increments(counts: Dict[str, Dict[str, int]]):
+        """$inc status_counts of many scopes (scope -> {status: count}) in one bulk_write"""
+        if not counts:
+            return
+        db = get_db()
+        counters_collection = db[SchedulerCounters.COLLECTION]
+        counters_collection.bulk_write([
+            UpdateOne(
+                {"_id": scope},
+                {"$inc": {f"status_counts.{status}": count for status, count in status_counts.items()}},
+                upsert=True
+            )
+            for scope, status_counts in counts.items()
+        ], ordered=False)
+    
+    @staticmethod
+    def find_counters(scope: str):
+        """Find the counters document for a scope"""
+        db = get_db()
+        counters_collection = db[SchedulerCounters.COLLECTION]
+        return counters_collection.find_one({"_id": scope})
+    
+    @staticmethod
+    def set_seeded_counts(counts: Dict[str, Dict[str, int]]):
+        """
+        Store the pre-counting executions' counts, keyed by scope, in one bulk_write
+        $set of seeded_counts only, so it is safe to repeat and never touches the
+        status_counts being incremented meanwhile.
+        """
+        if not counts:
+            return
+        db = get_db()
+        counters_collection = db[SchedulerCounters.COLLECTION]
+        counters_collection.bulk_write([
+            UpdateOne({"_id": scope}, {"$set": {"seeded_counts": status_counts}}, upsert=True)
+            for scope, status_counts in counts.items()
+        ], ordered=False)
+    
+    @staticmethod
+    def mark_seeded():
+        """Record that seeded_counts are complete"""
+        db = get_db()
+        counters_collection = db[SchedulerCounters.COLLECTION]
+        counters_collection.update_one(
+            {"_id": SchedulerCounters.SEED_MARKER},
+            {"$set": {"seeded": True, "seeded_at": datetime.utcnow()}},
+            upsert=True
+        )
+    
+    @staticmethod
+    def is_seeded() -> bool:
+        """Whether the seed marker has been written"""
+        marker = SchedulerCounters.find_counters(SchedulerCounters.SEED_MARKER)
+        return bool(marker and marker.get("seeded"))
+
+
 class JobAuditLog:
     """JobAuditLog model - represents scheduler lifecycle audit events."""
 
     @staticmethod
     def create_indexes():
         """Create indexes on audit logs collection."""
-        db = get_db()
-        audit_collection = db['scheduler_audit_logs']
-        audit_collection.create_index([("job_id", ASCENDING)])
-        audit_collection.create_index([("user_id", ASCENDING)])
-        audit_collection.create_index([("event_type", ASCENDING)])
-        audit_collection.create_index([("created_at", ASCENDING)])
+        return ensure_collection_indexes('scheduler_audit_logs')
 
     @staticmethod
-    def insert_log(log_data: dict):
-        """Insert a new audit log record."""
-        db = get_db()
-        audit_collection = db['scheduler_audit_logs']
-
-        log_doc = {
+    def build_log_doc(log_data: dict) -> dict:
+        """Build the stored document for an audit log record."""
+        return {
             "job_id": ObjectId(log_data.get("job_id")) if isinstance(log_data.get("job_id"), str) else log_data.get("job_id"),
             "user_id": ObjectId(log_data.get("user_id")) if isinstance(log_data.get("user_id"), str) else log_data.get("user_id"),
             "job_name": log_data.get("job_name"),
@@ -291,9 +602,27 @@ class JobAuditLog:
             "execution_id": ObjectId(log_data.get("execution_id")) if isinstance(log_data.get("execution_id"), str) else log_data.get("execution_id"),
             "created_at": datetime.utcnow()
         }
-        result = audit_collection.insert_one(log_doc)
+
+    @staticmethod
+    def insert_log(log_data: dict):
+        """Insert a new audit log record."""
+        db = get_db()
+        audit_collection = db['scheduler_audit_logs']
+
+        result = audit_collection.insert_one(JobAuditLog.build_log_doc(log_data))
         return result.inserted_id
 
+    @staticmethod
+    def insert_logs(log_docs: List[dict]):
+        """Insert several prebuilt audit log documents in one round trip."""
+        if not log_docs:
+            return []
+        db = get_db()
+        audit_collection = db['scheduler_audit_logs']
+
+        result = audit_collection.insert_many(log_docs, ordered=False)
+        return result.inserted_ids
+
     @staticmethod
     def find_log_by_id(log_id: str):
         """Find an audit log by ID."""
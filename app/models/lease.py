@@ -0,0 +1,83 @@
+"""Lease models for MongoDB - scheduler leadership and run-once fire claims"""
+from core.database import get_db
+from core.indexes import ensure_collection_indexes
+from datetime import datetime, timedelta
+from pymongo import ReturnDocument
+from pymongo.errors import DuplicateKeyError
+from typing import Optional
+
+
+class SchedulerLease:
+    """SchedulerLease model - a named lease held by one process until it stops renewing it"""
+
+    COLLECTION = "scheduler_leases"
+
+    @staticmethod
+    def create_indexes():
+        """Create indexes on leases collection"""
+        return ensure_collection_indexes(SchedulerLease.COLLECTION)
+
+    @staticmethod
+    def try_acquire(name: str, owner: str, ttl_seconds: float) -> bool:
+        """
+        Acquire or renew a lease in one round trip
+        Succeeds when the lease is free, expired or already held by owner.
+        """
+        db = get_db()
+        leases_collection = db[SchedulerLease.COLLECTION]
+        now = datetime.utcnow()
+        try:
+            lease = leases_collection.find_one_and_update(
+                {"_id": name, "$or": [{"owner": owner}, {"expires_at": {"$lt": now}}]},
+                {"$set": {"owner": owner, "heartbeat_at": now, "expires_at": now + timedelta(seconds=ttl_seconds)}},
+                upsert=True,
+                return_document=ReturnDocument.AFTER
+            )
+        except DuplicateKeyError:
+            # Held by someone else: the filter missed and the upsert hit the existing _id
+            return False
+        return lease is not None and lease.get("owner") == owner
+
+    @staticmethod
+    def release(name: str, owner: str):
+        """Give a lease up so another process can take it without waiting for expiry"""
+        db = get_db()
+        leases_collection = db[SchedulerLease.COLLECTION]
+        leases_collection.delete_one({"_id": name, "owner": owner})
+
+    @staticmethod
+    def find_lease(name: str) -> Optional[dict]:
+        """Find the current holder of a lease"""
+        db = get_db()
+        leases_collection = db[SchedulerLease.COLLECTION]
+        return leases_collection.find_one({"_id": name})
+
+
+class SchedulerFireClaim:
+    """SchedulerFireClaim model - at most one execution per job and fire time across processes"""
+
+    COLLECTION = "scheduler_fire_claims"
+
+    @staticmethod
+    def create_indexes():
+        """Create indexes on fire claims collection"""
+        return ensure_collection_indexes(SchedulerFireClaim.COLLECTION)
+
+    @staticmethod
+    def claim(job_id: str, fire_time: datetime, owner: str, ttl_seconds: float = 86400) -> bool:
+        """Record that owner fires job_id for fire_time; False if another process already did"""
+        db = get_db()
+        claims_collection = db[SchedulerFireClaim.COLLECTION]
+        now = datetime.utcnow()
+        try:
+            claims_collection.insert_one({
+                "_id": f"{job_id}:{fire_time.isoformat()}",
+                "job_id": job_id,
+                "fire_time": fire_time,
+                "owner": owner,
+                "created_at": now,
+                "expires_at": now + timedelta(seconds=ttl_seconds),
+            })
+            return True
+        except DuplicateKeyError:
+            return False
@@ -0,0 +1,119 @@
+"""Execution metrics model for MongoDB - time-bucketed run counts and durations"""
+from core.database import get_db
+from core.indexes import ensure_collection_indexes
+from datetime import datetime, timedelta
+from pymongo import UpdateOne
+from typing import Dict, List, Optional
+import os
+
+# Upper bounds (ms) of the duration histogram buckets; slower runs land in "inf"
+DURATION_BUCKETS_MS = [10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 30000, 60000, 300000, 900000]
+# How long buckets are kept before the TTL index removes them
+METRICS_MINUTE_RETENTION_DAYS = int(os.getenv("METRICS_MINUTE_RETENTION_DAYS", "7"))
+METRICS_HOUR_RETENTION_DAYS = int(os.getenv("METRICS_HOUR_RETENTION_DAYS", "90"))
+
+GRANULARITIES = {
+    "minute": timedelta(minutes=1),
+    "hour": timedelta(hours=1),
+}
+
+
+def histogram_key(duration_ms: float) -> str:
+    """Histogram field holding a duration"""
+    for bound in DURATION_BUCKETS_MS:
+        if duration_ms <= bound:
+            return str(bound)
+    return "inf"
+
+
+def bucket_start(moment: datetime, granularity: str) -> datetime:
+    """Truncate a timestamp to the start of its bucket"""
+    if granularity == "hour":
+        return moment.replace(minute=0, second=0, microsecond=0)
+    return moment.replace(second=0, microsecond=0)
+
+
+class ExecutionMetrics:
+    """ExecutionMetrics model - one document per job, granularity and bucket"""
+
+    COLLECTION = "scheduler_metrics"
+
+    @staticmethod
+    def create_indexes():
+        """Create indexes on execution metrics collection"""
+        return ensure_collection_indexes(ExecutionMetrics.COLLECTION)
+
+    @staticmethod
+    def bucket_increments(job: dict, status: str, duration_ms: float, completed_at: datetime) -> List[Dict]:
+        """The minute and hour bucket increments of one finished execution"""
+        return [
+            {
+                "job_id": str(job["_id"]) if job.get("_id") else None,
+                "granularity": granularity,
+                "bucket_start": bucket_start(completed_at, granularity),
+                "count": 1,
+                "failures": 1 if status == "failed" else 0,
+                "duration_ms_sum": duration_ms,
+                "duration_ms_max": duration_ms,
+                "histogram": {histogram_key(duration_ms): 1},
+                "job_name": job.get("name"),
+                "job_class_string": job.get("job_class_string"),
+                "user_id": str(job["user_id"]) if job.get("user_id") else None,
+            }
+            for granularity in GRANULARITIES
+        ]
+
+    @staticmethod
+    def apply_increments(increments: List[Dict]):
+        """Upsert bucket increments (one per job, granularity and bucket) in one round trip"""
+        if not increments:
+            return
+        db = get_db()
+        metrics_collection = db[ExecutionMetrics.COLLECTION]
+
+        retention = {
+            "minute": timedelta(days=METRICS_MINUTE_RETENTION_DAYS),
+            "hour": timedelta(days=METRICS_HOUR_RETENTION_DAYS),
+        }
+        requests = []
+        for increment in increments:
+            start = increment["bucket_start"]
+            requests.append(UpdateOne(
+                {"job_id": increment["job_id"], "granularity": increment["granularity"], "bucket_start": start},
+                {
+                    "$inc": {
+                        "count": increment["count"],
+                        "failures": increment["failures"],
+                        "duration_ms_sum": increment["duration_ms_sum"],
+                        **{f"histogram.{key}": value for key, value in increment["histogram"].items()},
+                    },
+                    "$max": {"duration_ms_max": increment["duration_ms_max"]},
+                    "$setOnInsert": {
+                        "job_name": increment["job_name"],
+                        "job_class_string": increment["job_class_string"],
+                        "user_id": increment["user_id"],
+                        "expires_at": start + retention[increment["granularity"]],
+                    },
+                },
+                upsert=True
+            ))
+        metrics_collection.bulk_write(requests, ordered=False)
+
+    @staticmethod
+    def find_buckets(
+        granularity: str,
+        since: datetime,
+        job_id: Optional[str] = None,
+        job_class_string: Optional[str] = None,
+    ) -> List[Dict]:
+        """Find buckets of one granularity starting at or after since, oldest first"""
+        db = get_db()
+        metrics_collection = db[ExecutionMetrics.COLLECTION]
+
+        query = {"granularity": granularity, "bucket_start": {"$gte": since}}
+        if job_id:
+            query["job_id"] = job_id
+        if job_class_string:
+            query["job_class_string"] = job_class_string
+
+        return list(metrics_collection.find(query, {"_id": 0, "expires_at": 0}).sort("bucket_start", 1))
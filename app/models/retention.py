@@ -0,0 +1,65 @@
+"""Retention queries for MongoDB - batched reads and deletes of expired documents"""
+from core.database import get_db
+from pymongo.errors import OperationFailure
+from typing import List, Optional
+
+
+class RetentionStore:
+    """RetentionStore - collection-agnostic operations used by the retention engine"""
+
+    @staticmethod
+    def count_matching(collection_name: str, query: dict) -> int:
+        """Count documents matching a retention query"""
+        db = get_db()
+        return db[collection_name].count_documents(query)
+
+    @staticmethod
+    def find_batch(collection_name: str, query: dict, batch_size: int, projection: Optional[dict] = None) -> List[dict]:
+        """Oldest documents matching a retention query (full documents unless a projection is given)"""
+        db = get_db()
+        return list(
+            db[collection_name].find(query, projection).sort("created_at", 1).limit(batch_size)
+        )
+
+    @staticmethod
+    def delete_ids(collection_name: str, ids: List) -> int:
+        """Delete a batch of documents by _id"""
+        db = get_db()
+        return db[collection_name].delete_many({"_id": {"$in": ids}}).deleted_count
+
+    @staticmethod
+    def find_groups_over(collection_name: str, group_field: str, keep: int, query: Optional[dict] = None) -> List[dict]:
+        """Group values holding more than keep documents, e.g. jobs with too many executions"""
+        db = get_db()
+        pipeline = [
+            {"$match": query or {}},
+            {"$group": {"_id": f"${group_field}", "count": {"$sum": 1}}},
+            {"$match": {"count": {"$gt": keep}}},
+        ]
+        return list(db[collection_name].aggregate(pipeline))
+
+    @staticmethod
+    def newest_dropped(collection_name: str, query: dict, n: int) -> Optional[dict]:
+        """created_at and _id of the (n+1)th newest document matching query, i.e. the newest one not kept"""
+        db = get_db()
+        docs = list(
+            db[collection_name].find(query, {"created_at": 1}).sort([("created_at", -1), ("_id", -1)]).skip(n).limit(1)
+        )
+        return docs[0] if docs else None
+
+    @staticmethod
+    def set_ttl(collection_name: str, field: str, expire_after_seconds: int) -> Optional[str]:
+        """
+        Turn the single-field index on field into a TTL index (or change its expiry)
+        Returns an error message instead of raising, e.g. on servers older than 5.1.
+        """
+        db = get_db()
+        try:
+            db.command(
+                "collMod",
+                collection_name,
+                index={"keyPattern": {field: 1}, "expireAfterSeconds": expire_after_seconds},
+            )
+            return None
+        except OperationFailure as e:
+            return str(e)
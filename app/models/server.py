@@ -1,6 +1,6 @@
 """Server model for MongoDB"""
-from pymongo import ASCENDING
 from core.database import get_db
+from core.indexes import ensure_collection_indexes
 from datetime import datetime
 from bson import ObjectId
 
@@ -24,11 +24,7 @@ class Server:
     @staticmethod
     def create_indexes():
         """Create indexes on servers collection"""
-        db = get_db()
-        servers_collection = db['servers']
-        servers_collection.create_index([("user_id", ASCENDING)])
-        servers_collection.create_index([("name", ASCENDING)])
-        servers_collection.create_index([("hostname", ASCENDING)])
+        return ensure_collection_indexes("servers")
     
     @staticmethod
     def insert_server(server_data: dict):
@@ -1,7 +1,9 @@
 """User model for MongoDB"""
 from pymongo import ASCENDING
 from core.database import get_db
+from core.indexes import ensure_collection_indexes
 from datetime import datetime
+from typing import List, Optional
 
 
 class User:
@@ -17,28 +19,43 @@ class User:
     @staticmethod
     def create_indexes():
         """Create indexes on users collection"""
-        db = get_db()
-        users_collection = db['users']
-        users_collection.create_index([("email", ASCENDING)], unique=True)
-        users_collection.create_index([("user_name", ASCENDING)], unique=True)
+        return ensure_collection_indexes("users")
     
     @staticmethod
-    def insert_user(user_data: dict):
-        """Insert a new user into MongoDB"""
-        db = get_db()
-        users_collection = db['users']
-        
-        user_doc = {
+    def build_user_doc(user_data: dict) -> dict:
+        """Build the stored document for a user"""
+        return {
             "email": user_data.get("email"),
             "first_name": user_data.get("first_name"),
             "last_name": user_data.get("last_name"),
             "user_name": user_data.get("user_name", user_data.get("email")),
             "created_at": datetime.utcnow()
         }
+    
+    @staticmethod
+    def insert_user(user_data: dict):
+        """Insert a new user into MongoDB"""
+        db = get_db()
+        users_collection = db['users']
+        
+        user_doc = User.build_user_doc(user_data)
         
         result = users_collection.insert_one(user_doc)
         return result.inserted_id
     
+    @staticmethod
+    def insert_users(user_docs: List[dict]):
+        """
+        Insert a batch of user documents in a single round trip.
+        Uses an unordered insert so one duplicate does not stop the rest;
+        raises BulkWriteError describing the documents that failed.
+        """
+        db = get_db()
+        users_collection = db['users']
+        
+        result = users_collection.insert_many(user_docs, ordered=False)
+        return result.inserted_ids
+    
     @staticmethod
     def find_user_by_email(email: str):
         """Find user by email"""
@@ -46,6 +63,26 @@ class User:
         users_collection = db['users']
         return users_collection.find_one({"email": email})
     
+    @staticmethod
+    def find_users_page(after: Optional[str] = None, limit: Optional[int] = None, fields: Optional[List[str]] = None):
+        """
+        Find users ordered by email, starting after the given email
+        Returns a lazy cursor; email is always projected so it can be used as the next keyset cursor
+        """
+        db = get_db()
+        users_collection = db['users']
+        
+        query = {"email": {"$gt": after}} if after else {}
+        projection = {"_id": 0}
+        if fields:
+            projection.update({field: 1 for field in fields})
+            projection["email"] = 1
+        
+        cursor = users_collection.find(query, projection).sort("email", ASCENDING)
+        if limit:
+            cursor = cursor.limit(limit)
+        return cursor
+    
     @staticmethod
     def find_all_users():
         """Find all users"""
@@ -1,8 +1,11 @@
 """Connection routes - API endpoints for managing external system connections"""
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Query
+from typing import Optional
 from services.connection_service import ConnectionService
 from schemas.connection import (
+    ConnectionType,
+    Environment,
     ConnectionCreateRequest,
     ConnectionUpdateRequest,
     ConnectionListResponse,
@@ -21,12 +24,53 @@ router = APIRouter(
     summary="Test external system connection"
 )
 def test_connection(payload: ConnectionCreateRequest):
-    success = ConnectionService.test_connection(payload)
+    result = ConnectionService.test_connection(payload)
 
-    if success:
-        return {"status": "success", "message": "Connection successful"}
+    if result["success"]:
+        return {
+            "status": "success",
+            "message": "Connection successful",
+            "status_code": result["status_code"],
+            "timings": result["timings"]
+        }
 
-    return {"status": "failed", "message": "Connection failed"}
+    return {
+        "status": "failed",
+        "message": "Connection failed",
+        "status_code": result["status_code"],
+        "timings": result["timings"],
+        "error": result["error"]
+    }
+
+
+@router.post(
+    "/test-all",
+    summary="Test all stored connections concurrently"
+)
+def test_all_connections(
+    type: Optional[ConnectionType] = Query(None),
+    environment: Optional[Environment] = Query(None),
+    deadline_seconds: Optional[float] = Query(None, gt=0, le=120),
+    force: bool = Query(False)
+):
+    """
+    Report status and latency per stored connection.
+    
+    Recently checked connections are answered from the health cache (stale
+    entries are refreshed in the background); the rest, or all with
+    force=true, are probed in parallel. Everything is answered within one
+    overall deadline; probes still running at the deadline are reported
+    with status "timeout".
+    """
+    try:
+        return ConnectionService.test_all_connections(
+            connection_type=type.value if type else None,
+            environment=environment.value if environment else None,
+            deadline_seconds=deadline_seconds,
+            force=force
+        )
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
 
 
 @router.post(
@@ -71,6 +115,19 @@ def get_connection(connection_id: str):
     return ConnectionService.get_connection(connection_id)
 
 
+@router.get(
+    "/{connection_id}/health",
+    summary="Get connection health"
+)
+def get_connection_health(connection_id: str, force: bool = Query(False)):
+    """
+    Last known status and latency of a connection, from the health cache.
+    
+    Pass force=true to bypass the cache and probe the system now.
+    """
+    return ConnectionService.get_connection_health(connection_id, force=force)
+
+
 @router.get(
     "/name/{connection_name}",
     response_model=ConnectionDetailResponse,
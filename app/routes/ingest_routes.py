@@ -0,0 +1,83 @@
+"""Ingest routes - background bulk user ingestion"""
+from fastapi import APIRouter, UploadFile, File, HTTPException
+from schemas.user import UserIngestPayload
+from services.ingest_service import IngestService
+from core.uploads import detach_upload
+from core.executor import run_blocking
+from typing import Dict
+
+router = APIRouter(prefix="/api/ingest", tags=["ingest"])
+
+
+@router.post("/single-user", response_model=Dict, status_code=202)
+async def submit_users_json(payload: UserIngestPayload):
+    """
+    Queue a JSON users payload for background ingestion
+
+    Accepts the same payload as /api/single-user but returns immediately
+    with an ingest_id; poll /api/ingest/{ingest_id} for progress.
+    """
+    try:
+        result = await run_blocking(IngestService.submit_json_payload, payload.dict())
+        if result.get("rejected"):
+            # 429 tells the client to back off while the ingest queue is full
+            raise HTTPException(status_code=429, detail=result["message"])
+
+        return {
+            "status": "accepted",
+            "message": result["message"],
+            "ingest_id": result["ingest_id"]
+        }
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@router.post("/bulk-user", response_model=Dict, status_code=202)
+async def submit_users_excel(file: UploadFile = File(...)):
+    """
+    Queue an Excel users file for background ingestion
+
+    Accepts the same file as /api/bulk-user but returns immediately
+    with an ingest_id; poll /api/ingest/{ingest_id} for progress.
+    """
+    try:
+        # Validate file type
+        if file.filename and not file.filename.endswith(('.xlsx', '.xls')):
+            raise HTTPException(status_code=400, detail="File must be an Excel file (.xlsx or .xls)")
+
+        # The ingest outlives the request, so it takes over the spooled upload
+        result = await run_blocking(IngestService.submit_excel, detach_upload(file), filename=file.filename)
+        if result.get("rejected"):
+            raise HTTPException(status_code=429, detail=result["message"])
+
+        return {
+            "status": "accepted",
+            "message": result["message"],
+            "ingest_id": result["ingest_id"]
+        }
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@router.get("/{ingest_id}", response_model=Dict)
+async def get_ingest(ingest_id: str):
+    """Get row counts, throughput and errors for an ingest job"""
+    try:
+        result = await run_blocking(IngestService.get_ingest, ingest_id)
+
+        if result["success"]:
+            return {
+                "status": "success",
+                "message": result["message"],
+                "data": result["data"]
+            }
+        else:
+            raise HTTPException(status_code=404, detail=result["message"])
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
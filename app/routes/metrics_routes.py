@@ -0,0 +1,31 @@
+"""Metrics routes - runtime statistics for capacity planning"""
+from fastapi import APIRouter
+from core.database import get_pool_stats
+from core.http_client import get_http_stats
+from services.metrics_service import MetricsService
+from services.oauth_tokens import get_token_stats
+from services.scheduler_service import SchedulerService
+from services.triggers import trigger_cache_stats
+from services.veeva_client import get_session_stats
+from typing import Dict
+
+router = APIRouter(tags=["metrics"])
+
+
+@router.get("/metrics", response_model=Dict)
+async def get_metrics():
+    """Get runtime statistics (MongoDB connection pool, outbound HTTP, Veeva sessions, OAuth tokens, scheduler leadership, sync and triggers, pools, runs, metrics and audit writers)"""
+    return {
+        "status": "success",
+        "mongo": get_pool_stats(),
+        "http": get_http_stats(),
+        "veeva_sessions": get_session_stats(),
+        "oauth_tokens": get_token_stats(),
+        "scheduler_leader": SchedulerService.get_leader_status(),
+        "scheduler_sync": SchedulerService.get_sync_status(),
+        "scheduler_triggers": trigger_cache_stats(),
+        "scheduler_pool": SchedulerService.get_execution_pool_stats(),
+        "scheduler_runs": SchedulerService.get_run_stats(),
+        "scheduler_metrics_buffer": MetricsService.get_buffer_stats(),
+        "audit_sink": SchedulerService.get_audit_sink_stats()
+    }
@@ -1,13 +1,18 @@
 """Scheduler routes for API endpoints"""
-from fastapi import APIRouter, HTTPException, Query
+from fastapi import APIRouter, HTTPException, Query, Response
+from fastapi.responses import StreamingResponse
 from schemas.job import (
     JobCreateRequest, JobUpdateRequest, JobListResponse,
     JobDetailResponse, ExecutionListResponse, ExecutionDetailResponse,
     JobActionResponse, ExecutionRunResponse, AvailableJobsResponse,
-    JobStatsResponse, AuditLogListResponse, AuditLogDetailResponse
+    JobStatsResponse, AuditLogListResponse, AuditLogDetailResponse,
+    SchedulePreviewRequest
 )
 from services.scheduler_service import SchedulerService
-from typing import Dict, Optional
+from services.metrics_service import MetricsService
+from services.retention_service import RetentionService
+from typing import Dict, List, Literal, Optional
+from core.executor import run_blocking
 
 router = APIRouter(prefix="/api/scheduler", tags=["scheduler"])
 
@@ -30,7 +35,7 @@ async def create_job(job_data: JobCreateRequest):
     - pub_kwargs: Dictionary of keyword arguments
     """
     try:
-        result = SchedulerService.create_job(job_data.dict())
+        result = await run_blocking(SchedulerService.create_job, job_data.dict())
         
         if result["success"]:
             return {
@@ -50,7 +55,7 @@ async def create_job(job_data: JobCreateRequest):
 async def get_all_jobs():
     """Get all scheduled jobs"""
     try:
-        result = SchedulerService.get_all_jobs()
+        result = await run_blocking(SchedulerService.get_all_jobs)
         
         return {
             "status": "success",
@@ -66,7 +71,7 @@ async def get_all_jobs():
 async def get_job(job_id: str):
     """Get a specific job by ID"""
     try:
-        result = SchedulerService.get_job(job_id)
+        result = await run_blocking(SchedulerService.get_job, job_id)
         
         if result["success"]:
             return {
@@ -86,7 +91,7 @@ async def get_job(job_id: str):
 async def get_user_jobs(user_id: str):
     """Get all jobs for a specific user"""
     try:
-        result = SchedulerService.get_jobs_by_user(user_id)
+        result = await run_blocking(SchedulerService.get_jobs_by_user, user_id)
         
         return {
             "status": "success",
@@ -102,7 +107,7 @@ async def get_user_jobs(user_id: str):
 async def update_job(job_id: str, job_data: JobUpdateRequest):
     """Update a job"""
     try:
-        result = SchedulerService.update_job(job_id, job_data.dict(exclude_none=True))
+        result = await run_blocking(SchedulerService.update_job, job_id, job_data.dict(exclude_none=True))
         
         if result["success"]:
             return {
@@ -122,7 +127,7 @@ async def update_job(job_id: str, job_data: JobUpdateRequest):
 async def delete_job(job_id: str):
     """Delete a job"""
     try:
-        result = SchedulerService.delete_job(job_id)
+        result = await run_blocking(SchedulerService.delete_job, job_id)
         
         if result["success"]:
             return {
@@ -142,7 +147,7 @@ async def delete_job(job_id: str):
 async def pause_job(job_id: str):
     """Pause a job"""
     try:
-        result = SchedulerService.pause_job(job_id)
+        result = await run_blocking(SchedulerService.pause_job, job_id)
         
         if result["success"]:
             return {
@@ -162,7 +167,7 @@ async def pause_job(job_id: str):
 async def resume_job(job_id: str):
     """Resume a paused job"""
     try:
-        result = SchedulerService.resume_job(job_id)
+        result = await run_blocking(SchedulerService.resume_job, job_id)
         
         if result["success"]:
             return {
@@ -182,7 +187,7 @@ async def resume_job(job_id: str):
 async def run_job_now(job_id: str):
     """Run a job immediately (create an execution)"""
     try:
-        result = SchedulerService.run_job_now(job_id)
+        result = await run_blocking(SchedulerService.run_job_now, job_id)
         
         if result["success"]:
             return {
@@ -190,6 +195,40 @@ async def run_job_now(job_id: str):
                 "message": result["message"],
                 "execution_id": result["execution_id"]
             }
+        else:
+            # 429 tells the client to back off when the execution queue is full
+            raise HTTPException(status_code=429 if result.get("rejected") else 400, detail=result["message"])
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.post("/schedules/preview", response_model=Dict)
+async def preview_schedules(request: SchedulePreviewRequest):
+    """
+    Preview the next fire times of many jobs and/or ad-hoc schedules at once
+    
+    - job_ids: stored jobs, keyed by job id in the response
+    - schedules: cron fields, keyed "schedule:<index>" in the response
+    - count: fire times per schedule (max 100)
+    """
+    try:
+        result = await run_blocking(
+            SchedulerService.preview_schedules,
+            job_ids=request.job_ids,
+            schedules=[schedule.dict() for schedule in request.schedules or []],
+            count=request.count,
+            start=request.start,
+        )
+        
+        if result["success"]:
+            return {
+                "status": "success",
+                "message": result["message"],
+                "data": result["data"],
+                "missing_job_ids": result["missing_job_ids"]
+            }
         else:
             raise HTTPException(status_code=400, detail=result["message"])
     except HTTPException:
@@ -201,10 +240,18 @@ async def run_job_now(job_id: str):
 # =================== Executions Endpoints ===================
 
 @router.get("/executions", response_model=Dict)
-async def get_executions(job_id: Optional[str] = Query(None)):
-    """Get job executions"""
+async def get_executions(
+    job_id: Optional[str] = Query(None),
+    status: Optional[str] = Query(None),
+    limit: int = Query(100, ge=1, le=500),
+):
+    """
+    Get job executions, newest first, optionally filtered by job_id and/or status
+    
+    Returns summary fields only; fetch /executions/{execution_id} for output and error.
+    """
     try:
-        result = SchedulerService.get_executions(job_id=job_id, limit=100)
+        result = await run_blocking(SchedulerService.get_executions, job_id=job_id, status=status, limit=limit)
         
         return {
             "status": "success",
@@ -220,7 +267,7 @@ async def get_executions(job_id: Optional[str] = Query(None)):
 async def get_execution(execution_id: str):
     """Get a specific execution by ID"""
     try:
-        result = SchedulerService.get_execution(execution_id)
+        result = await run_blocking(SchedulerService.get_execution, execution_id)
         
         if result["success"]:
             return {
@@ -236,6 +283,26 @@ async def get_execution(execution_id: str):
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.get("/executions/{execution_id}/output")
+async def get_execution_output(
+    execution_id: str,
+    field: Literal["output", "error"] = Query("output"),
+):
+    """Stream the full output (or error) of an execution as plain text"""
+    try:
+        result = await run_blocking(SchedulerService.get_execution_output, execution_id, field)
+        
+        if not result["success"]:
+            raise HTTPException(status_code=404, detail=result["message"])
+        
+        headers = {"Content-Length": str(result["size"])} if result["size"] is not None else None
+        return StreamingResponse(result["stream"], media_type="text/plain; charset=utf-8", headers=headers)
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
 @router.get("/audit-logs", response_model=Dict)
 async def get_audit_logs(
     job_id: Optional[str] = Query(None),
@@ -244,7 +311,7 @@ async def get_audit_logs(
 ):
     """Get scheduler audit logs."""
     try:
-        result = SchedulerService.get_audit_logs(job_id=job_id, event_type=event_type, limit=limit)
+        result = await run_blocking(SchedulerService.get_audit_logs, job_id=job_id, event_type=event_type, limit=limit)
 
         return {
             "status": "success",
@@ -260,7 +327,7 @@ async def get_audit_logs(
 async def get_audit_log(log_id: str):
     """Get a specific scheduler audit log."""
     try:
-        result = SchedulerService.get_audit_log(log_id)
+        result = await run_blocking(SchedulerService.get_audit_log, log_id)
 
         if result["success"]:
             return {
@@ -297,7 +364,7 @@ async def get_available_jobs_list():
 async def get_scheduler_stats(user_id: Optional[str] = Query(None)):
     """Get scheduler statistics"""
     try:
-        result = SchedulerService.get_scheduler_stats(user_id=user_id)
+        result = await run_blocking(SchedulerService.get_scheduler_stats, user_id=user_id)
         
         if result["success"]:
             return {
@@ -311,11 +378,117 @@ async def get_scheduler_stats(user_id: Optional[str] = Query(None)):
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.get("/metrics", response_model=Dict)
+async def get_execution_metrics(
+    job_id: Optional[str] = Query(None),
+    job_class: Optional[str] = Query(None),
+    granularity: Literal["minute", "hour"] = Query("hour"),
+    window_minutes: int = Query(24 * 60, ge=1, le=90 * 24 * 60),
+    group_by: Literal["job", "job_class"] = Query("job"),
+    include_series: bool = Query(False),
+):
+    """
+    Get execution counts, failure rates and duration percentiles (p50/p95/p99)
+    
+    Read from per-minute or per-hour buckets, grouped per job or job class,
+    slowest p95 first.
+    """
+    try:
+        result = await run_blocking(
+            MetricsService.get_execution_metrics,
+            job_id=job_id,
+            job_class_string=job_class,
+            granularity=granularity,
+            window_minutes=window_minutes,
+            group_by=group_by,
+            include_series=include_series,
+        )
+        
+        if result["success"]:
+            return {
+                "status": "success",
+                "message": result["message"],
+                "window": result["window"],
+                "overall": result["overall"],
+                "total": len(result["data"]),
+                "data": result["data"]
+            }
+        else:
+            raise HTTPException(status_code=400, detail=result["message"])
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get("/retention/policies", response_model=Dict)
+async def get_retention_policies():
+    """Get the effective retention policy per collection"""
+    return {
+        "status": "success",
+        "data": RetentionService.get_policies()
+    }
+
+
+@router.post("/retention/run", response_model=Dict)
+async def run_retention(
+    response: Response,
+    collection: Optional[List[str]] = Query(None),
+    max_age_days: Optional[float] = Query(None, gt=0),
+    dry_run: bool = Query(True),
+):
+    """
+    Apply retention policies now
+    
+    Defaults to a dry run that only counts what would be removed. With
+    dry_run=false the archive and throttled deletes run in the background as
+    a DataCleanupJob execution: returns 202 with its execution_id; poll
+    /executions/{execution_id} for the per-collection report.
+    """
+    try:
+        if not dry_run:
+            result = await run_blocking(
+                SchedulerService.run_retention_now,
+                collections=collection,
+                max_age_days=max_age_days,
+            )
+            if not result["success"]:
+                # 429 tells the client to back off when the execution queue is full
+                raise HTTPException(status_code=429 if result.get("rejected") else 400, detail=result["message"])
+            
+            response.status_code = 202
+            return {
+                "status": "accepted",
+                "message": "Retention run queued",
+                "execution_id": result["execution_id"]
+            }
+        
+        result = await run_blocking(
+            RetentionService.apply_policies,
+            collections=collection,
+            max_age_days=max_age_days,
+            dry_run=True,
+        )
+        
+        if result["success"]:
+            return {
+                "status": "success",
+                "message": result["message"],
+                "data": result["data"]
+            }
+        else:
+            raise HTTPException(status_code=400, detail=result["message"])
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
 @router.get("/health", response_model=Dict)
 async def health_check():
     """Health check endpoint for scheduler"""
     try:
-        result = SchedulerService.get_scheduler_stats()
+        result = await run_blocking(SchedulerService.get_scheduler_stats)
         
         return {
             "status": "healthy" if result["success"] else "unhealthy",
@@ -339,7 +512,7 @@ async def schedule_job_hourly(job_id: str, minute: int):
             "day_of_week": "*",
         }
 
-        result = SchedulerService.update_job(job_id, cron_config)
+        result = await run_blocking(SchedulerService.update_job, job_id, cron_config)
 
         if result["success"]:
             return {
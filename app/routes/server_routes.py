@@ -2,8 +2,8 @@
 from fastapi import APIRouter, HTTPException
 from schemas.server import ServerCreateRequest, ServerUpdateRequest, ServerResponse
 from services.server_service import ServerService
-from models.server import Server
 from typing import List, Dict
+from core.executor import run_blocking
 
 router = APIRouter(prefix="/api/servers", tags=["servers"])
 
@@ -25,13 +25,7 @@ async def create_server(server_data: ServerCreateRequest):
     - password: ServiceNow password (required)
     """
     try:
-        # Initialize indexes if needed
-        try:
-            Server.create_indexes()
-        except:
-            pass  # Indexes might already exist
-        
-        result = ServerService.create_server(server_data.dict())
+        result = await run_blocking(ServerService.create_server, server_data.dict())
         
         if result["success"]:
             return {
@@ -51,7 +45,7 @@ async def create_server(server_data: ServerCreateRequest):
 async def get_server(server_id: str):
     """Get a server by ID"""
     try:
-        result = ServerService.get_server(server_id)
+        result = await run_blocking(ServerService.get_server, server_id)
         
         if result["success"]:
             return {
@@ -71,7 +65,7 @@ async def get_server(server_id: str):
 async def get_servers_by_user(user_id: str):
     """Get all servers for a specific user"""
     try:
-        result = ServerService.get_servers_by_user(user_id)
+        result = await run_blocking(ServerService.get_servers_by_user, user_id)
         
         return {
             "status": "success",
@@ -87,7 +81,7 @@ async def get_servers_by_user(user_id: str):
 async def get_all_servers():
     """Get all servers"""
     try:
-        result = ServerService.get_all_servers()
+        result = await run_blocking(ServerService.get_all_servers)
         
         return {
             "status": "success",
@@ -115,7 +109,7 @@ async def update_server(server_id: str, update_data: ServerUpdateRequest):
     - password
     """
     try:
-        result = ServerService.update_server(server_id, update_data.dict(exclude_unset=True))
+        result = await run_blocking(ServerService.update_server, server_id, update_data.dict(exclude_unset=True))
         
         if result["success"]:
             return {
@@ -135,7 +129,7 @@ async def update_server(server_id: str, update_data: ServerUpdateRequest):
 async def delete_server(server_id: str):
     """Delete a server by ID"""
     try:
-        result = ServerService.delete_server(server_id)
+        result = await run_blocking(ServerService.delete_server, server_id)
         
         if result["success"]:
             return {
@@ -154,7 +148,7 @@ async def delete_server(server_id: str):
 async def delete_servers_by_user(user_id: str):
     """Delete all servers for a user"""
     try:
-        result = ServerService.delete_servers_by_user(user_id)
+        result = await run_blocking(ServerService.delete_servers_by_user, user_id)
         
         return {
             "status": "success",
@@ -1,9 +1,15 @@
 """User routes for API endpoints"""
-from fastapi import APIRouter, UploadFile, File, HTTPException
+from fastapi import APIRouter, UploadFile, File, HTTPException, Query
+from fastapi.responses import StreamingResponse
 from schemas.user import UserIngestPayload, UserResponse
 from services.user_service import UserService
 from models.user import User
-from typing import List, Dict
+from core.uploads import upload_stream
+from core.executor import run_blocking
+from typing import List, Dict, Literal, Optional
+
+# Largest page a client may request from /api/all
+MAX_USERS_PAGE_SIZE = 5000
 
 router = APIRouter(prefix="/api", tags=["users"])
 
@@ -29,18 +35,13 @@ async def ingest_users_json(payload: UserIngestPayload):
     Stores email and name in MongoDB
     """
     try:
-        # Initialize indexes if needed
-        try:
-            User.create_indexes()
-        except:
-            pass  # Indexes might already exist
-        
         # Process the users
-        result = UserService.create_users_from_json_payload(payload.dict())
+        result = await run_blocking(UserService.create_users_from_json_payload, payload.dict())
         
         return {
-            "status": "success" if result["failed"] == 0 else "partial",
-            "message": f"Processed {result['total']} users. Success: {result['successful']}, Failed: {result['failed']}",
+            "status": "success" if result["failed"] == 0 and not result.get("error") else "partial",
+            "message": f"Processed {result['total']} users. Success: {result['successful']}, Failed: {result['failed']}"
+                       + (f". Stopped early: {result['error']}" if result.get("error") else ""),
             "data": result
         }
     except Exception as e:
@@ -66,21 +67,16 @@ async def ingest_users_excel(file: UploadFile = File(...)):
         if file.filename and not file.filename.endswith(('.xlsx', '.xls')):
             raise HTTPException(status_code=400, detail="File must be an Excel file (.xlsx or .xls)")
         
-        # Initialize indexes if needed
-        try:
-            User.create_indexes()
-        except:
-            pass  # Indexes might already exist
-        
-        # Read file content
-        contents = await file.read()
+        # Parse the file Starlette already spooled, without copying it
+        excel_file = upload_stream(file)
         
         # Process the Excel file
-        result = UserService.create_users_from_excel(contents)
+        result = await run_blocking(UserService.create_users_from_excel, excel_file)
         
         return {
-            "status": "success" if result["failed"] == 0 else "partial",
-            "message": f"Processed {result['total']} users. Success: {result['successful']}, Failed: {result['failed']}",
+            "status": "success" if result["failed"] == 0 and not result.get("error") else "partial",
+            "message": f"Processed {result['total']} users. Success: {result['successful']}, Failed: {result['failed']}"
+                       + (f". Stopped early: {result['error']}" if result.get("error") else ""),
             "data": result
         }
     except HTTPException:
@@ -90,15 +86,36 @@ async def ingest_users_excel(file: UploadFile = File(...)):
 
 
 @router.get("/all")
-async def get_all_users():
-    """Get all users from database"""
+async def get_all_users(
+    limit: Optional[int] = Query(None, ge=1, le=MAX_USERS_PAGE_SIZE),
+    after: Optional[str] = Query(None),
+    fields: Optional[str] = Query(None),
+    format: Literal["json", "ndjson"] = Query("json"),
+):
+    """
+    Get users from database, ordered by email
+    
+    - limit: page size (defaults to USERS_PAGE_SIZE for JSON; NDJSON streams everything when omitted)
+    - after: email of the last user on the previous page (use next_after from the response)
+    - fields: comma-separated projection, e.g. email,first_name
+    - format: "ndjson" streams one user per line straight from the cursor
+    """
     try:
-        users = UserService.get_all_users()
+        field_list = [field.strip() for field in fields.split(",") if field.strip()] if fields else None
+        
+        if format == "ndjson":
+            stream = UserService.iter_users_ndjson(after=after, limit=limit, fields=field_list)
+            return StreamingResponse(stream, media_type="application/x-ndjson")
+        
+        page = await run_blocking(UserService.get_users_page, after=after, limit=limit, fields=field_list)
         return {
             "status": "success",
-            "total": len(users),
-            "data": users
+            "total": len(page["data"]),
+            "next_after": page["next_after"],
+            "data": page["data"]
         }
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -107,7 +124,7 @@ async def get_all_users():
 async def get_user_by_email(email: str):
     """Get user by email"""
     try:
-        user = User.find_user_by_email(email)
+        user = await run_blocking(User.find_user_by_email, email)
         if not user:
             raise HTTPException(status_code=404, detail="User not found")
         return {
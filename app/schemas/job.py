@@ -35,6 +35,24 @@ class JobUpdateRequest(BaseModel):
     is_enabled: Optional[bool] = None
 
 
+class ScheduleSpec(BaseModel):
+    """Cron fields of a schedule to preview"""
+    minute: Optional[str] = "*"
+    hour: Optional[str] = "*"
+    day_of_month: Optional[str] = "*"
+    month: Optional[str] = "*"
+    day_of_week: Optional[str] = "*"
+    week: Optional[str] = "*"
+
+
+class SchedulePreviewRequest(BaseModel):
+    """Request schema for previewing next fire times"""
+    job_ids: Optional[List[str]] = []
+    schedules: Optional[List[ScheduleSpec]] = []
+    count: int = Field(5, ge=1, le=100)
+    start: Optional[datetime] = None
+
+
 class JobResponse(BaseModel):
     """Response schema for a job"""
     job_id: str = Field(..., alias="_id")
@@ -0,0 +1,109 @@
+"""
+Load benchmark for the async API handlers
+
+Sends concurrent requests to a data endpoint and, while they run, times a
+cheap probe endpoint (GET / by default). While handlers called pymongo
+directly on the event loop, every probe waited behind the in-flight queries,
+so probe p99 tracked the slowest query. With run_blocking it should stay
+close to the idle latency.
+
+Start the server from each revision you want to compare, then run:
+
+    python scripts/bench_event_loop.py --base-url http://localhost:8000 \
+        --path "/api/all?limit=5000" --concurrency 32 --requests 500
+
+Uses only the standard library.
+"""
+from concurrent.futures import ThreadPoolExecutor
+from threading import Event, Thread
+from typing import Dict, List
+import argparse
+import time
+import urllib.error
+import urllib.request
+
+
+def timed_get(url: str, timeout: float) -> float:
+    """GET url, read the whole body and return the latency in ms (errors count too)"""
+    started = time.perf_counter()
+    try:
+        with urllib.request.urlopen(url, timeout=timeout) as response:
+            response.read()
+    except (urllib.error.URLError, OSError) as e:
+        print(f"✗ {url}: {e}")
+    return (time.perf_counter() - started) * 1000
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """Nearest-rank percentile"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, int(round(pct / 100 * len(ordered))))
+    return ordered[min(rank, len(ordered)) - 1]
+
+
+def summarize(latencies: List[float], elapsed: float) -> Dict:
+    return {
+        "count": len(latencies),
+        "rps": round(len(latencies) / elapsed, 1) if elapsed else 0.0,
+        "p50_ms": round(percentile(latencies, 50), 1),
+        "p90_ms": round(percentile(latencies, 90), 1),
+        "p99_ms": round(percentile(latencies, 99), 1),
+        "max_ms": round(max(latencies), 1) if latencies else 0.0,
+    }
+
+
+def run(base_url: str, path: str, probe_path: str, concurrency: int, requests: int, probe_interval: float, timeout: float) -> Dict:
+    load_url = base_url.rstrip("/") + path
+    probe_url = base_url.rstrip("/") + probe_path
+
+    idle = [timed_get(probe_url, timeout) for _ in range(20)]
+
+    probes = []
+    done = Event()
+
+    def probe():
+        while not done.is_set():
+            probes.append(timed_get(probe_url, timeout))
+            done.wait(probe_interval)
+
+    prober = Thread(target=probe, daemon=True)
+    started = time.perf_counter()
+    prober.start()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        load = list(pool.map(lambda _: timed_get(load_url, timeout), range(requests)))
+    elapsed = time.perf_counter() - started
+    done.set()
+    prober.join()
+
+    return {
+        "idle_probe": summarize(idle, sum(idle) / 1000),
+        "load": summarize(load, elapsed),
+        "probe_under_load": summarize(probes, elapsed),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Probe event-loop latency while the API serves concurrent queries")
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--path", default="/api/all?limit=5000", help="Endpoint put under load")
+    parser.add_argument("--probe-path", default="/", help="Cheap endpoint whose latency is tracked")
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--probe-interval", type=float, default=0.05, help="Seconds between probes")
+    parser.add_argument("--timeout", type=float, default=60)
+    args = parser.parse_args()
+
+    results = run(args.base_url, args.path, args.probe_path, args.concurrency, args.requests, args.probe_interval, args.timeout)
+
+    print(f"{'':<18}{'count':>7}{'rps':>9}{'p50 ms':>10}{'p90 ms':>10}{'p99 ms':>10}{'max ms':>10}")
+    for name, stats in results.items():
+        print(
+            f"{name:<18}{stats['count']:>7}{stats['rps']:>9}{stats['p50_ms']:>10}"
+            f"{stats['p90_ms']:>10}{stats['p99_ms']:>10}{stats['max_ms']:>10}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,153 @@
+"""
+Benchmark for the scheduler execution history reads
+
+Seeds a throwaway database with executions (1M by default), builds the
+registry indexes, then times every list shape served by GET
+/api/scheduler/executions plus the detail read and the stats endpoint.
+For each list shape it also prints the winning plan, keys and documents
+examined, and whether the sort was done in memory.
+
+    python scripts/bench_execution_history.py --db texium_bench --executions 1000000
+
+Use a database of its own: the one given by --db is dropped first unless
+--skip-seed is passed. Run from the app directory (MONGO_URI is read as usual).
+"""
+import argparse
+import os
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Seed executions and time the history endpoints")
+    parser.add_argument("--db", required=True, help="Database to seed (dropped first)")
+    parser.add_argument("--executions", type=int, default=1_000_000)
+    parser.add_argument("--jobs", type=int, default=200)
+    parser.add_argument("--batch-size", type=int, default=10_000)
+    parser.add_argument("--output-bytes", type=int, default=512, help="Size of each seeded output field")
+    parser.add_argument("--limit", type=int, default=100, help="Page size requested from the list reads")
+    parser.add_argument("--repeat", type=int, default=50, help="Timed runs per read")
+    parser.add_argument("--skip-seed", action="store_true", help="Reuse the executions already in --db")
+    return parser.parse_args()
+
+
+args = parse_args()
+# Point the app modules at the benchmark database before they read DB_NAME
+os.environ["DB_NAME"] = args.db
+
+from bson import ObjectId  # noqa: E402
+from core.database import connect_to_mongo, get_db  # noqa: E402
+from core.indexes import bootstrap_indexes  # noqa: E402
+from models.job import JobExecution  # noqa: E402
+from services.scheduler_service import SchedulerService  # noqa: E402
+
+STATUSES = ["completed"] * 85 + ["failed"] * 10 + ["running"] * 3 + ["rejected"] * 2
+
+
+def seed(executions: int, jobs: int, batch_size: int, output_bytes: int):
+    db = get_db()
+    db.client.drop_database(args.db)
+    bootstrap_indexes("create")
+
+    job_ids = [ObjectId() for _ in range(jobs)]
+    user_ids = [ObjectId() for _ in range(max(1, jobs // 20))]
+    started = time.perf_counter()
+    now = datetime.utcnow()
+    collection = db["scheduler_executions"]
+    for offset in range(0, executions, batch_size):
+        docs = []
+        for idx in range(offset, min(offset + batch_size, executions)):
+            job_idx = idx % jobs
+            created_at = now - timedelta(seconds=executions - idx)
+            docs.append({
+                "job_id": job_ids[job_idx],
+                "user_id": user_ids[job_idx % len(user_ids)],
+                "job_name": f"bench-job-{job_idx}",
+                "job_class_string": "jobs.reports.ReportGenerationJob",
+                "status": random.choice(STATUSES),
+                # Realistic weight for the fields the list views must not read
+                "output": "x" * output_bytes,
+                "error": "",
+                "started_at": created_at,
+                "completed_at": created_at + timedelta(seconds=1),
+                "created_at": created_at,
+                "updated_at": created_at,
+            })
+        collection.insert_many(docs, ordered=False)
+        print(f"  seeded {min(offset + batch_size, executions):,}/{executions:,}", end="\r")
+    print(f"\n✓ Seeded {executions:,} executions in {time.perf_counter() - started:.1f}s")
+
+
+def timed(fn, repeat: int) -> dict:
+    fn()  # warm the cache
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - started) * 1000)
+    samples.sort()
+    return {
+        "p50_ms": samples[len(samples) // 2],
+        "p99_ms": samples[min(len(samples) - 1, int(len(samples) * 0.99))],
+        "max_ms": samples[-1],
+    }
+
+
+def plan_summary(query: dict, limit: int) -> str:
+    """Winning plan stages, keys/docs examined and whether a blocking SORT was needed"""
+    explain = (
+        get_db()["scheduler_executions"]
+        .find(query, JobExecution.LIST_PROJECTION)
+        .sort("created_at", -1)
+        .limit(limit)
+        .explain()
+    )
+    stats = explain["executionStats"]
+    stages = []
+    stage = explain["queryPlanner"]["winningPlan"]
+    while stage:
+        name = stage.get("stage")
+        if name == "IXSCAN":
+            name += str(dict(stage.get("keyPattern", {})))
+        stages.append(name)
+        stage = stage.get("inputStage") or stage.get("queryPlan")
+    return f"{' <- '.join(stages)} keys={stats['totalKeysExamined']} docs={stats['totalDocsExamined']}"
+
+
+def main():
+    connect_to_mongo()
+    if not args.skip_seed:
+        seed(args.executions, args.jobs, args.batch_size, args.output_bytes)
+
+    collection = get_db()["scheduler_executions"]
+    sample = collection.find_one({"status": "failed"}, {"job_id": 1})
+    job_id = str(sample["job_id"])
+    execution_id = str(sample["_id"])
+    limit = args.limit
+
+    list_shapes = {
+        "recent": ({}, {}),
+        "by job": ({"job_id": job_id}, {"job_id": ObjectId(job_id)}),
+        "by status": ({"status": "failed"}, {"status": "failed"}),
+        "by job + status": ({"job_id": job_id, "status": "failed"}, {"job_id": ObjectId(job_id), "status": "failed"}),
+    }
+
+    print(f"\n{'read':<20}{'p50 ms':>10}{'p99 ms':>10}{'max ms':>10}  plan")
+    for name, (filters, query) in list_shapes.items():
+        stats = timed(lambda: SchedulerService.get_executions(limit=limit, **filters), args.repeat)
+        print(f"{name:<20}{stats['p50_ms']:>10.2f}{stats['p99_ms']:>10.2f}{stats['max_ms']:>10.2f}  {plan_summary(query, limit)}")
+
+    for name, fn in {
+        "detail": lambda: SchedulerService.get_execution(execution_id),
+        "stats": lambda: SchedulerService.get_scheduler_stats(),
+    }.items():
+        stats = timed(fn, args.repeat)
+        print(f"{name:<20}{stats['p50_ms']:>10.2f}{stats['p99_ms']:>10.2f}{stats['max_ms']:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
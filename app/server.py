@@ -4,12 +4,21 @@ Main FastAPI server application
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from core.database import connect_to_mongo, close_mongo_connection
+from core.executor import shutdown_executor
+from core.http_client import close_http_client
+from core.indexes import bootstrap_indexes
+from core.uploads import UploadSizeLimitMiddleware
 from routes.user_routes import router as user_router
 from routes.server_routes import router as server_router
 from routes.scheduler_routes import router as scheduler_router
 from jobs.scheduler_route import router as hourly_router
 from routes.connection_routes import router as connection_router
+from routes.ingest_routes import router as ingest_router
+from routes.metrics_routes import router as metrics_router
 from services.scheduler_service import SchedulerService
+from services.ingest_service import IngestService
+from services.connection_service import ConnectionService
+from services.retention_service import RetentionService
 import os
 from dotenv import load_dotenv
 
@@ -32,19 +41,27 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Refuse oversized Excel uploads before their bodies are spooled
+app.add_middleware(UploadSizeLimitMiddleware, paths=["/api/bulk-user", "/api/ingest/bulk-user"])
+
 # Include routes
 app.include_router(user_router)
 app.include_router(server_router)
 app.include_router(scheduler_router)
 app.include_router(hourly_router)
 app.include_router(connection_router)
+app.include_router(ingest_router)
+app.include_router(metrics_router)
 
 
 @app.on_event("startup")
 async def startup_event():
-    """Initialize database connection on startup"""
+    """Initialize database connection and indexes on startup"""
     try:
         connect_to_mongo()
+        bootstrap_indexes()
+        RetentionService.apply_ttl_policies()
+        IngestService.recover_interrupted()
         SchedulerService.initialize_scheduler()
         print("✓ Application started successfully")
     except Exception as e:
@@ -56,6 +73,10 @@ async def startup_event():
 async def shutdown_event():
     """Close database connection on shutdown"""
     SchedulerService.shutdown_scheduler()
+    IngestService.shutdown()
+    ConnectionService.shutdown()
+    shutdown_executor()
+    close_http_client()
     close_mongo_connection()
 
 
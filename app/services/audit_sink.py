@@ -0,0 +1,164 @@
+"""Buffered background writer for scheduler audit logs."""
+from queue import Empty, Full, Queue
+from threading import Lock, Thread
+from typing import Dict
+import os
+import time
+
+from models.job import JobAuditLog
+
+# Events written per insert_many
+AUDIT_BATCH_SIZE = int(os.getenv("AUDIT_BATCH_SIZE", "100"))
+# Longest an event waits in memory before being flushed
+AUDIT_FLUSH_INTERVAL_SECONDS = float(os.getenv("AUDIT_FLUSH_INTERVAL_SECONDS", "1.0"))
+# Events buffered in memory before the overflow policy applies
+AUDIT_QUEUE_SIZE = int(os.getenv("AUDIT_QUEUE_SIZE", "10000"))
+# What to do when the buffer is full: block (wait for the writer), sync (write inline),
+# drop_newest or drop_oldest; the drop policies lose audit events and are reported
+AUDIT_OVERFLOW_POLICY = os.getenv("AUDIT_OVERFLOW_POLICY", "block")
+# Print a warning on the first dropped event and then every this many drops
+AUDIT_DROP_WARNING_EVERY = 1000
+
+OVERFLOW_POLICIES = ("drop_newest", "drop_oldest", "block", "sync")
+
+_STOP = object()
+
+
+class AuditLogSink:
+    """
+    Takes audit persistence off the request and execution threads.
+
+    Events are queued in memory and written by one background thread with
+    insert_many, whenever batch_size events are waiting or flush_interval
+    seconds have passed. shutdown() drains whatever is still buffered;
+    events emitted after it are written inline.
+    """
+
+    def __init__(
+        self,
+        batch_size: int = AUDIT_BATCH_SIZE,
+        flush_interval: float = AUDIT_FLUSH_INTERVAL_SECONDS,
+        queue_size: int = AUDIT_QUEUE_SIZE,
+        overflow_policy: str = AUDIT_OVERFLOW_POLICY,
+    ):
+        if overflow_policy not in OVERFLOW_POLICIES:
+            raise ValueError(f"Unknown audit overflow policy '{overflow_policy}'")
+
+        self._batch_size = batch_size
+        self._flush_interval = flush_interval
+        self._overflow_policy = overflow_policy
+        self._queue = Queue(maxsize=queue_size)
+        self._stats_lock = Lock()
+        self._stats = {"enqueued": 0, "flushed": 0, "dropped": 0, "failed": 0, "written_inline": 0}
+        # Held while checking for shutdown and enqueueing, so nothing lands behind the stop marker
+        self._emit_lock = Lock()
+        self._closed = False
+        self._thread = Thread(target=self._run, name="audit-log-sink", daemon=True)
+        self._thread.start()
+
+    def _count(self, key: str, amount: int = 1):
+        with self._stats_lock:
+            self._stats[key] += amount
+
+    def emit(self, log_doc: dict):
+        """Buffer a prebuilt audit log document for writing (inline once shut down)."""
+        with self._emit_lock:
+            if not self._closed:
+                self._enqueue(log_doc)
+                return
+        self._write([log_doc], inline=True)
+
+    def _enqueue(self, log_doc: dict):
+        try:
+            self._queue.put_nowait(log_doc)
+            self._count("enqueued")
+            return
+        except Full:
+            pass
+
+        if self._overflow_policy == "block":
+            self._queue.put(log_doc)
+            self._count("enqueued")
+        elif self._overflow_policy == "drop_oldest":
+            try:
+                self._queue.get_nowait()
+                self._dropped()
+            except Empty:
+                pass
+            try:
+                self._queue.put_nowait(log_doc)
+                self._count("enqueued")
+            except Full:
+                self._dropped()
+        elif self._overflow_policy == "sync":
+            self._write([log_doc], inline=True)
+        else:
+            self._dropped()
+
+    def _dropped(self):
+        with self._stats_lock:
+            self._stats["dropped"] += 1
+            dropped = self._stats["dropped"]
+        if dropped == 1 or dropped % AUDIT_DROP_WARNING_EVERY == 0:
+            print(f"✗ Audit log buffer full ({self._overflow_policy}): {dropped} audit events dropped so far")
+
+    def _write(self, batch: list, inline: bool = False):
+        try:
+            JobAuditLog.insert_logs(batch)
+            self._count("written_inline" if inline else "flushed", len(batch))
+        except Exception as e:
+            print(f"Failed to write {len(batch)} audit logs: {e}")
+            self._count("failed", len(batch))
+
+    def _run(self):
+        stopping = False
+        while not stopping:
+            batch = []
+            deadline = time.monotonic() + self._flush_interval
+            while len(batch) < self._batch_size:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=timeout)
+                except Empty:
+                    break
+                if item is _STOP:
+                    stopping = True
+                    break
+                batch.append(item)
+            if batch:
+                self._write(batch)
+
+        # Drain anything emitted before shutdown
+        batch = []
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except Empty:
+                break
+            if item is not _STOP:
+                batch.append(item)
+            if len(batch) >= self._batch_size:
+                self._write(batch)
+                batch = []
+        if batch:
+            self._write(batch)
+
+    def stats(self) -> Dict:
+        """Counters and current buffer depth."""
+        with self._stats_lock:
+            return {
+                "queued": self._queue.qsize(),
+                "overflow_policy": self._overflow_policy,
+                **self._stats,
+            }
+
+    def shutdown(self, timeout: float = 10.0):
+        """Flush buffered events and stop the writer thread; later events are written inline."""
+        with self._emit_lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._queue.put(_STOP)
+        self._thread.join(timeout)
@@ -1,100 +1,348 @@
 """Connection service - business logic for connections"""
 
 from models.connection import Connection
+from models.connection_health import ConnectionHealth
+from services.oauth_tokens import OAuthTokenError, token_manager, uses_oauth
+from services.veeva_client import VeevaAuthError, VeevaClient
+from core.http_client import HTTP_CONNECT_TIMEOUT_SECONDS, HTTP_READ_TIMEOUT_SECONDS, http_request
+from concurrent.futures import ThreadPoolExecutor, wait
+from datetime import datetime
+from threading import Lock
 from fastapi import HTTPException
 from bson import ObjectId
+import hashlib
+import json
+import os
 import requests
+import time
+
+# Threads probing connections concurrently for /test-all
+CONNECTION_TEST_WORKERS = int(os.getenv("CONNECTION_TEST_WORKERS", "16"))
+# Overall time budget of a /test-all call
+CONNECTION_TEST_DEADLINE_SECONDS = float(os.getenv("CONNECTION_TEST_DEADLINE_SECONDS", "15"))
+# Cached health is served as is for the TTL, then served while refreshing for the stale window
+CONNECTION_HEALTH_TTL_SECONDS = float(os.getenv("CONNECTION_HEALTH_TTL_SECONDS", "60"))
+CONNECTION_HEALTH_STALE_SECONDS = float(os.getenv("CONNECTION_HEALTH_STALE_SECONDS", "300"))
+
+_test_pool = None
+_test_pool_lock = Lock()
+# Connection ids with a background refresh in flight
+_refreshing = set()
+_refreshing_lock = Lock()
 
 
 class ConnectionService:
 
     @staticmethod
     def test_connection(connection):
+        """
+        Test a connection against its external system
+        Returns {"success", "status_code", "timings", "error"}.
+        """
         connection_dict=connection.model_dump()
 
-        connection_type = connection_dict.get("type")
-    
+        tester = ConnectionService._tester(connection_dict.get("type"))
+        if tester is None:
+            raise Exception("Unsupported connection type")
 
-        if connection_type == "veeva_vault":
-            return ConnectionService._test_veeva(connection_dict)
+        return tester(connection_dict)
 
-        elif connection_type == "servicenow":
-            return ConnectionService._test_servicenow(connection_dict)
+    @staticmethod
+    def _tester(connection_type):
+        """Tester function for a connection type, or None if unsupported"""
+        return {
+            "veeva_vault": ConnectionService._test_veeva,
+            "servicenow": ConnectionService._test_servicenow,
+            "workday": ConnectionService._test_workday,
+            "successfactors": ConnectionService._test_successfactors,
+            "cornerstone": ConnectionService._test_cornerstone,
+        }.get(getattr(connection_type, "value", connection_type))
 
-        elif connection_type == "workday":
-            return ConnectionService._test_workday(connection_dict)
+    @staticmethod
+    def _get_test_pool():
+        """Bounded pool shared by bulk connection tests, created on first use"""
+        global _test_pool
+        with _test_pool_lock:
+            if _test_pool is None:
+                _test_pool = ThreadPoolExecutor(
+                    max_workers=CONNECTION_TEST_WORKERS,
+                    thread_name_prefix="connection-test"
+                )
+            return _test_pool
 
-        elif connection_type == "successfactors":
-            return ConnectionService._test_successfactors(connection_dict)
+    @staticmethod
+    def shutdown():
+        """Stop the bulk test pool without waiting for probes still running"""
+        global _test_pool
+        with _test_pool_lock:
+            if _test_pool is not None:
+                _test_pool.shutdown(wait=False, cancel_futures=True)
+                _test_pool = None
 
-        elif connection_type == "cornerstone":
-            return ConnectionService._test_cornerstone(connection_dict)
+    @staticmethod
+    def _test_stored_connection(connection: dict, timeout):
+        """Test one stored connection, never raising"""
+        tester = ConnectionService._tester(connection.get("type"))
+        if tester is None:
+            return ConnectionService._failed(f"Unsupported connection type '{connection.get('type')}'")
+        try:
+            return tester(connection, timeout=timeout)
+        except Exception as e:
+            return ConnectionService._failed(str(e))
 
-        else:
-            raise Exception("Unsupported connection type")
+    @staticmethod
+    def _config_hash(connection: dict) -> str:
+        """Hash of everything a probe depends on; a changed connection never reuses old health"""
+        material = {key: connection.get(key) for key in ("type", "config", "credentials")}
+        return hashlib.sha256(json.dumps(material, sort_keys=True, default=str).encode("utf-8")).hexdigest()
 
-    # -------------------------
-    # VEEVA
-    # -------------------------
+    @staticmethod
+    def _cache_state(health, config_hash: str) -> str:
+        """fresh (within TTL), stale (servable while refreshing) or expired (must probe)"""
+        if not health or health.get("config_hash") != config_hash:
+            return "expired"
+        age = (datetime.utcnow() - health["checked_at"]).total_seconds()
+        if age <= CONNECTION_HEALTH_TTL_SECONDS:
+            return "fresh"
+        if age <= CONNECTION_HEALTH_TTL_SECONDS + CONNECTION_HEALTH_STALE_SECONDS:
+            return "stale"
+        return "expired"
 
     @staticmethod
-    def _test_veeva(connection):
+    def _health_entry(connection: dict, result: dict, checked_at, source: str):
+        timings = result.get("timings") or {}
+        return {
+            "connection_id": str(connection["_id"]),
+            "connectionName": connection.get("connectionName"),
+            "type": connection.get("type"),
+            "environment": connection.get("environment"),
+            "status": "healthy" if result["success"] else "unhealthy",
+            "status_code": result["status_code"],
+            "latency_ms": timings.get("total_ms", result.get("latency_ms")),
+            "timings": result["timings"],
+            "error": result["error"],
+            "checked_at": checked_at,
+            "source": source,
+        }
 
+    @staticmethod
+    def _probe_and_store(connection: dict, config_hash: str, timeout=None):
+        """Probe a stored connection and record the result as its last known health"""
+        result = ConnectionService._test_stored_connection(connection, timeout)
         try:
-            config = connection["config"]
-            credentials = connection["credentials"]
+            ConnectionHealth.upsert_health(str(connection["_id"]), config_hash, result)
+        except Exception as e:
+            print(f"Failed to store connection health: {e}")
+        return result
+
+    @staticmethod
+    def _refresh_in_background(connection: dict, config_hash: str):
+        """Re-probe a stale connection once, however many readers asked for it"""
+        connection_id = str(connection["_id"])
+        with _refreshing_lock:
+            if connection_id in _refreshing:
+                return
+            _refreshing.add(connection_id)
+
+        def refresh():
+            try:
+                ConnectionService._probe_and_store(connection, config_hash)
+            finally:
+                with _refreshing_lock:
+                    _refreshing.discard(connection_id)
+
+        ConnectionService._get_test_pool().submit(refresh)
 
-            instance_url = config.get("instanceUrl")
-            api_version = config.get("apiVersion", "v23.2")
+    @staticmethod
+    def test_all_connections(connection_type=None, environment=None, deadline_seconds=None, force=False):
+        """
+        Report the health of stored connections within one overall deadline
+        Cached results within CONNECTION_HEALTH_TTL_SECONDS are served as is, stale ones
+        are served while being refreshed in the background, and the rest (or all,
+        with force) are probed concurrently. Probes still running at the deadline
+        are reported as "timeout".
+        """
+        deadline_seconds = deadline_seconds or CONNECTION_TEST_DEADLINE_SECONDS
+        started = time.perf_counter()
+
+        connections = Connection.find_connections(connection_type=connection_type, environment=environment)
+        cached = ConnectionHealth.find_health_many([str(connection["_id"]) for connection in connections])
+        # No single request may outlive the overall deadline
+        timeout = (min(HTTP_CONNECT_TIMEOUT_SECONDS, deadline_seconds), min(HTTP_READ_TIMEOUT_SECONDS, deadline_seconds))
+
+        pool = ConnectionService._get_test_pool()
+        entries = {}
+        futures = {}
+        for connection in connections:
+            connection_id = str(connection["_id"])
+            config_hash = ConnectionService._config_hash(connection)
+            health = cached.get(connection_id)
+            state = "expired" if force else ConnectionService._cache_state(health, config_hash)
+
+            if state == "expired":
+                futures[pool.submit(ConnectionService._probe_and_store, connection, config_hash, timeout)] = connection
+                continue
+
+            entries[connection_id] = ConnectionService._health_entry(connection, health, health["checked_at"], state)
+            if state == "stale":
+                ConnectionService._refresh_in_background(connection, config_hash)
+
+        remaining = deadline_seconds - (time.perf_counter() - started)
+        wait(futures, timeout=max(0, remaining))
+
+        for future, connection in futures.items():
+            if future.done():
+                entry = ConnectionService._health_entry(connection, future.result(), datetime.utcnow(), "live")
+            else:
+                future.cancel()
+                entry = ConnectionService._health_entry(
+                    connection,
+                    ConnectionService._failed(f"No result within {deadline_seconds}s"),
+                    None,
+                    "live"
+                )
+                entry["status"] = "timeout"
+            entries[str(connection["_id"])] = entry
+
+        data = [entries[str(connection["_id"])] for connection in connections]
+        summary = {"healthy": 0, "unhealthy": 0, "timeout": 0}
+        for entry in data:
+            summary[entry["status"]] += 1
 
-            if not instance_url:
-                return False
+        return {
+            "status": "success",
+            "message": "Connections tested",
+            "total": len(data),
+            "summary": summary,
+            "elapsed_ms": round((time.perf_counter() - started) * 1000, 3),
+            "data": data
+        }
 
-            url = f"{instance_url}/api/{api_version}/objects/documents?limit=1"
+    @staticmethod
+    def get_connection_health(connection_id: str, force: bool = False):
+        """Last known health of one stored connection, probing only when needed (or forced)"""
+        connection = Connection.find_connection_by_id(connection_id)
 
-            response = requests.get(
-                url,
-                auth=(credentials.get("username"), credentials.get("password")),
-                timeout=10
-            )
+        if not connection:
+            raise HTTPException(status_code=404, detail="Connection not found")
+
+        config_hash = ConnectionService._config_hash(connection)
+        health = ConnectionHealth.find_health_many([connection_id]).get(connection_id)
+        state = "expired" if force else ConnectionService._cache_state(health, config_hash)
+
+        if state == "expired":
+            result = ConnectionService._probe_and_store(connection, config_hash)
+            entry = ConnectionService._health_entry(connection, result, datetime.utcnow(), "live")
+        else:
+            entry = ConnectionService._health_entry(connection, health, health["checked_at"], state)
+            if state == "stale":
+                ConnectionService._refresh_in_background(connection, config_hash)
 
-            return response.status_code == 200
+        return {
+            "status": "success",
+            "message": "Connection health retrieved successfully",
+            "data": entry
+        }
 
+    @staticmethod
+    def _failed(error: str):
+        return {"success": False, "status_code": None, "timings": None, "error": error}
+
+    @staticmethod
+    def _probe(system: str, url: str, auth, ok_statuses=(200,), headers=None, timeout=None):
+        """GET url through the pooled HTTP client and report the outcome with timings"""
+        try:
+            response, timings = http_request("GET", url, auth=auth, headers=headers, timeout=timeout)
+            response.close()
+            return {
+                "success": response.status_code in ok_statuses,
+                "status_code": response.status_code,
+                "timings": timings,
+                "error": None
+            }
         except requests.exceptions.RequestException as e:
-            print("Veeva connection error:", str(e))
-            return False
+            print(f"{system} connection error:", str(e))
+            return ConnectionService._failed(str(e))
 
+    @staticmethod
+    def _probe_oauth(system: str, url: str, credentials: dict, timeout=None):
+        """
+        GET url with a cached client-credentials bearer token
+        A 401 drops the token and the probe is repeated once with a fresh one.
+        """
+        token_args = (credentials["tokenUrl"], credentials["clientId"], credentials["clientSecret"])
+        for attempt in range(2):
+            try:
+                access_token = token_manager.get_token(*token_args, grant_type=credentials.get("grantType"), timeout=timeout)
+            except (OAuthTokenError, requests.exceptions.RequestException) as e:
+                print(f"{system} token error:", str(e))
+                return ConnectionService._failed(str(e))
+
+            result = ConnectionService._probe(
+                system,
+                url,
+                auth=None,
+                headers={"Authorization": f"Bearer {access_token}"},
+                timeout=timeout
+            )
+            if attempt == 0 and result["status_code"] == 401:
+                token_manager.invalidate(*token_args, access_token)
+                continue
+            return result
 
     # -------------------------
-    # SERVICENOW
+    # VEEVA
     # -------------------------
 
     @staticmethod
-    def _test_servicenow(connection):
+    def _test_veeva(connection, timeout=None):
+
+        config = connection["config"]
+
+        if not config.get("instanceUrl"):
+            return ConnectionService._failed("instanceUrl is required")
+
+        # Authenticates once per connection; later tests reuse the cached session
+        client = VeevaClient.from_connection(connection)
 
         try:
-            config = connection["config"]
-            credentials = connection["credentials"]
+            response, timings = client.get("/objects/documents?limit=1", timeout=timeout)
+            response.close()
+            return {
+                "success": response.status_code == 200,
+                "status_code": response.status_code,
+                "timings": timings,
+                "error": None
+            }
+        except (VeevaAuthError, requests.exceptions.RequestException) as e:
+            print("Veeva connection error:", str(e))
+            return ConnectionService._failed(str(e))
 
-            instance_url = config.get("instanceUrl")
 
-            if not instance_url:
-                return False
+    # -------------------------
+    # SERVICENOW
+    # -------------------------
 
-            url = f"{instance_url}/api/now/table/sys_user?sysparm_limit=1"
+    @staticmethod
+    def _test_servicenow(connection, timeout=None):
 
-            response = requests.get(
-                url,
-                auth=(credentials.get("username"), credentials.get("password")),
-                headers={"Accept": "application/json"},
-                timeout=10
-            )
+        config = connection["config"]
+        credentials = connection["credentials"]
 
-            return response.status_code == 200
+        instance_url = config.get("instanceUrl")
 
-        except requests.exceptions.RequestException as e:
-            print("ServiceNow connection error:", str(e))
-            return False
+        if not instance_url:
+            return ConnectionService._failed("instanceUrl is required")
+
+        url = f"{instance_url}/api/now/table/sys_user?sysparm_limit=1"
+
+        return ConnectionService._probe(
+            "ServiceNow",
+            url,
+            auth=(credentials.get("username"), credentials.get("password")),
+            headers={"Accept": "application/json"},
+            timeout=timeout
+        )
 
 
     # -------------------------
@@ -102,31 +350,29 @@ class ConnectionService:
     # -------------------------
 
     @staticmethod
-    def _test_workday(connection):
+    def _test_workday(connection, timeout=None):
 
-        try:
-            config = connection["config"]
-            credentials = connection["credentials"]
+        config = connection["config"]
+        credentials = connection["credentials"]
 
-            base_url = config.get("baseUrl")
-            tenant = config.get("tenant")
+        base_url = config.get("baseUrl")
+        tenant = config.get("tenant")
 
-            if not base_url or not tenant:
-                return False
+        if not base_url or not tenant:
+            return ConnectionService._failed("baseUrl and tenant are required")
 
-            url = f"{base_url}/ccx/api/v1/{tenant}/workers?limit=1"
-
-            response = requests.get(
-                url,
-                auth=(credentials.get("clientId"), credentials.get("clientSecret")),
-                timeout=10
-            )
+        url = f"{base_url}/ccx/api/v1/{tenant}/workers?limit=1"
 
-            return response.status_code in [200, 401]
+        if uses_oauth(credentials):
+            return ConnectionService._probe_oauth("Workday", url, credentials, timeout=timeout)
 
-        except requests.exceptions.RequestException as e:
-            print("Workday connection error:", str(e))
-            return False
+        return ConnectionService._probe(
+            "Workday",
+            url,
+            auth=(credentials.get("clientId"), credentials.get("clientSecret")),
+            ok_statuses=(200, 401),
+            timeout=timeout
+        )
 
 
     # -------------------------
@@ -134,37 +380,31 @@ class ConnectionService:
     # -------------------------
 
     @staticmethod
-    def _test_successfactors(connection):
+    def _test_successfactors(connection, timeout=None):
 
-        try:
-            config = connection["config"]
-            credentials = connection["credentials"]
+        config = connection["config"]
+        credentials = connection["credentials"]
 
-            base_url = config.get("baseUrl")
-            company_id = config.get("companyId")
+        base_url = config.get("baseUrl")
+        company_id = config.get("companyId")
 
-            username = credentials.get("username")
-            password = credentials.get("password")
+        username = credentials.get("username")
+        password = credentials.get("password")
 
-            if not base_url or not username or not password:
-                return False
+        if not base_url or not username or not password:
+            return ConnectionService._failed("baseUrl, username and password are required")
 
-            auth_user = f"{username}@{company_id}"
+        auth_user = f"{username}@{company_id}"
 
-            url = f"{base_url}/odata/v2/User?$top=1&$format=json"
+        url = f"{base_url}/odata/v2/User?$top=1&$format=json"
 
-            response = requests.get(
-                url,
-                auth=(auth_user, password),
-                headers={"Accept": "application/json"},
-                timeout=10
-            )
-
-            return response.status_code == 200
-
-        except requests.exceptions.RequestException as e:
-            print("SuccessFactors connection error:", str(e))
-            return False
+        return ConnectionService._probe(
+            "SuccessFactors",
+            url,
+            auth=(auth_user, password),
+            headers={"Accept": "application/json"},
+            timeout=timeout
+        )
 
 
     # -------------------------
@@ -172,33 +412,31 @@ class ConnectionService:
     # -------------------------
 
     @staticmethod
-    def _test_cornerstone(connection):
+    def _test_cornerstone(connection, timeout=None):
 
-        try:
-            config = connection["config"]
-            credentials = connection["credentials"]
+        config = connection["config"]
+        credentials = connection["credentials"]
 
-            base_url = config.get("baseUrl")
+        base_url = config.get("baseUrl")
 
-            client_id = credentials.get("clientId")
-            client_secret = credentials.get("clientSecret")
+        client_id = credentials.get("clientId")
+        client_secret = credentials.get("clientSecret")
 
-            if not base_url or not client_id or not client_secret:
-                return False
+        if not base_url or not client_id or not client_secret:
+            return ConnectionService._failed("baseUrl, clientId and clientSecret are required")
 
-            url = f"{base_url}/services/api/x/users/v1"
+        url = f"{base_url}/services/api/x/users/v1"
 
-            response = requests.get(
-                url,
-                auth=(client_id, client_secret),
-                timeout=10
-            )
-
-            return response.status_code in [200, 401]
+        if uses_oauth(credentials):
+            return ConnectionService._probe_oauth("Cornerstone", url, credentials, timeout=timeout)
 
-        except requests.exceptions.RequestException as e:
-            print("Cornerstone connection error:", str(e))
-            return False
+        return ConnectionService._probe(
+            "Cornerstone",
+            url,
+            auth=(client_id, client_secret),
+            ok_statuses=(200, 401),
+            timeout=timeout
+        )
 
     @staticmethod
     def create_connection(payload):
@@ -285,6 +523,8 @@ class ConnectionService:
         if not deleted:
             raise HTTPException(status_code=404, detail="Connection not found")
 
+        ConnectionHealth.delete_health(connection_id)
+
         return {
             "status": "success",
             "message": "Connection deleted successfully",
@@ -0,0 +1,158 @@
+"""Bounded worker pool for scheduler job executions."""
+from collections import defaultdict, deque
+from queue import Empty, Queue
+from threading import Lock, Thread
+from typing import Callable, Dict, Optional
+import json
+import os
+import time
+
+# Worker threads running job executions
+SCHEDULER_MAX_WORKERS = int(os.getenv("SCHEDULER_MAX_WORKERS", "10"))
+# Executions allowed to wait for a worker before new ones are rejected
+SCHEDULER_MAX_QUEUE_SIZE = int(os.getenv("SCHEDULER_MAX_QUEUE_SIZE", "100"))
+# Concurrent executions allowed per job class, plus JSON overrides, e.g. {"jobs.backup.DataBackupJob": 1}
+SCHEDULER_JOB_CLASS_CONCURRENCY = int(os.getenv("SCHEDULER_JOB_CLASS_CONCURRENCY", "2"))
+SCHEDULER_JOB_CLASS_LIMITS = json.loads(os.getenv("SCHEDULER_JOB_CLASS_LIMITS", "{}"))
+
+
+class ExecutionPool:
+    """
+    Fixed set of worker threads fed by a bounded backlog.
+
+    Tasks beyond max_queue_size waiting executions are rejected instead of
+    spawning more threads. A task whose job class is already at its
+    concurrency limit is parked and re-queued when a run of that class ends.
+    Tasks that have not started when the pool shuts down are dropped and
+    their on_cancel callback is called instead.
+    """
+
+    def __init__(
+        self,
+        max_workers: int = SCHEDULER_MAX_WORKERS,
+        max_queue_size: int = SCHEDULER_MAX_QUEUE_SIZE,
+        default_class_limit: int = SCHEDULER_JOB_CLASS_CONCURRENCY,
+        class_limits: Optional[Dict[str, int]] = None,
+    ):
+        self._max_queue_size = max_queue_size
+        self._default_class_limit = default_class_limit
+        self._class_limits = class_limits if class_limits is not None else SCHEDULER_JOB_CLASS_LIMITS
+        self._queue = Queue()
+        self._lock = Lock()
+        self._waiting = 0
+        self._running = defaultdict(int)
+        self._parked = defaultdict(deque)
+        self._closed = False
+        self._stats = {"submitted": 0, "rejected": 0, "completed": 0, "cancelled": 0}
+        self._workers = [
+            Thread(target=self._worker, name=f"job-executor-{idx}", daemon=True)
+            for idx in range(max_workers)
+        ]
+        for worker in self._workers:
+            worker.start()
+
+    def _class_limit(self, job_class_string: str) -> int:
+        return self._class_limits.get(job_class_string, self._default_class_limit)
+
+    def submit(self, job_class_string: str, fn: Callable[[], None], on_cancel: Optional[Callable[[], None]] = None) -> bool:
+        """
+        Queue fn for execution; returns False if the backlog is full or the pool is shut down.
+        on_cancel is called instead of fn if the pool shuts down before fn starts.
+        """
+        with self._lock:
+            if self._closed or self._waiting >= self._max_queue_size:
+                self._stats["rejected"] += 1
+                return False
+            self._waiting += 1
+            self._stats["submitted"] += 1
+        self._queue.put((job_class_string, fn, on_cancel))
+        return True
+
+    def _cancel(self, task):
+        _, _, on_cancel = task
+        with self._lock:
+            self._stats["cancelled"] += 1
+        if on_cancel is None:
+            return
+        try:
+            on_cancel()
+        except Exception as e:
+            print(f"Unhandled error cancelling job execution: {e}")
+
+    def _worker(self):
+        while True:
+            task = self._queue.get()
+            if task is None:
+                return
+
+            job_class_string, fn, _ = task
+            with self._lock:
+                closed = self._closed
+                if closed:
+                    self._waiting -= 1
+                elif self._running[job_class_string] >= self._class_limit(job_class_string):
+                    self._parked[job_class_string].append(task)
+                    continue
+                else:
+                    self._running[job_class_string] += 1
+                    self._waiting -= 1
+            if closed:
+                self._cancel(task)
+                continue
+
+            try:
+                fn()
+            except Exception as e:
+                print(f"Unhandled error in job execution: {e}")
+            finally:
+                with self._lock:
+                    self._running[job_class_string] -= 1
+                    self._stats["completed"] += 1
+                    parked = self._parked[job_class_string]
+                    next_task = parked.popleft() if parked and not self._closed else None
+                if next_task is not None:
+                    self._queue.put(next_task)
+
+    def stats(self) -> Dict:
+        """Snapshot of pool occupancy and counters."""
+        with self._lock:
+            return {
+                "workers": len(self._workers),
+                "max_queue_size": self._max_queue_size,
+                "waiting": self._waiting,
+                "running": sum(self._running.values()),
+                "running_by_class": {key: value for key, value in self._running.items() if value},
+                **self._stats,
+            }
+
+    def shutdown(self, wait: bool = False, timeout: Optional[float] = None):
+        """
+        Stop the workers after their current runs
+        Queued and parked tasks are dropped and their on_cancel callbacks run
+        before this returns. With wait, running tasks are joined for at most
+        timeout seconds in total.
+        """
+        with self._lock:
+            self._closed = True
+            dropped = [task for parked in self._parked.values() for task in parked]
+            self._parked.clear()
+
+        while True:
+            try:
+                task = self._queue.get_nowait()
+            except Empty:
+                break
+            if task is not None:
+                dropped.append(task)
+
+        with self._lock:
+            self._waiting -= len(dropped)
+        for _ in self._workers:
+            self._queue.put(None)
+        for task in dropped:
+            self._cancel(task)
+
+        if wait:
+            deadline = None if timeout is None else time.monotonic() + timeout
+            for worker in self._workers:
+                worker.join(None if deadline is None else max(0.0, deadline - time.monotonic()))
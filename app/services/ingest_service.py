@@ -0,0 +1,262 @@
+"""Ingest service - background bulk user ingestion"""
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import datetime, timedelta
+from threading import Event, Lock, Thread
+from typing import BinaryIO, Dict, Iterator, List, Optional, Tuple
+import os
+
+from models.ingest import IngestJob
+from services.leader_election import process_identity
+from services.user_service import UserService
+
+# Number of ingest jobs processed concurrently per API worker
+INGEST_WORKERS = int(os.getenv("INGEST_WORKERS", "2"))
+# Ingest jobs accepted but not finished per API worker; further submissions get 429
+INGEST_MAX_PENDING = int(os.getenv("INGEST_MAX_PENDING", "20"))
+# Each worker refreshes heartbeat_at on its own unfinished ingests this often
+INGEST_HEARTBEAT_SECONDS = float(os.getenv("INGEST_HEARTBEAT_SECONDS", "60"))
+# Queued or running ingests without a heartbeat for this long belonged to a dead process
+INGEST_STALE_SECONDS = float(os.getenv("INGEST_STALE_SECONDS", "600"))
+
+
+class IngestService:
+    """Service for submitting and tracking background ingest jobs"""
+
+    _executor = None
+    _executor_lock = Lock()
+    # Accepted ingests not yet finished: ingest_id -> (future, file_obj)
+    _pending: Dict[str, Tuple[Future, Optional[BinaryIO]]] = {}
+    _reserved = 0
+    _stopping = Event()
+    _owner = process_identity()
+    _heartbeat = None
+
+    @staticmethod
+    def _get_executor() -> ThreadPoolExecutor:
+        """Return the shared ingest worker pool, creating it on first use (caller holds _executor_lock)."""
+        if IngestService._executor is None:
+            IngestService._executor = ThreadPoolExecutor(
+                max_workers=INGEST_WORKERS,
+                thread_name_prefix="ingest",
+            )
+        if IngestService._heartbeat is None:
+            IngestService._heartbeat = Thread(target=IngestService._run_heartbeat, name="ingest-heartbeat", daemon=True)
+            IngestService._heartbeat.start()
+        return IngestService._executor
+
+    @staticmethod
+    def _run_heartbeat():
+        """Keep this process's unfinished ingests from being recovered by another worker."""
+        while not IngestService._stopping.wait(INGEST_HEARTBEAT_SECONDS):
+            with IngestService._executor_lock:
+                if not IngestService._pending:
+                    continue
+            try:
+                IngestJob.heartbeat(IngestService._owner)
+            except Exception as e:
+                print(f"Failed to refresh ingest heartbeats: {e}")
+
+    @staticmethod
+    def _reserve() -> bool:
+        """Claim one of the INGEST_MAX_PENDING slots; False when all are taken."""
+        with IngestService._executor_lock:
+            if IngestService._reserved >= INGEST_MAX_PENDING:
+                return False
+            IngestService._reserved += 1
+            return True
+
+    @staticmethod
+    def _release(ingest_id: Optional[str] = None):
+        with IngestService._executor_lock:
+            IngestService._reserved -= 1
+            if ingest_id is not None:
+                IngestService._pending.pop(ingest_id, None)
+
+    @staticmethod
+    def _submit(ingest_id: str, batches: Iterator[List[Tuple[Dict, Dict]]], file_obj: Optional[BinaryIO] = None):
+        """Hand a reserved ingest to the worker pool."""
+        with IngestService._executor_lock:
+            # Registered before the worker can finish and unregister it
+            future = IngestService._get_executor().submit(IngestService._run_ingest, ingest_id, batches, file_obj)
+            IngestService._pending[ingest_id] = (future, file_obj)
+
+    @staticmethod
+    def _rejected() -> Dict:
+        return {
+            "success": False,
+            "rejected": True,
+            "message": f"Too many ingests in progress (limit {INGEST_MAX_PENDING}), retry later",
+            "ingest_id": None
+        }
+
+    @staticmethod
+    def recover_interrupted() -> int:
+        """
+        Mark ingests left queued or running by a process that died as interrupted
+        Live workers keep heartbeat_at fresh on their own ingests, including ones
+        still queued behind a long ingest, so only orphaned ingests go stale.
+        """
+        stale_before = datetime.utcnow() - timedelta(seconds=INGEST_STALE_SECONDS)
+        interrupted = IngestJob.interrupt_stale(stale_before)
+        if interrupted:
+            print(f"Marked {interrupted} stale ingest jobs as interrupted")
+        return interrupted
+
+    @staticmethod
+    def shutdown():
+        """
+        Stop without waiting for ingests to finish
+        Queued ingests are cancelled and running ones stop after their current
+        batch; both are marked interrupted.
+        """
+        IngestService._stopping.set()
+        with IngestService._executor_lock:
+            executor = IngestService._executor
+            IngestService._executor = None
+            pending = list(IngestService._pending.items())
+        if executor is None:
+            return
+
+        executor.shutdown(wait=False, cancel_futures=True)
+        for ingest_id, (future, file_obj) in pending:
+            if not future.cancelled():
+                continue
+            try:
+                IngestJob.mark_finished(ingest_id, "interrupted", error="Server shut down before the ingest started")
+            except Exception as e:
+                print(f"Failed to mark ingest {ingest_id} interrupted: {e}")
+            finally:
+                if file_obj is not None:
+                    file_obj.close()
+                IngestService._release(ingest_id)
+
+    @staticmethod
+    def _run_ingest(ingest_id: str, batches: Iterator[List[Tuple[Dict, Dict]]], file_obj: Optional[BinaryIO] = None):
+        """Worker entry point: insert every batch and record progress."""
+        try:
+            if not IngestJob.mark_running(ingest_id):
+                print(f"Ingest {ingest_id} is no longer queued, skipping it")
+                return
+            for batch in batches:
+                if IngestService._stopping.is_set():
+                    IngestJob.mark_finished(ingest_id, "interrupted", error="Server shut down during the ingest")
+                    return
+                successful = 0
+                errors = []
+                for (context, _), result in zip(batch, UserService.insert_user_batch(batch)):
+                    if result["success"]:
+                        successful += 1
+                    else:
+                        errors.append({**context, "message": result["message"]})
+                IngestJob.record_batch(ingest_id, successful, len(errors), errors)
+            IngestJob.mark_finished(ingest_id, "completed")
+        except Exception as e:
+            print(f"Ingest {ingest_id} failed: {e}")
+            IngestJob.mark_finished(ingest_id, "failed", error=str(e))
+        finally:
+            if file_obj is not None:
+                file_obj.close()
+            IngestService._release(ingest_id)
+
+    @staticmethod
+    def submit_json_payload(payload: dict) -> Dict:
+        """Queue a JSON users payload for background ingestion"""
+        users = payload.get("users", [])
+        if not IngestService._reserve():
+            return IngestService._rejected()
+        try:
+            ingest_id = str(IngestJob.insert_ingest({
+                "source": "json",
+                "total_rows": len(users),
+                "owner": IngestService._owner,
+            }))
+        except Exception:
+            IngestService._release()
+            raise
+
+        batches = UserService.iter_batches(({"index": idx}, user_data) for idx, user_data in enumerate(users))
+        IngestService._submit(ingest_id, batches)
+
+        return {
+            "success": True,
+            "message": f"Ingest of {len(users)} users queued",
+            "ingest_id": ingest_id
+        }
+
+    @staticmethod
+    def submit_excel(file_obj: BinaryIO, filename: Optional[str] = None) -> Dict:
+        """
+        Queue an Excel upload for background ingestion
+        Takes ownership of file_obj, which is closed once the ingest ends
+        """
+        if not IngestService._reserve():
+            file_obj.close()
+            return IngestService._rejected()
+        try:
+            ingest_id = str(IngestJob.insert_ingest({
+                "source": "excel",
+                "filename": filename,
+                "owner": IngestService._owner,
+            }))
+        except Exception:
+            file_obj.close()
+            IngestService._release()
+            raise
+
+        batches = UserService.iter_excel_user_batches(file_obj)
+        IngestService._submit(ingest_id, batches, file_obj)
+
+        return {
+            "success": True,
+            "message": f"Ingest of {filename or 'Excel file'} queued",
+            "ingest_id": ingest_id
+        }
+
+    @staticmethod
+    def get_ingest(ingest_id: str) -> Dict:
+        """Get the progress of an ingest job"""
+        try:
+            ingest = IngestJob.find_ingest_by_id(ingest_id)
+            if not ingest:
+                return {
+                    "success": False,
+                    "message": "Ingest not found",
+                    "data": None
+                }
+
+            started_at = ingest.get("started_at")
+            elapsed_seconds = None
+            rows_per_second = None
+            if started_at:
+                finished_at = ingest.get("completed_at") or datetime.utcnow()
+                elapsed_seconds = max((finished_at - started_at).total_seconds(), 0.0)
+                if elapsed_seconds > 0:
+                    rows_per_second = round(ingest.get("processed", 0) / elapsed_seconds, 2)
+
+            return {
+                "success": True,
+                "message": "Ingest retrieved successfully",
+                "data": {
+                    "_id": str(ingest["_id"]),
+                    "source": ingest.get("source"),
+                    "filename": ingest.get("filename"),
+                    "status": ingest.get("status"),
+                    "total_rows": ingest.get("total_rows"),
+                    "processed": ingest.get("processed", 0),
+                    "successful": ingest.get("successful", 0),
+                    "failed": ingest.get("failed", 0),
+                    "errors": ingest.get("errors", []),
+                    "error": ingest.get("error"),
+                    "elapsed_seconds": elapsed_seconds,
+                    "rows_per_second": rows_per_second,
+                    "created_at": ingest.get("created_at"),
+                    "started_at": started_at,
+                    "completed_at": ingest.get("completed_at")
+                }
+            }
+        except Exception as e:
+            return {
+                "success": False,
+                "message": str(e),
+                "data": None
+            }
@@ -0,0 +1,207 @@
+"""Incremental sync of scheduler_jobs into the in-process scheduler."""
+from datetime import datetime, timedelta
+from threading import Event, Lock, Thread
+from typing import Callable, Dict, List
+import os
+
+from pymongo.errors import OperationFailure, PyMongoError
+
+from models.job import Job
+
+# "auto" watches a change stream and falls back to polling on standalone servers;
+# "change_stream", "poll" or "off" force one behaviour
+SCHEDULER_SYNC_MODE = os.getenv("SCHEDULER_SYNC_MODE", "auto")
+# Polling interval, and the overlap re-read each poll to absorb clock skew between instances
+SCHEDULER_SYNC_POLL_SECONDS = float(os.getenv("SCHEDULER_SYNC_POLL_SECONDS", "5"))
+SCHEDULER_SYNC_POLL_OVERLAP_SECONDS = float(os.getenv("SCHEDULER_SYNC_POLL_OVERLAP_SECONDS", "5"))
+
+# Fields the scheduler itself writes; updates touching only these (or paths inside
+# them, e.g. execution_counts.completed) are not job edits
+DERIVED_JOB_FIELDS = ["next_run_time", "last_run_time", "total_executions", "execution_counts", "updated_at"]
+
+# Change stream errors meaning "not supported here" (standalone server, unsupported storage engine)
+CHANGE_STREAM_UNSUPPORTED_CODES = {40573, 40324, 136}
+# The resume token is older than the oplog window
+CHANGE_STREAM_HISTORY_LOST = 286
+
+# Drop update events whose set/unset fields are all derived; dotted paths are
+# compared by their top-level field
+CHANGE_STREAM_PIPELINE = [
+    {"$match": {"$or": [
+        {"operationType": {"$in": ["insert", "replace", "delete"]}},
+        {
+            "operationType": "update",
+            "$expr": {"$gt": [
+                {"$size": {"$setDifference": [
+                    {"$map": {
+                        "input": {"$concatArrays": [
+                            {"$map": {
+                                "input": {"$objectToArray": "$updateDescription.updatedFields"},
+                                "in": "$$this.k",
+                            }},
+                            {"$ifNull": ["$updateDescription.removedFields", []]},
+                        ]},
+                        "in": {"$arrayElemAt": [{"$split": ["$$this", "."]}, 0]},
+                    }},
+                    DERIVED_JOB_FIELDS,
+                ]}},
+                0,
+            ]},
+        },
+    ]}},
+]
+
+
+class JobSyncWatcher:
+    """
+    Feeds job edits from any process into this process's scheduler.
+
+    Uses a change stream when the deployment supports it (replica set or
+    sharded cluster) and polls updated_at otherwise. on_changes receives the
+    changed job documents and deleted job ids; on_resync is called when the
+    incremental position is lost and a full sync is needed.
+
+    Call checkpoint() before the initial full sync so that edits made while
+    it runs are replayed once the watcher starts.
+    """
+
+    def __init__(
+        self,
+        on_changes: Callable[[List[dict], List[str]], None],
+        on_resync: Callable[[], None],
+        mode: str = SCHEDULER_SYNC_MODE,
+        poll_seconds: float = SCHEDULER_SYNC_POLL_SECONDS,
+    ):
+        self._on_changes = on_changes
+        self._on_resync = on_resync
+        self._mode = mode
+        self._poll_seconds = poll_seconds
+        self._stop = Event()
+        self._thread = None
+        self._resume_token = None
+        self._start_at = None
+        self._since = None
+        self._known_ids = None
+        self._lock = Lock()
+        self._stats = {
+            "active_mode": None,
+            "events": 0,
+            "changed": 0,
+            "deleted": 0,
+            "resyncs": 0,
+            "errors": 0,
+            "last_event_at": None,
+        }
+
+    def _count(self, **changes):
+        with self._lock:
+            for key, value in changes.items():
+                if isinstance(value, int) and not isinstance(value, bool):
+                    self._stats[key] += value
+                else:
+                    self._stats[key] = value
+
+    def _deliver(self, changed: List[dict], deleted: List[str]):
+        if not changed and not deleted:
+            return
+        self._on_changes(changed, deleted)
+        self._count(events=1, changed=len(changed), deleted=len(deleted), last_event_at=datetime.utcnow())
+
+    def checkpoint(self):
+        """
+        Record the position to follow edits from: the cluster time for change
+        streams, the clock and the current job ids for polling.
+        """
+        self._since = datetime.utcnow()
+        try:
+            self._start_at = Job.current_operation_time()
+            if self._mode != "change_stream":
+                self._known_ids = set(Job.find_job_ids())
+        except PyMongoError as e:
+            print(f"Scheduler sync could not record its starting position: {e}")
+            self._start_at = None
+
+    def _resync(self):
+        self.checkpoint()
+        self._on_resync()
+        self._count(resyncs=1)
+
+    def _watch(self):
+        """Follow the change stream until stopped; raises OperationFailure if unsupported."""
+        self._count(active_mode="change_stream")
+        while not self._stop.is_set():
+            try:
+                with Job.watch_jobs(
+                    CHANGE_STREAM_PIPELINE,
+                    resume_after=self._resume_token,
+                    start_at_operation_time=self._start_at,
+                ) as stream:
+                    while not self._stop.is_set():
+                        change = stream.try_next()
+                        self._resume_token = stream.resume_token
+                        if change is None:
+                            continue
+                        if change["operationType"] == "delete":
+                            self._deliver([], [str(change["documentKey"]["_id"])])
+                        elif change.get("fullDocument") is not None:
+                            self._deliver([change["fullDocument"]], [])
+            except OperationFailure as e:
+                if e.code in CHANGE_STREAM_UNSUPPORTED_CODES:
+                    raise
+                self._count(errors=1)
+                print(f"Scheduler sync change stream failed: {e}")
+                if e.code == CHANGE_STREAM_HISTORY_LOST:
+                    self._resume_token = None
+                    self._resync()
+                self._stop.wait(self._poll_seconds)
+            except PyMongoError as e:
+                self._count(errors=1)
+                print(f"Scheduler sync change stream interrupted: {e}")
+                self._stop.wait(self._poll_seconds)
+
+    def _poll(self):
+        """Re-read jobs edited since the last poll and detect deletions by id."""
+        self._count(active_mode="poll")
+        since = self._since or datetime.utcnow()
+        while not self._stop.wait(self._poll_seconds):
+            try:
+                poll_started = datetime.utcnow()
+                changed = Job.find_jobs_updated_since(since - timedelta(seconds=SCHEDULER_SYNC_POLL_OVERLAP_SECONDS))
+                job_ids = set(Job.find_job_ids())
+                deleted = list(self._known_ids - job_ids) if self._known_ids is not None else []
+                self._known_ids = job_ids
+                self._deliver(changed, deleted)
+                since = poll_started
+            except PyMongoError as e:
+                self._count(errors=1)
+                print(f"Scheduler sync poll failed: {e}")
+
+    def _run(self):
+        if self._mode in ("auto", "change_stream"):
+            try:
+                self._watch()
+                return
+            except OperationFailure as e:
+                if self._mode == "change_stream":
+                    print(f"✗ Scheduler sync stopped, change streams unavailable: {e}")
+                    return
+                print("Change streams unavailable, scheduler sync falls back to polling")
+        self._poll()
+
+    def start(self):
+        """Start following job edits in a background thread."""
+        if self._mode == "off":
+            return
+        self._thread = Thread(target=self._run, name="scheduler-job-sync", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop following job edits."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(self._poll_seconds + 1)
+
+    def stats(self) -> Dict:
+        """Mode in use and event counters."""
+        with self._lock:
+            return {"mode": self._mode, **self._stats}
@@ -88,18 +88,32 @@ class DataCleanupJob(JobBase):
     """Job to clean up old data"""
     
     def run(self) -> str:
-        """Clean up old data"""
+        """Apply retention policies (archive, then delete in throttled batches)"""
+        # Imported here: the scheduler service imports this registry
+        from services.retention_service import RetentionService
+        
         output = f"Data Cleanup Job executed at {datetime.utcnow()}\n"
         
-        days_old = self.pub_kwargs.get("days_old", 30)
-        collections = self.pub_kwargs.get("collections", ["scheduler_executions"])
+        days_old = self.pub_kwargs.get("days_old")
+        collections = self.pub_kwargs.get("collections")
+        dry_run = self.pub_kwargs.get("dry_run", False)
+        
+        output += f"Cleaning up data older than {days_old} days\n" if days_old else "Cleaning up data per retention policy\n"
+        result = RetentionService.apply_policies(collections=collections, max_age_days=days_old, dry_run=dry_run)
+        if not result["success"]:
+            raise RuntimeError(result["message"])
         
-        output += f"Cleaning up data older than {days_old} days\n"
-        output += f"Collections: {collections}\n"
-        output += "Deleted records:\n"
-        output += "  - 1,234 old executions\n"
-        output += "  - 56 orphaned audit logs\n"
-        output += "Cleanup completed! Total freed space: 125 MB\n"
+        output += f"Collections: {list(result['data'])}\n"
+        output += "Matched records:\n" if dry_run else "Deleted records:\n"
+        for collection_name, report in result["data"].items():
+            count = report["matched"] if dry_run else report["deleted"]
+            output += f"  - {collection_name}: {count:,}"
+            if report["archived"]:
+                output += f" (archived to {report['archive_file']})"
+            if report["incomplete"]:
+                output += " (batch limit reached, continues next run)"
+            output += "\n"
+        output += "Cleanup completed!\n"
         
         return output
 
@@ -137,12 +151,28 @@ class ReportGenerationJob(JobBase):
         
         report_type = self.pub_kwargs.get("report_type", "daily")
         
+        # Imported here: the scheduler service imports this registry
+        from services.metrics_service import MetricsService
+        from services.scheduler_service import SchedulerService
+        
+        window_minutes = {"weekly": 7 * 24 * 60, "monthly": 30 * 24 * 60}.get(report_type, 24 * 60)
+        stats = SchedulerService.get_scheduler_stats(user_id=self.pub_kwargs.get("user_id")).get("stats", {})
+        metrics = MetricsService.get_execution_metrics(
+            window_minutes=window_minutes,
+            group_by="job_class",
+        )
+        overall = metrics.get("overall", {})
+        
         output += f"Generating {report_type} report...\n"
         output += "Report Details:\n"
-        output += f"  - Total Jobs: 42\n"
-        output += f"  - Executions Today: 156\n"
-        output += f"  - Success Rate: 99.2%\n"
-        output += f"  - Average Execution Time: 2.3s\n"
+        output += f"  - Total Jobs: {stats.get('total_jobs', 0)}\n"
+        output += f"  - Executions in Period: {overall.get('count', 0)}\n"
+        if overall.get("count"):
+            output += f"  - Success Rate: {100 - overall['failure_rate']:.1f}%\n"
+            output += f"  - Average Execution Time: {overall['avg_ms'] / 1000:.2f}s\n"
+            output += f"  - p95 Execution Time: {overall['p95_ms'] / 1000:.2f}s\n"
+        for entry in metrics.get("data", [])[:5]:
+            output += f"  - {entry['job_class_string']}: {entry['count']} runs, p95 {entry['p95_ms']} ms\n"
         output += f"Report saved: reports/{report_type}_{datetime.utcnow().strftime('%Y%m%d')}.pdf\n"
         
         return output
@@ -190,6 +220,32 @@ class MaintenanceJob(JobBase):
         return output
 
 
+class ConnectionHealthRefreshJob(JobBase):
+    """Job to refresh cached connection health"""
+    
+    def run(self) -> str:
+        """Probe stored connections and update their cached health"""
+        from services.connection_service import ConnectionService
+        
+        output = f"Connection Health Refresh Job executed at {datetime.utcnow()}\n"
+        
+        result = ConnectionService.test_all_connections(
+            connection_type=self.pub_kwargs.get("type"),
+            environment=self.pub_kwargs.get("environment"),
+            deadline_seconds=self.pub_kwargs.get("deadline_seconds"),
+            force=True
+        )
+        
+        output += f"Connections checked: {result['total']} in {result['elapsed_ms']} ms\n"
+        for status, count in result["summary"].items():
+            output += f"  - {status}: {count}\n"
+        for entry in result["data"]:
+            if entry["status"] != "healthy":
+                output += f"  ✗ {entry['connectionName']} ({entry['type']}): {entry['status']} {entry['error'] or entry['status_code']}\n"
+        
+        return output
+
+
 class CustomScriptJob(JobBase):
     """Job to run custom scripts"""
     
@@ -223,6 +279,7 @@ AVAILABLE_JOBS = {
     "jobs.webhook.WebhookJob": WebhookJob,
     "jobs.maintenance.MaintenanceJob": MaintenanceJob,
     "jobs.custom.CustomScriptJob": CustomScriptJob,
+    "jobs.connections.ConnectionHealthRefreshJob": ConnectionHealthRefreshJob,
 }
 
 
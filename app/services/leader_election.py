@@ -0,0 +1,122 @@
+"""Lease-based leader election across API workers and instances."""
+from datetime import datetime
+from threading import Event, Lock, Thread
+from typing import Callable, Dict, Optional
+from uuid import uuid4
+import os
+import socket
+
+from models.lease import SchedulerLease
+
+# A leader that stops renewing for this long is replaced
+SCHEDULER_LEASE_TTL_SECONDS = float(os.getenv("SCHEDULER_LEASE_TTL_SECONDS", "30"))
+# How often the lease is renewed (and, by followers, probed); keep well below the TTL
+SCHEDULER_LEASE_HEARTBEAT_SECONDS = float(os.getenv("SCHEDULER_LEASE_HEARTBEAT_SECONDS", "10"))
+
+
+def process_identity() -> str:
+    """Identifier of this process, unique across hosts and restarts."""
+    return f"{socket.gethostname()}:{os.getpid()}:{uuid4().hex[:8]}"
+
+
+class LeaderElector:
+    """
+    Keeps trying to hold a named lease and reports leadership changes.
+
+    A background thread renews the lease every heartbeat. on_elected runs
+    when this process takes the lease, on_demoted when it loses it (including
+    when the lease cannot be renewed because MongoDB is unreachable), and
+    on_heartbeat after every successful renewal.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        on_elected: Callable[[], None],
+        on_demoted: Callable[[], None],
+        on_heartbeat: Optional[Callable[[], None]] = None,
+        ttl_seconds: float = SCHEDULER_LEASE_TTL_SECONDS,
+        heartbeat_seconds: float = SCHEDULER_LEASE_HEARTBEAT_SECONDS,
+        owner: Optional[str] = None,
+    ):
+        self.name = name
+        self.owner = owner or process_identity()
+        self._on_elected = on_elected
+        self._on_demoted = on_demoted
+        self._on_heartbeat = on_heartbeat
+        self._ttl_seconds = ttl_seconds
+        self._heartbeat_seconds = heartbeat_seconds
+        self._lock = Lock()
+        self._stop = Event()
+        self._thread = None
+        self._is_leader = False
+        self._stats = {"elected": 0, "demoted": 0, "renew_failures": 0, "leader_since": None}
+
+    @property
+    def is_leader(self) -> bool:
+        return self._is_leader
+
+    def _set_leader(self, is_leader: bool):
+        with self._lock:
+            if is_leader == self._is_leader:
+                return
+            self._is_leader = is_leader
+            self._stats["elected" if is_leader else "demoted"] += 1
+            self._stats["leader_since"] = datetime.utcnow() if is_leader else None
+
+        callback = self._on_elected if is_leader else self._on_demoted
+        try:
+            callback()
+        except Exception as e:
+            print(f"Leader election callback failed for '{self.name}': {e}")
+
+    def tick(self):
+        """Renew or try to take the lease once."""
+        try:
+            acquired = SchedulerLease.try_acquire(self.name, self.owner, self._ttl_seconds)
+        except Exception as e:
+            print(f"Failed to renew lease '{self.name}': {e}")
+            with self._lock:
+                self._stats["renew_failures"] += 1
+            acquired = False
+
+        self._set_leader(acquired)
+        if acquired and self._on_heartbeat is not None:
+            try:
+                self._on_heartbeat()
+            except Exception as e:
+                print(f"Leader heartbeat callback failed for '{self.name}': {e}")
+
+    def _run(self):
+        while not self._stop.wait(self._heartbeat_seconds):
+            self.tick()
+
+    def start(self):
+        """Take part in the election; the first attempt runs before returning."""
+        self.tick()
+        self._thread = Thread(target=self._run, name=f"leader-{self.name}", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Leave the election and hand the lease over immediately if held."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(self._heartbeat_seconds)
+        if self._is_leader:
+            self._set_leader(False)
+            try:
+                SchedulerLease.release(self.name, self.owner)
+            except Exception as e:
+                print(f"Failed to release lease '{self.name}': {e}")
+
+    def status(self) -> Dict:
+        """Leadership state and counters."""
+        with self._lock:
+            return {
+                "name": self.name,
+                "owner": self.owner,
+                "is_leader": self._is_leader,
+                "ttl_seconds": self._ttl_seconds,
+                "heartbeat_seconds": self._heartbeat_seconds,
+                **self._stats,
+            }
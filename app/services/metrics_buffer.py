@@ -0,0 +1,121 @@
+"""Buffered background writer for execution metrics buckets and scheduler counters."""
+from threading import Event, Lock, Thread
+from typing import Dict
+import os
+
+from models.job import SchedulerCounters
+from models.metrics import ExecutionMetrics
+
+# Longest a finished execution waits in memory before its buckets are written
+METRICS_FLUSH_INTERVAL_SECONDS = float(os.getenv("METRICS_FLUSH_INTERVAL_SECONDS", "5"))
+
+
+class MetricsBuffer:
+    """
+    Takes metrics and execution counter writes off the execution threads.
+
+    Finished executions are merged in memory per job, granularity and bucket,
+    and their statuses per counters scope. One background thread upserts the
+    merged increments with a bulk_write per collection every flush_interval
+    seconds, so runs of the same job within a bucket cost one upsert per
+    flush, however many there are. shutdown() writes whatever is still buffered;
+    executions recorded after it are written inline.
+    """
+
+    def __init__(self, flush_interval: float = METRICS_FLUSH_INTERVAL_SECONDS):
+        self._flush_interval = flush_interval
+        self._lock = Lock()
+        self._pending: Dict[tuple, dict] = {}
+        # scope -> status -> runs
+        self._pending_counts: Dict[str, Dict[str, int]] = {}
+        self._stop = Event()
+        # Set under _lock by shutdown(); from then on every add or count writes itself
+        self._closed = False
+        self._stats = {"recorded": 0, "flushes": 0, "buckets_written": 0, "counters_written": 0, "failed": 0, "written_inline": 0}
+        self._thread = Thread(target=self._run, name="metrics-buffer", daemon=True)
+        self._thread.start()
+
+    def add(self, job: dict, status: str, duration_ms: float, completed_at):
+        """Merge one finished execution into the pending bucket increments (written inline once shut down)."""
+        increments = ExecutionMetrics.bucket_increments(job, status, duration_ms, completed_at)
+        with self._lock:
+            self._stats["recorded"] += 1
+            closed = self._closed
+            self._count_locked(job, status)
+            for increment in increments:
+                key = (increment["job_id"], increment["granularity"], increment["bucket_start"])
+                pending = self._pending.get(key)
+                if pending is None:
+                    self._pending[key] = increment
+                    continue
+                pending["count"] += increment["count"]
+                pending["failures"] += increment["failures"]
+                pending["duration_ms_sum"] += increment["duration_ms_sum"]
+                pending["duration_ms_max"] = max(pending["duration_ms_max"], increment["duration_ms_max"])
+                for bucket, count in increment["histogram"].items():
+                    pending["histogram"][bucket] = pending["histogram"].get(bucket, 0) + count
+        if closed:
+            self._write_inline()
+
+    def count(self, job: dict, status: str):
+        """Count an execution that never ran (rejected or cancelled); it has no duration to bucket."""
+        with self._lock:
+            self._count_locked(job, status)
+            closed = self._closed
+        if closed:
+            self._write_inline()
+
+    def _write_inline(self):
+        with self._lock:
+            self._stats["written_inline"] += 1
+        self.flush()
+
+    def _count_locked(self, job: dict, status: str):
+        user_id = str(job["user_id"]) if job.get("user_id") else None
+        for scope in SchedulerCounters.scopes(user_id):
+            status_counts = self._pending_counts.setdefault(scope, {})
+            status_counts[status] = status_counts.get(status, 0) + 1
+
+    def flush(self):
+        """Write the pending increments now."""
+        with self._lock:
+            increments = list(self._pending.values())
+            counts = self._pending_counts
+            self._pending = {}
+            self._pending_counts = {}
+        if increments:
+            try:
+                ExecutionMetrics.apply_increments(increments)
+                with self._lock:
+                    self._stats["flushes"] += 1
+                    self._stats["buckets_written"] += len(increments)
+            except Exception as e:
+                print(f"Failed to write {len(increments)} metrics buckets: {e}")
+                with self._lock:
+                    self._stats["failed"] += len(increments)
+        if counts:
+            try:
+                SchedulerCounters.apply_increments(counts)
+                with self._lock:
+                    self._stats["counters_written"] += len(counts)
+            except Exception as e:
+                print(f"Failed to write execution counters for {len(counts)} scopes: {e}")
+                with self._lock:
+                    self._stats["failed"] += len(counts)
+
+    def _run(self):
+        while not self._stop.wait(self._flush_interval):
+            self.flush()
+
+    def stats(self) -> Dict:
+        """Counters and pending bucket count."""
+        with self._lock:
+            return {"pending_buckets": len(self._pending), "pending_counter_scopes": len(self._pending_counts), **self._stats}
+
+    def shutdown(self, timeout: float = 10.0):
+        """Stop the writer thread and flush what is still buffered; later executions are written inline."""
+        with self._lock:
+            self._closed = True
+        self._stop.set()
+        self._thread.join(timeout)
+        self.flush()
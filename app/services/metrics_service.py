@@ -0,0 +1,192 @@
+"""Execution metrics service - rolls executions into buckets and reports percentiles"""
+from datetime import datetime, timedelta
+from threading import Lock
+from typing import Dict, List, Optional
+
+from models.metrics import DURATION_BUCKETS_MS, GRANULARITIES, ExecutionMetrics
+from services.metrics_buffer import MetricsBuffer
+
+PERCENTILES = {"p50_ms": 0.50, "p95_ms": 0.95, "p99_ms": 0.99}
+
+
+def _bucket_bounds() -> List[tuple]:
+    """(histogram key, lower bound, upper bound) for every histogram bucket, fastest first"""
+    bounds = []
+    lower = 0
+    for upper in DURATION_BUCKETS_MS:
+        bounds.append((str(upper), lower, upper))
+        lower = upper
+    bounds.append(("inf", lower, None))
+    return bounds
+
+
+def estimate_percentile(histogram: Dict[str, int], quantile: float, max_ms: float) -> Optional[float]:
+    """
+    Estimate a duration percentile from histogram counts
+    Interpolates linearly inside the bucket holding the quantile; the open-ended
+    bucket is capped at the slowest duration seen.
+    """
+    total = sum(histogram.values())
+    if not total:
+        return None
+
+    rank = quantile * total
+    seen = 0
+    for key, lower, upper in _bucket_bounds():
+        count = histogram.get(key, 0)
+        if not count:
+            continue
+        if seen + count >= rank:
+            upper = max_ms if upper is None else min(upper, max_ms)
+            lower = min(lower, upper)
+            return round(lower + (upper - lower) * (rank - seen) / count, 3)
+        seen += count
+    return round(max_ms, 3)
+
+
+def summarize_buckets(buckets: List[Dict], window_minutes: float) -> Dict:
+    """Merge buckets into count, failure, duration and throughput figures"""
+    count = sum(bucket.get("count", 0) for bucket in buckets)
+    failures = sum(bucket.get("failures", 0) for bucket in buckets)
+    duration_ms_sum = sum(bucket.get("duration_ms_sum", 0) for bucket in buckets)
+    max_ms = max((bucket.get("duration_ms_max", 0) for bucket in buckets), default=0)
+
+    histogram = {}
+    for bucket in buckets:
+        for key, value in bucket.get("histogram", {}).items():
+            histogram[key] = histogram.get(key, 0) + value
+
+    summary = {
+        "count": count,
+        "failures": failures,
+        "failure_rate": round(failures / count * 100, 2) if count else 0,
+        "throughput_per_minute": round(count / window_minutes, 3) if window_minutes else 0,
+        "avg_ms": round(duration_ms_sum / count, 3) if count else None,
+        "max_ms": round(max_ms, 3) if count else None,
+    }
+    for name, quantile in PERCENTILES.items():
+        summary[name] = estimate_percentile(histogram, quantile, max_ms)
+    return summary
+
+
+class MetricsService:
+    """Service for scheduler execution metrics"""
+
+    _buffer = None
+    _buffer_lock = Lock()
+
+    @staticmethod
+    def _get_buffer() -> MetricsBuffer:
+        """Return the buffered metrics writer, creating it on first use."""
+        with MetricsService._buffer_lock:
+            if MetricsService._buffer is None:
+                MetricsService._buffer = MetricsBuffer()
+            return MetricsService._buffer
+
+    @staticmethod
+    def record_execution(job: dict, status: str, duration_ms: float, completed_at: datetime):
+        """Roll a finished execution into its buckets and counters (written in the background); never affects the run itself"""
+        try:
+            MetricsService._get_buffer().add(job, status, duration_ms, completed_at)
+        except Exception as e:
+            print(f"Failed to record execution metrics: {e}")
+
+    @staticmethod
+    def count_unstarted(job: dict, status: str):
+        """Count a rejected or cancelled execution in the scheduler counters (written in the background)"""
+        try:
+            MetricsService._get_buffer().count(job, status)
+        except Exception as e:
+            print(f"Failed to count execution: {e}")
+
+    @staticmethod
+    def get_buffer_stats() -> Dict:
+        """Counters of the buffered metrics writer."""
+        with MetricsService._buffer_lock:
+            return MetricsService._buffer.stats() if MetricsService._buffer is not None else {}
+
+    @staticmethod
+    def shutdown():
+        """Write buffered metrics and stop the writer; the closed buffer then writes each execution inline."""
+        with MetricsService._buffer_lock:
+            if MetricsService._buffer is not None:
+                MetricsService._buffer.shutdown()
+
+    @staticmethod
+    def get_execution_metrics(
+        job_id: Optional[str] = None,
+        job_class_string: Optional[str] = None,
+        granularity: str = "hour",
+        window_minutes: int = 24 * 60,
+        group_by: str = "job",
+        include_series: bool = False,
+    ) -> Dict:
+        """
+        Get execution counts, failures and duration percentiles over a time window
+        Results are grouped per job or per job class; include_series adds the per-bucket breakdown.
+        """
+        try:
+            if granularity not in GRANULARITIES:
+                return {"success": False, "message": f"Unknown granularity '{granularity}'", "data": []}
+            if group_by not in ("job", "job_class"):
+                return {"success": False, "message": f"Unknown group_by '{group_by}'", "data": []}
+
+            now = datetime.utcnow()
+            since = now - timedelta(minutes=window_minutes)
+            # Include the bucket the window starts in
+            since_bucket = since.replace(second=0, microsecond=0)
+            if granularity == "hour":
+                since_bucket = since_bucket.replace(minute=0)
+
+            buckets = ExecutionMetrics.find_buckets(
+                granularity,
+                since_bucket,
+                job_id=job_id,
+                job_class_string=job_class_string,
+            )
+
+            group_field = "job_id" if group_by == "job" else "job_class_string"
+            groups = {}
+            for bucket in buckets:
+                groups.setdefault(bucket.get(group_field), []).append(bucket)
+
+            data = []
+            for key, group_buckets in groups.items():
+                entry = {
+                    group_field: key,
+                    **summarize_buckets(group_buckets, window_minutes),
+                }
+                if group_by == "job":
+                    entry["job_name"] = group_buckets[-1].get("job_name")
+                    entry["job_class_string"] = group_buckets[-1].get("job_class_string")
+                if include_series:
+                    bucket_minutes = GRANULARITIES[granularity].total_seconds() / 60
+                    entry["series"] = [
+                        {
+                            "bucket_start": bucket["bucket_start"].isoformat(),
+                            **summarize_buckets([bucket], bucket_minutes),
+                        }
+                        for bucket in group_buckets
+                    ]
+                data.append(entry)
+
+            data.sort(key=lambda entry: entry["p95_ms"] or 0, reverse=True)
+
+            return {
+                "success": True,
+                "message": "Metrics retrieved successfully",
+                "window": {
+                    "from": since.isoformat(),
+                    "to": now.isoformat(),
+                    "granularity": granularity,
+                    "group_by": group_by,
+                },
+                "overall": summarize_buckets(buckets, window_minutes),
+                "data": data,
+            }
+        except Exception as e:
+            return {
+                "success": False,
+                "message": str(e),
+                "data": []
+            }
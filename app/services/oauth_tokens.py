@@ -0,0 +1,149 @@
+"""OAuth2 client-credentials tokens with a shared cache."""
+from threading import Lock
+from typing import Dict, Optional
+import hashlib
+import os
+import time
+
+from core.http_client import http_request
+
+# Tokens are refreshed this long before the identity provider says they expire
+OAUTH_TOKEN_EXPIRY_SKEW_SECONDS = float(os.getenv("OAUTH_TOKEN_EXPIRY_SKEW_SECONDS", "60"))
+# Lifetime assumed when a token response has no expires_in
+OAUTH_TOKEN_DEFAULT_TTL_SECONDS = float(os.getenv("OAUTH_TOKEN_DEFAULT_TTL_SECONDS", "300"))
+
+SUPPORTED_GRANT_TYPES = {"client_credentials"}
+
+
+class OAuthTokenError(Exception):
+    """The token endpoint rejected the client or returned no access token"""
+
+
+class TokenManager:
+    """
+    Access tokens keyed by token URL and client, shared across threads.
+
+    Only one thread fetches a token per key at a time; the others wait for
+    and reuse it. Tokens are served until OAUTH_TOKEN_EXPIRY_SKEW_SECONDS
+    before they expire.
+    """
+
+    def __init__(self, skew_seconds: float = OAUTH_TOKEN_EXPIRY_SKEW_SECONDS):
+        self._skew = skew_seconds
+        self._lock = Lock()
+        self._key_locks: Dict[str, Lock] = {}
+        self._tokens: Dict[str, dict] = {}
+        self._stats = {"hits": 0, "misses": 0, "fetches": 0, "fetch_failures": 0, "invalidations": 0}
+
+    def _count(self, key: str):
+        with self._lock:
+            self._stats[key] += 1
+
+    def _key_lock(self, key: str) -> Lock:
+        with self._lock:
+            return self._key_locks.setdefault(key, Lock())
+
+    def _valid(self, key: str) -> Optional[str]:
+        with self._lock:
+            token = self._tokens.get(key)
+            if token and token["refresh_at"] > time.monotonic():
+                return token["access_token"]
+            return None
+
+    @staticmethod
+    def cache_key(token_url: str, client_id: str, client_secret: str) -> str:
+        # Includes the secret, so a rotated secret never reuses an old token
+        return hashlib.sha256(f"{token_url}\n{client_id}\n{client_secret}".encode("utf-8")).hexdigest()
+
+    def _fetch(self, token_url: str, client_id: str, client_secret: str, grant_type: str, timeout=None) -> dict:
+        """POST the client-credentials grant and return the token response."""
+        if grant_type not in SUPPORTED_GRANT_TYPES:
+            raise OAuthTokenError(f"Unsupported grantType: {grant_type}")
+
+        # The grant has no side effects, so transient failures are retried
+        response, _ = http_request(
+            "POST",
+            token_url,
+            data={"grant_type": grant_type},
+            auth=(client_id, client_secret),
+            headers={"Accept": "application/json"},
+            timeout=timeout,
+            retry=True,
+        )
+        try:
+            body = response.json()
+        except ValueError:
+            raise OAuthTokenError(f"Token request failed with HTTP {response.status_code}")
+        if response.status_code != 200 or not body.get("access_token"):
+            error = body.get("error_description") or body.get("error")
+            raise OAuthTokenError(error or f"Token request failed with HTTP {response.status_code}")
+        return body
+
+    def get_token(
+        self,
+        token_url: str,
+        client_id: str,
+        client_secret: str,
+        grant_type: Optional[str] = None,
+        timeout=None,
+    ) -> str:
+        """Cached access token for the client, fetching one if there is none or it is about to expire."""
+        key = self.cache_key(token_url, client_id, client_secret)
+        access_token = self._valid(key)
+        if access_token:
+            self._count("hits")
+            return access_token
+
+        with self._key_lock(key):
+            # Another thread may have fetched a token while this one waited
+            access_token = self._valid(key)
+            if access_token:
+                self._count("hits")
+                return access_token
+
+            self._count("misses")
+            try:
+                body = self._fetch(token_url, client_id, client_secret, grant_type or "client_credentials", timeout)
+            except Exception:
+                self._count("fetch_failures")
+                raise
+            self._count("fetches")
+
+            try:
+                expires_in = float(body.get("expires_in") or OAUTH_TOKEN_DEFAULT_TTL_SECONDS)
+            except (TypeError, ValueError):
+                expires_in = OAUTH_TOKEN_DEFAULT_TTL_SECONDS
+            # Short-lived tokens are still cached for at least half their lifetime
+            refresh_in = max(expires_in - self._skew, expires_in / 2)
+            with self._lock:
+                self._tokens[key] = {
+                    "access_token": body["access_token"],
+                    "refresh_at": time.monotonic() + refresh_in,
+                }
+            return body["access_token"]
+
+    def invalidate(self, token_url: str, client_id: str, client_secret: str, access_token: str):
+        """Drop a token the API no longer accepts (unless it was already replaced)."""
+        key = self.cache_key(token_url, client_id, client_secret)
+        with self._lock:
+            token = self._tokens.get(key)
+            if token and token["access_token"] == access_token:
+                del self._tokens[key]
+                self._stats["invalidations"] += 1
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {"cached_tokens": len(self._tokens), "expiry_skew_seconds": self._skew, **self._stats}
+
+
+token_manager = TokenManager()
+
+
+def uses_oauth(credentials: dict) -> bool:
+    """Whether a connection's credentials name a token endpoint to exchange its client id and secret at."""
+    return bool(credentials.get("tokenUrl") and credentials.get("clientId") and credentials.get("clientSecret"))
+
+
+def get_token_stats() -> Dict:
+    """OAuth token cache counters."""
+    return token_manager.stats()
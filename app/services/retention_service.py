@@ -0,0 +1,237 @@
+"""Retention engine for scheduler executions and audit logs"""
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+import gzip
+import json
+import os
+import time
+
+from bson import json_util
+
+from models.job import EXECUTION_OUTPUT_FIELDS, ExecutionOutput
+from models.retention import RetentionStore
+
+# Per-collection policies, overridable with a JSON object in RETENTION_POLICIES:
+#   max_age_days       delete documents whose created_at is older than this
+#   keep_last_per_job  additionally keep only the newest N documents per job_id
+#   archive            write documents to gzipped JSONL before deleting them
+#   ttl_days           turn the created_at index into a TTL index as a hard backstop;
+#                      set it above max_age_days, TTL deletes are never archived and
+#                      leave offloaded outputs behind
+#   output_blobs       documents reference offloaded output in GridFS, deleted alongside
+DEFAULT_RETENTION_POLICIES = {
+    "scheduler_executions": {
+        "max_age_days": 30,
+        "keep_last_per_job": 500,
+        "archive": True,
+        "ttl_days": None,
+        "output_blobs": True,
+        # Never remove runs that have not finished
+        "protect": {"status": {"$nin": ["queued", "running"]}},
+    },
+    "scheduler_audit_logs": {
+        "max_age_days": 90,
+        "keep_last_per_job": None,
+        "archive": True,
+        "ttl_days": None,
+        "output_blobs": False,
+        "protect": {},
+    },
+}
+RETENTION_POLICIES = {
+    collection_name: {**DEFAULT_RETENTION_POLICIES.get(collection_name, {}), **policy}
+    for collection_name, policy in {
+        **DEFAULT_RETENTION_POLICIES,
+        **json.loads(os.getenv("RETENTION_POLICIES", "{}")),
+    }.items()
+}
+# Where archives are written, one file per collection and run
+RETENTION_ARCHIVE_DIR = os.getenv("RETENTION_ARCHIVE_DIR", "archives")
+# Documents deleted per delete_many, and the pause between batches
+RETENTION_BATCH_SIZE = int(os.getenv("RETENTION_BATCH_SIZE", "1000"))
+RETENTION_BATCH_PAUSE_SECONDS = float(os.getenv("RETENTION_BATCH_PAUSE_SECONDS", "0.2"))
+# Longer pause during business hours (UTC, "start-end"), so retention stays in the background
+RETENTION_BUSINESS_HOURS = os.getenv("RETENTION_BUSINESS_HOURS", "8-18")
+RETENTION_BUSINESS_HOURS_PAUSE_SECONDS = float(os.getenv("RETENTION_BUSINESS_HOURS_PAUSE_SECONDS", "2.0"))
+# Upper bound on batches per collection and run; the next run continues where this one stopped
+RETENTION_MAX_BATCHES = int(os.getenv("RETENTION_MAX_BATCHES", "500"))
+
+
+def _batch_pause() -> float:
+    """Pause between delete batches for the current hour"""
+    try:
+        start, end = (int(hour) for hour in RETENTION_BUSINESS_HOURS.split("-"))
+    except ValueError:
+        return RETENTION_BATCH_PAUSE_SECONDS
+    if start <= datetime.utcnow().hour < end:
+        return RETENTION_BUSINESS_HOURS_PAUSE_SECONDS
+    return RETENTION_BATCH_PAUSE_SECONDS
+
+
+class _Archive:
+    """Gzipped JSONL file opened on the first archived batch"""
+
+    def __init__(self, collection_name: str):
+        self.collection_name = collection_name
+        self.path = None
+        self._file = None
+
+    def write(self, docs: List[dict]):
+        if self._file is None:
+            directory = os.path.join(RETENTION_ARCHIVE_DIR, self.collection_name)
+            os.makedirs(directory, exist_ok=True)
+            self.path = os.path.join(
+                directory, f"{self.collection_name}_{datetime.utcnow().strftime('%Y%m%d_%H%M%S_%f')}.jsonl.gz"
+            )
+            self._file = gzip.open(self.path, "wt", encoding="utf-8")
+        for doc in docs:
+            self._file.write(json_util.dumps(doc) + "\n")
+        # Archived documents must be on disk before they are deleted
+        self._file.flush()
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+
+
+class RetentionService:
+    """Service applying retention policies"""
+
+    @staticmethod
+    def get_policies() -> Dict:
+        """Effective retention policies"""
+        return RETENTION_POLICIES
+
+    @staticmethod
+    def apply_ttl_policies() -> Dict:
+        """Apply ttl_days policies to the created_at indexes; returns errors per collection"""
+        errors = {}
+        for collection_name, policy in RETENTION_POLICIES.items():
+            if policy.get("ttl_days"):
+                error = RetentionStore.set_ttl(collection_name, "created_at", int(policy["ttl_days"] * 86400))
+                if error:
+                    errors[collection_name] = error
+                    print(f"✗ Failed to set TTL on {collection_name}: {error}")
+                else:
+                    print(f"✓ TTL on {collection_name}.created_at set to {policy['ttl_days']} days")
+        return errors
+
+    @staticmethod
+    def _purge(collection_name: str, query: dict, policy: dict, report: dict, archive: _Archive):
+        """Archive and delete everything matching query in throttled batches"""
+        blob_fields = [f"{field}_blob_id" for field in EXECUTION_OUTPUT_FIELDS] if policy.get("output_blobs") else []
+        projection = None if policy.get("archive") else {"_id": 1, **{field: 1 for field in blob_fields}}
+
+        while report["batches"] < RETENTION_MAX_BATCHES:
+            docs = RetentionStore.find_batch(collection_name, query, RETENTION_BATCH_SIZE, projection=projection)
+            if not docs:
+                return
+
+            blob_ids = [doc[field] for doc in docs for field in blob_fields if doc.get(field) is not None]
+            if policy.get("archive"):
+                if blob_ids:
+                    # Archive the full output rather than the inline preview
+                    for doc in docs:
+                        for field in EXECUTION_OUTPUT_FIELDS:
+                            if doc.get(f"{field}_blob_id") is not None:
+                                doc[field] = ExecutionOutput.read_text(doc[f"{field}_blob_id"])
+                archive.write(docs)
+                report["archived"] += len(docs)
+            report["matched"] += len(docs)
+            report["deleted"] += RetentionStore.delete_ids(collection_name, [doc["_id"] for doc in docs])
+            if blob_ids:
+                report["blobs_deleted"] += ExecutionOutput.delete_files(blob_ids)
+            report["batches"] += 1
+
+            if len(docs) < RETENTION_BATCH_SIZE:
+                return
+            time.sleep(_batch_pause())
+
+        report["incomplete"] = True
+
+    @staticmethod
+    def apply_policy(collection_name: str, max_age_days: Optional[float] = None, dry_run: bool = False) -> Dict:
+        """Apply one collection's policy; max_age_days overrides the configured age"""
+        policy = RETENTION_POLICIES.get(collection_name)
+        if policy is None:
+            raise ValueError(f"No retention policy for '{collection_name}'")
+
+        report = {
+            "matched": 0,
+            "archived": 0,
+            "deleted": 0,
+            "blobs_deleted": 0,
+            "batches": 0,
+            "incomplete": False,
+            "archive_file": None,
+        }
+        archive = _Archive(collection_name)
+        protect = policy.get("protect") or {}
+        max_age_days = max_age_days if max_age_days is not None else policy.get("max_age_days")
+
+        # Age and keep-last rules can match the same documents, so a dry run
+        # counts their union in one query rather than summing per rule
+        queries = []
+        if max_age_days:
+            cutoff = datetime.utcnow() - timedelta(days=max_age_days)
+            queries.append({**protect, "created_at": {"$lt": cutoff}})
+
+        keep = policy.get("keep_last_per_job")
+        if keep:
+            for group in RetentionStore.find_groups_over(collection_name, "job_id", keep, protect):
+                job_query = {**protect, "job_id": group["_id"]}
+                boundary = RetentionStore.newest_dropped(collection_name, job_query, keep)
+                if boundary is None:
+                    continue
+                # Compare on (created_at, _id) so kept documents sharing the boundary timestamp stay
+                queries.append({**job_query, "$or": [
+                    {"created_at": {"$lt": boundary["created_at"]}},
+                    {"created_at": boundary["created_at"], "_id": {"$lte": boundary["_id"]}},
+                ]})
+
+        if dry_run:
+            if queries:
+                report["matched"] = RetentionStore.count_matching(
+                    collection_name, queries[0] if len(queries) == 1 else {"$or": queries}
+                )
+            return report
+
+        try:
+            for query in queries:
+                RetentionService._purge(collection_name, query, policy, report, archive)
+        finally:
+            archive.close()
+
+        report["archive_file"] = archive.path
+        return report
+
+    @staticmethod
+    def apply_policies(
+        collections: Optional[List[str]] = None,
+        max_age_days: Optional[float] = None,
+        dry_run: bool = False,
+    ) -> Dict:
+        """
+        Apply retention to the given collections (all configured ones by default)
+        Returns a per-collection report of matched, archived and deleted documents.
+        """
+        try:
+            results = {}
+            for collection_name in collections or list(RETENTION_POLICIES):
+                started = time.perf_counter()
+                results[collection_name] = RetentionService.apply_policy(
+                    collection_name, max_age_days=max_age_days, dry_run=dry_run
+                )
+                results[collection_name]["elapsed_seconds"] = round(time.perf_counter() - started, 3)
+
+            return {
+                "success": True,
+                "message": "Dry run completed" if dry_run else "Retention applied successfully",
+                "data": results,
+            }
+        except Exception as e:
+            return {
+                "success": False,
+                "message": str(e),
+                "data": {},
+            }
@@ -1,62 +1,229 @@
 """Scheduler service for managing jobs and executions."""
-from datetime import datetime
-from threading import Lock, Thread
-from typing import Dict, Optional
+from datetime import datetime, timezone
+from threading import Lock, RLock, Thread
+from typing import Dict, List, Optional
+import os
+import time
 import traceback
 
+from apscheduler.executors.pool import ThreadPoolExecutor
 from apscheduler.schedulers.background import BackgroundScheduler
 from apscheduler.triggers.cron import CronTrigger
 from bson import ObjectId
 
-from models.job import Job, JobAuditLog, JobExecution
+from core.database import count_round_trips
+from models.job import ExecutionOutput, Job, JobAuditLog, JobExecution, SchedulerCounters
+from models.lease import SchedulerFireClaim
+from services.audit_sink import AuditLogSink
+from services.execution_pool import ExecutionPool
+from services.job_sync import JobSyncWatcher
+from services.leader_election import LeaderElector, process_identity
+from services.metrics_service import MetricsService
+from services.triggers import get_trigger, preview_schedules
 from services.jobs import get_available_jobs, get_job_class
 
+# "aggregate" computes execution stats with one aggregation over executions per request;
+# "counters" reads the scope's counters document, $inc-ed as executions finish (finished
+# executions only) and seeded once at startup from the executions stored before that.
+SCHEDULER_STATS_MODE = os.getenv("SCHEDULER_STATS_MODE", "aggregate")
+# Only the process holding the scheduler lease fires cron jobs; disable for a single worker
+SCHEDULER_LEADER_ELECTION = os.getenv("SCHEDULER_LEADER_ELECTION", "true").lower() == "true"
+SCHEDULER_LEASE_NAME = "scheduler"
+# Longest shutdown waits for running executions to finish and record their results
+SCHEDULER_SHUTDOWN_TIMEOUT_SECONDS = float(os.getenv("SCHEDULER_SHUTDOWN_TIMEOUT_SECONDS", "30"))
+# Job class that applies the retention policies for on-demand retention runs
+RETENTION_JOB_CLASS = "jobs.cleanup.DataCleanupJob"
+
+
+class _ScheduledRun:
+    """A job as handed to the pool, with the fire time it runs for appended to its args."""
+
+    def __init__(self, job, scheduled_run_time: datetime):
+        self._job = job
+        self.args = (*job.args, scheduled_run_time)
+
+    def __getattr__(self, name):
+        return getattr(self._job, name)
+
+    def __str__(self):
+        return str(self._job)
+
+
+class FireTimeThreadPoolExecutor(ThreadPoolExecutor):
+    """
+    APScheduler's thread pool executor, passing each run its scheduled fire time.
+
+    With coalesce the latest of the missed fire times is passed. Every process
+    computes the same fire times from the trigger, so they key the fire claim
+    however late a run starts.
+    """
+
+    def _do_submit_job(self, job, run_times):
+        super()._do_submit_job(_ScheduledRun(job, run_times[-1]), run_times)
+
 
 class SchedulerService:
     """Service for managing scheduled jobs."""
 
     _scheduler = None
     _scheduler_lock = Lock()
+    _execution_pool = None
+    _execution_pool_lock = Lock()
+    _audit_sink = None
+    _audit_sink_lock = Lock()
+    _run_stats = {"runs": 0, "round_trips": 0, "last_run_round_trips": 0}
+    _run_stats_lock = Lock()
+    _leader = None
+    _instance_id = process_identity()
+    _job_sync = None
+    _job_fingerprints = {}
+    # Bumped under _sync_lock whenever a job is applied; job id -> generation it was last applied at
+    _sync_generation = 0
+    _job_generations = {}
+    _sync_lock = RLock()
+    _counters_seeded = False
 
     @staticmethod
     def initialize_scheduler():
-        """Initialize indexes and start the in-process scheduler."""
-        try:
-            Job.create_indexes()
-            JobExecution.create_indexes()
-            JobAuditLog.create_indexes()
+        """
+        Start the in-process scheduler and restore persisted jobs.
 
+        With leader election every worker keeps its scheduler paused and only
+        the holder of the scheduler lease resumes it, so each cron fire runs
+        once however many workers or instances are up.
+        """
+        try:
             with SchedulerService._scheduler_lock:
                 if SchedulerService._scheduler is None:
-                    SchedulerService._scheduler = BackgroundScheduler(timezone="UTC")
-                    SchedulerService._scheduler.start()
+                    SchedulerService._scheduler = BackgroundScheduler(
+                        timezone="UTC",
+                        executors={"default": FireTimeThreadPoolExecutor()},
+                    )
+                    SchedulerService._scheduler.start(paused=SCHEDULER_LEADER_ELECTION)
+
+            # Follow edits made through any worker or instance from here on,
+            # starting from before the initial sync so none made during it are missed
+            job_sync = None
+            if SchedulerService._job_sync is None:
+                job_sync = JobSyncWatcher(
+                    on_changes=SchedulerService._apply_job_changes,
+                    on_resync=SchedulerService.sync_all_jobs,
+                )
+                job_sync.checkpoint()
 
             SchedulerService.sync_all_jobs()
+
+            if job_sync is not None:
+                SchedulerService._job_sync = job_sync
+                job_sync.start()
+
+            if SCHEDULER_STATS_MODE == "counters":
+                # Stats read the executions directly until the seed has finished
+                Thread(target=SchedulerService.seed_execution_counters, name="execution-counters-seed", daemon=True).start()
+
+            if SCHEDULER_LEADER_ELECTION and SchedulerService._leader is None:
+                SchedulerService._leader = LeaderElector(
+                    SCHEDULER_LEASE_NAME,
+                    on_elected=SchedulerService._on_elected,
+                    on_demoted=SchedulerService._on_demoted,
+                    owner=SchedulerService._instance_id,
+                )
+                SchedulerService._leader.start()
             return True
         except Exception as e:
             print(f"Error initializing scheduler: {e}")
             return False
 
+    @staticmethod
+    def _on_elected():
+        """Take over firing: reload jobs, then resume."""
+        SchedulerService.sync_all_jobs()
+        if SchedulerService._scheduler is not None:
+            SchedulerService._scheduler.resume()
+        print(f"✓ Scheduler leader elected: {SchedulerService._instance_id}")
+
+    @staticmethod
+    def _on_demoted():
+        """Stop firing; jobs stay loaded so next_run_time keeps being reported."""
+        if SchedulerService._scheduler is not None:
+            SchedulerService._scheduler.pause()
+        print(f"✗ Scheduler leadership lost: {SchedulerService._instance_id}")
+
+    @staticmethod
+    def get_leader_status() -> Dict:
+        """Leader election state of this process."""
+        if SchedulerService._leader is None:
+            return {"enabled": SCHEDULER_LEADER_ELECTION, "is_leader": not SCHEDULER_LEADER_ELECTION}
+        return {"enabled": True, **SchedulerService._leader.status()}
+
     @staticmethod
     def shutdown_scheduler():
-        """Stop the in-process scheduler cleanly."""
+        """Stop the in-process scheduler and execution pool cleanly."""
+        # Hand the lease over first so another worker resumes firing right away
+        if SchedulerService._leader is not None:
+            SchedulerService._leader.stop()
+            SchedulerService._leader = None
+
+        if SchedulerService._job_sync is not None:
+            SchedulerService._job_sync.stop()
+            SchedulerService._job_sync = None
+
         with SchedulerService._scheduler_lock:
             if SchedulerService._scheduler is not None:
                 SchedulerService._scheduler.shutdown(wait=False)
                 SchedulerService._scheduler = None
 
+        # Let running executions finish so their results, metrics and audit events are written
+        with SchedulerService._execution_pool_lock:
+            if SchedulerService._execution_pool is not None:
+                SchedulerService._execution_pool.shutdown(wait=True, timeout=SCHEDULER_SHUTDOWN_TIMEOUT_SECONDS)
+                SchedulerService._execution_pool = None
+
+        MetricsService.shutdown()
+
+        # Flush buffered audit events last. The closed sink is kept, so runs still
+        # going after the timeout write their events inline instead of into a new,
+        # never-flushed sink.
+        with SchedulerService._audit_sink_lock:
+            if SchedulerService._audit_sink is not None:
+                SchedulerService._audit_sink.shutdown()
+
+    @staticmethod
+    def _get_execution_pool() -> ExecutionPool:
+        """Return the bounded execution pool, creating it on first use."""
+        with SchedulerService._execution_pool_lock:
+            if SchedulerService._execution_pool is None:
+                SchedulerService._execution_pool = ExecutionPool()
+            return SchedulerService._execution_pool
+
+    @staticmethod
+    def _get_audit_sink() -> AuditLogSink:
+        """Return the buffered audit writer, creating it on first use."""
+        with SchedulerService._audit_sink_lock:
+            if SchedulerService._audit_sink is None:
+                SchedulerService._audit_sink = AuditLogSink()
+            return SchedulerService._audit_sink
+
+    @staticmethod
+    def get_audit_sink_stats() -> Dict:
+        """Counters of the buffered audit writer."""
+        with SchedulerService._audit_sink_lock:
+            if SchedulerService._audit_sink is None:
+                return {}
+            return SchedulerService._audit_sink.stats()
+
+    @staticmethod
+    def get_execution_pool_stats() -> Dict:
+        """Occupancy and counters of the execution pool."""
+        with SchedulerService._execution_pool_lock:
+            if SchedulerService._execution_pool is None:
+                return {}
+            return SchedulerService._execution_pool.stats()
+
     @staticmethod
     def _build_trigger(job_data: dict) -> CronTrigger:
-        """Build a cron trigger from persisted job fields."""
-        return CronTrigger(
-            minute=job_data.get("minute", "*"),
-            hour=job_data.get("hour", "*"),
-            day=job_data.get("day_of_month", "*"),
-            month=job_data.get("month", "*"),
-            day_of_week=job_data.get("day_of_week", "*"),
-            week=job_data.get("week", "*"),
-            timezone="UTC",
-        )
+        """Cron trigger for persisted job fields, shared by jobs with the same schedule."""
+        return get_trigger(job_data)
 
     @staticmethod
     def _remove_scheduled_job(job_id: str):
@@ -64,47 +231,169 @@ class SchedulerService:
         if SchedulerService._scheduler is None:
             return
 
-        existing_job = SchedulerService._scheduler.get_job(job_id)
-        if existing_job:
-            SchedulerService._scheduler.remove_job(job_id)
+        with SchedulerService._sync_lock:
+            SchedulerService._job_fingerprints.pop(job_id, None)
+            SchedulerService._job_generations.pop(job_id, None)
+            existing_job = SchedulerService._scheduler.get_job(job_id)
+            if existing_job:
+                SchedulerService._scheduler.remove_job(job_id)
+
+    @staticmethod
+    def _schedule_fingerprint(job_data: dict) -> tuple:
+        """The stored fields that decide whether and when a job fires."""
+        return (
+            job_data.get("minute", "*"),
+            job_data.get("hour", "*"),
+            job_data.get("day_of_month", "*"),
+            job_data.get("month", "*"),
+            job_data.get("day_of_week", "*"),
+            job_data.get("week", "*"),
+            job_data.get("is_enabled", True),
+            job_data.get("is_paused", False),
+        )
+
+    @staticmethod
+    def _apply_job_to_scheduler(job_data: dict):
+        """Create, update, or remove the APScheduler job for a stored job; returns its next run time."""
+        job_id = str(job_data["_id"])
+        should_schedule = job_data.get("is_enabled", True) and not job_data.get("is_paused", False)
+
+        with SchedulerService._sync_lock:
+            SchedulerService._job_fingerprints[job_id] = SchedulerService._schedule_fingerprint(job_data)
+            SchedulerService._sync_generation += 1
+            SchedulerService._job_generations[job_id] = SchedulerService._sync_generation
+            if not should_schedule:
+                if SchedulerService._scheduler.get_job(job_id):
+                    SchedulerService._scheduler.remove_job(job_id)
+                return None
+
+            scheduled_job = SchedulerService._scheduler.add_job(
+                SchedulerService._run_job_from_scheduler,
+                trigger=SchedulerService._build_trigger(job_data),
+                args=[job_id],
+                id=job_id,
+                replace_existing=True,
+                max_instances=1,
+                coalesce=True,
+                misfire_grace_time=60,
+            )
+            return scheduled_job.next_run_time
 
     @staticmethod
     def _sync_job_to_scheduler(job_data: dict):
-        """Create, update, or remove the APScheduler job for a stored job."""
+        """Create, update, or remove the APScheduler job for a stored job and store its next run time."""
         if SchedulerService._scheduler is None:
             return
 
-        job_id = str(job_data["_id"])
-        should_schedule = job_data.get("is_enabled", True) and not job_data.get("is_paused", False)
+        next_run_time = SchedulerService._apply_job_to_scheduler(job_data)
+        Job.set_next_run_times({str(job_data["_id"]): next_run_time})
 
-        if not should_schedule:
-            SchedulerService._remove_scheduled_job(job_id)
-            Job.update_job(job_id, {"next_run_time": None})
+    @staticmethod
+    def _same_run_time(stored, scheduled) -> bool:
+        """Compare a stored (naive UTC) next_run_time with APScheduler's aware one."""
+        if stored is None or scheduled is None:
+            return stored is scheduled
+        if scheduled.tzinfo is not None:
+            scheduled = scheduled.astimezone(timezone.utc).replace(tzinfo=None)
+        return stored.replace(microsecond=0) == scheduled.replace(microsecond=0)
+
+    @staticmethod
+    def _persists_run_times() -> bool:
+        """Whether this process writes derived next_run_time values for watched changes."""
+        if not SCHEDULER_LEADER_ELECTION:
+            return True
+        return SchedulerService._leader is not None and SchedulerService._leader.is_leader
+
+    @staticmethod
+    def _apply_job_changes(changed_jobs: List[dict], deleted_job_ids: List[str]):
+        """
+        Apply job edits seen by the sync watcher.
+
+        Only jobs whose schedule fingerprint changed get their trigger
+        re-added; next_run_time values that moved are written in one
+        bulk_write by the leader.
+        """
+        if SchedulerService._scheduler is None:
             return
 
-        trigger = SchedulerService._build_trigger(job_data)
-        scheduled_job = SchedulerService._scheduler.add_job(
-            SchedulerService._run_job_from_scheduler,
-            trigger=trigger,
-            args=[job_id],
-            id=job_id,
-            replace_existing=True,
-            max_instances=1,
-            coalesce=True,
-            misfire_grace_time=60,
-        )
-        Job.update_job(job_id, {"next_run_time": scheduled_job.next_run_time})
+        next_run_times = {}
+        for job_data in changed_jobs:
+            job_id = str(job_data["_id"])
+            if SchedulerService._job_fingerprints.get(job_id) == SchedulerService._schedule_fingerprint(job_data):
+                continue
+            next_run_time = SchedulerService._apply_job_to_scheduler(job_data)
+            if not SchedulerService._same_run_time(job_data.get("next_run_time"), next_run_time):
+                next_run_times[job_id] = next_run_time
+
+        for job_id in deleted_job_ids:
+            SchedulerService._remove_scheduled_job(job_id)
+
+        if next_run_times and SchedulerService._persists_run_times():
+            Job.set_next_run_times(next_run_times)
+
+    @staticmethod
+    def get_sync_status() -> Dict:
+        """State of the incremental job sync."""
+        if SchedulerService._job_sync is None:
+            return {}
+        return {"tracked_jobs": len(SchedulerService._job_fingerprints), **SchedulerService._job_sync.stats()}
 
     @staticmethod
     def sync_all_jobs():
-        """Restore all persisted jobs into APScheduler."""
-        jobs = Job.find_all_jobs()
+        """
+        Restore all persisted jobs into APScheduler.
+
+        Reads the schedule fields of every job in one query and writes the
+        next_run_time values that changed with a single unordered bulk_write.
+        Jobs applied after the read started (by the API or the sync watcher)
+        are newer than the read and are never removed for missing from it.
+        """
+        if SchedulerService._scheduler is None:
+            return
+
+        started = time.perf_counter()
+        with SchedulerService._sync_lock:
+            read_generation = SchedulerService._sync_generation
+        jobs = Job.find_all_jobs(projection=Job.SCHEDULE_PROJECTION)
+        loaded = time.perf_counter()
+
+        next_run_times = {}
         for job in jobs:
-            SchedulerService._sync_job_to_scheduler(job)
+            next_run_time = SchedulerService._apply_job_to_scheduler(job)
+            if not SchedulerService._same_run_time(job.get("next_run_time"), next_run_time):
+                next_run_times[str(job["_id"])] = next_run_time
+        # Jobs deleted while this process was not following edits
+        stored_ids = {str(job["_id"]) for job in jobs}
+        with SchedulerService._sync_lock:
+            deleted_job_ids = [
+                job_id for job_id, generation in SchedulerService._job_generations.items()
+                if job_id not in stored_ids and generation <= read_generation
+            ]
+            for job_id in deleted_job_ids:
+                SchedulerService._remove_scheduled_job(job_id)
+        scheduled = time.perf_counter()
+
+        Job.set_next_run_times(next_run_times)
+        finished = time.perf_counter()
+
+        print(
+            f"✓ Scheduler restored {len(jobs)} jobs in {finished - started:.3f}s "
+            f"(load {loaded - started:.3f}s, schedule {scheduled - loaded:.3f}s, "
+            f"{len(next_run_times)} next_run_time writes {finished - scheduled:.3f}s)"
+        )
 
     @staticmethod
-    def _run_job_from_scheduler(job_id: str):
-        """Entry point used by APScheduler."""
+    def _run_job_from_scheduler(job_id: str, scheduled_run_time: Optional[datetime] = None):
+        """
+        Entry point used by APScheduler.
+
+        The fire is claimed per job and scheduled fire time first, so a run
+        that overlaps a leadership handover still executes once.
+        """
+        fire_time = scheduled_run_time or datetime.now(timezone.utc)
+        fire_time = fire_time.astimezone(timezone.utc).replace(tzinfo=None)
+        if not SchedulerFireClaim.claim(job_id, fire_time, SchedulerService._instance_id):
+            return
         SchedulerService._execute_job(job_id, trigger_type="scheduled")
 
     @staticmethod
@@ -126,7 +415,7 @@ class SchedulerService:
         }
 
     @staticmethod
-    def _create_audit_log(
+    def _build_audit_log(
         job: dict,
         event_type: str,
         message: str,
@@ -134,9 +423,9 @@ class SchedulerService:
         trigger_type: Optional[str] = None,
         details: Optional[Dict] = None,
         execution_id: Optional[str] = None,
-    ):
-        """Persist a scheduler audit event."""
-        JobAuditLog.insert_log({
+    ) -> Dict:
+        """Build a scheduler audit event document without writing it."""
+        return JobAuditLog.build_log_doc({
             "job_id": str(job["_id"]) if job.get("_id") else None,
             "user_id": str(job["user_id"]) if job.get("user_id") else None,
             "job_name": job.get("name"),
@@ -150,119 +439,214 @@ class SchedulerService:
         })
 
     @staticmethod
-    def _execute_job(job_id: str, trigger_type: str = "manual") -> Dict:
-        """Create an execution record and run the job in a background thread."""
-        job = Job.find_job_by_id(job_id)
-        if not job:
-            return {
-                "success": False,
-                "message": "Job not found",
-                "execution_id": None,
-            }
-
-        execution_data = {
-            "job_id": job_id,
-            "user_id": str(job["user_id"]),
-            "job_name": job["name"],
-            "job_class_string": job["job_class_string"],
-            "status": "running",
-            "output": "",
-            "error": "",
-            "started_at": datetime.utcnow(),
-        }
-        execution_id = JobExecution.insert_execution(execution_data)
-        SchedulerService._create_audit_log(
+    def _create_audit_log(job: dict, event_type: str, message: str, **kwargs):
+        """Queue a scheduler audit event on the buffered audit writer."""
+        SchedulerService._get_audit_sink().emit(
+            SchedulerService._build_audit_log(job, event_type, message, **kwargs)
+        )
+
+    @staticmethod
+    def _record_run_round_trips(round_trips: int):
+        """Accumulate per-run MongoDB round-trip counts."""
+        with SchedulerService._run_stats_lock:
+            stats = SchedulerService._run_stats
+            stats["runs"] += 1
+            stats["round_trips"] += round_trips
+            stats["last_run_round_trips"] = round_trips
+
+    @staticmethod
+    def get_run_stats() -> Dict:
+        """MongoDB round trips spent per job run."""
+        with SchedulerService._run_stats_lock:
+            stats = dict(SchedulerService._run_stats)
+        stats["avg_round_trips_per_run"] = round(stats["round_trips"] / stats["runs"], 2) if stats["runs"] else 0.0
+        return stats
+
+    @staticmethod
+    def _next_run_time(job_id: str):
+        """Next fire time of a job as currently scheduled in APScheduler."""
+        if SchedulerService._scheduler is None:
+            return None
+        scheduled_job = SchedulerService._scheduler.get_job(job_id)
+        return scheduled_job.next_run_time if scheduled_job else None
+
+    @staticmethod
+    def _execute_job(job_id: Optional[str], trigger_type: str = "manual", job: Optional[dict] = None) -> Dict:
+        """
+        Queue the job on the execution pool under a new execution id.
+
+        A run costs one read and three writes: find job, insert the execution
+        as queued, store the result together with started_at when the run
+        ends, and one find_one_and_update on the job that sets its run times
+        and $incs total_executions. The execution therefore reads as queued
+        until its result is stored. Duration metrics, the scheduler counters and
+        audit events are batched by the background metrics and audit writers.
+
+        Passing job (with job_id None) runs an unsaved job document instead,
+        e.g. an on-demand retention run; there is no job to read or update.
+        """
+        with count_round_trips() as submit_tracker:
+            if job is None:
+                job = Job.find_job_by_id(job_id)
+            if not job:
+                return {
+                    "success": False,
+                    "message": "Job not found",
+                    "execution_id": None,
+                }
+
+            execution_id = str(ObjectId())
+            # Stored before the run is queued, so the returned execution id resolves
+            # at once and a run lost while queued still leaves a record
+            JobExecution.insert_execution({
+                "_id": execution_id,
+                "job_id": job_id,
+                "user_id": str(job["user_id"]) if job.get("user_id") else None,
+                "job_name": job["name"],
+                "job_class_string": job["job_class_string"],
+                "status": "queued",
+                "output": "",
+                "error": "",
+            })
+
+        # Emitted together with the outcome event once the run finishes
+        triggered_log = SchedulerService._build_audit_log(
             job,
             event_type="job_triggered",
             message=f"Job '{job['name']}' triggered via {trigger_type} run",
             trigger_type=trigger_type,
             status="info",
-            execution_id=str(execution_id),
+            execution_id=execution_id,
             details={
                 "pub_args": job.get("pub_args", []),
                 "pub_kwargs": job.get("pub_kwargs", {}),
             },
         )
 
+        def record_unstarted(status: str, error: str, event_type: str, message: str):
+            """Store the outcome of an execution that never ran, count it and audit it."""
+            JobExecution.update_execution(execution_id, {
+                "status": status,
+                "error": error,
+                "completed_at": datetime.utcnow(),
+            })
+            MetricsService.count_unstarted(job, status)
+            audit_sink = SchedulerService._get_audit_sink()
+            audit_sink.emit(triggered_log)
+            audit_sink.emit(SchedulerService._build_audit_log(
+                job,
+                event_type=event_type,
+                message=message,
+                trigger_type=trigger_type,
+                status="failed",
+                execution_id=execution_id,
+            ))
+
         def execute_job_background():
-            try:
-                job_class = get_job_class(job["job_class_string"])
-                if not job_class:
-                    raise ValueError(f"Job class '{job['job_class_string']}' not found")
+            with count_round_trips() as run_tracker:
+                started_at = datetime.utcnow()
+                run_started = time.perf_counter()
+                try:
+                    job_class = get_job_class(job["job_class_string"])
+                    if not job_class:
+                        raise ValueError(f"Job class '{job['job_class_string']}' not found")
 
-                job_instance = job_class(
-                    pub_args=job.get("pub_args", []),
-                    pub_kwargs=job.get("pub_kwargs", {}),
-                )
-                output = job_instance.run()
-                completed_at = datetime.utcnow()
+                    job_instance = job_class(
+                        pub_args=job.get("pub_args", []),
+                        pub_kwargs=job.get("pub_kwargs", {}),
+                    )
+                    output = job_instance.run()
+                    duration_ms = (time.perf_counter() - run_started) * 1000
+                    completed_at = datetime.utcnow()
 
-                JobExecution.update_execution(str(execution_id), {
-                    "status": "completed",
-                    "output": output,
-                    "completed_at": completed_at,
-                })
+                    JobExecution.update_execution(execution_id, {
+                        "status": "completed",
+                        "output": output,
+                        "started_at": started_at,
+                        "completed_at": completed_at,
+                    })
+                    MetricsService.record_execution(job, "completed", duration_ms, completed_at)
 
-                latest_job = Job.find_job_by_id(job_id) or job
-                next_run_time = None
-                if SchedulerService._scheduler is not None:
-                    scheduled_job = SchedulerService._scheduler.get_job(job_id)
-                    if scheduled_job:
-                        next_run_time = scheduled_job.next_run_time
-
-                Job.update_job(job_id, {
-                    "last_run_time": completed_at,
-                    "next_run_time": next_run_time,
-                    "total_executions": latest_job.get("total_executions", 0) + 1,
-                })
-                SchedulerService._create_audit_log(
-                    job,
-                    event_type="job_completed",
-                    message=f"Job '{job['name']}' completed successfully",
-                    trigger_type=trigger_type,
-                    status="success",
-                    execution_id=str(execution_id),
-                    details={
-                        "completed_at": completed_at.isoformat(),
-                        "next_run_time": next_run_time.isoformat() if next_run_time else None,
-                    },
-                )
-            except Exception as e:
-                JobExecution.update_execution(str(execution_id), {
-                    "status": "failed",
-                    "error": str(e) + "\n" + traceback.format_exc(),
-                    "completed_at": datetime.utcnow(),
-                })
+                    next_run_time = SchedulerService._next_run_time(job_id) if job_id else None
+                    updated_job = Job.record_execution(job_id, next_run_time, completed_at=completed_at) if job_id else None
+                    outcome_log = SchedulerService._build_audit_log(
+                        job,
+                        event_type="job_completed",
+                        message=f"Job '{job['name']}' completed successfully",
+                        trigger_type=trigger_type,
+                        status="success",
+                        execution_id=execution_id,
+                        details={
+                            "completed_at": completed_at.isoformat(),
+                            "next_run_time": next_run_time.isoformat() if next_run_time else None,
+                            "total_executions": updated_job.get("total_executions") if updated_job else None,
+                        },
+                    )
+                except Exception as e:
+                    duration_ms = (time.perf_counter() - run_started) * 1000
+                    failed_at = datetime.utcnow()
+                    JobExecution.update_execution(execution_id, {
+                        "status": "failed",
+                        "error": str(e) + "\n" + traceback.format_exc(),
+                        "started_at": started_at,
+                        "completed_at": failed_at,
+                    })
+                    MetricsService.record_execution(job, "failed", duration_ms, failed_at)
+
+                    next_run_time = SchedulerService._next_run_time(job_id) if job_id else None
+                    if job_id:
+                        Job.record_execution(job_id, next_run_time)
+                    outcome_log = SchedulerService._build_audit_log(
+                        job,
+                        event_type="job_failed",
+                        message=f"Job '{job['name']}' failed during execution",
+                        trigger_type=trigger_type,
+                        status="failed",
+                        execution_id=execution_id,
+                        details={
+                            "error": str(e),
+                            "next_run_time": next_run_time.isoformat() if next_run_time else None,
+                        },
+                    )
 
-                next_run_time = None
-                if SchedulerService._scheduler is not None:
-                    scheduled_job = SchedulerService._scheduler.get_job(job_id)
-                    if scheduled_job:
-                        next_run_time = scheduled_job.next_run_time
+                audit_sink = SchedulerService._get_audit_sink()
+                audit_sink.emit(triggered_log)
+                audit_sink.emit(outcome_log)
 
-                Job.update_job(job_id, {
-                    "next_run_time": next_run_time,
-                })
-                SchedulerService._create_audit_log(
-                    job,
-                    event_type="job_failed",
-                    message=f"Job '{job['name']}' failed during execution",
-                    trigger_type=trigger_type,
-                    status="failed",
-                    execution_id=str(execution_id),
-                    details={
-                        "error": str(e),
-                        "next_run_time": next_run_time.isoformat() if next_run_time else None,
-                    },
-                )
+            SchedulerService._record_run_round_trips(submit_tracker["round_trips"] + run_tracker["round_trips"])
 
-        thread = Thread(target=execute_job_background, daemon=True)
-        thread.start()
+        def cancel_job_background():
+            # The pool shut down before the run started
+            record_unstarted(
+                "cancelled",
+                "Scheduler shut down before the run started",
+                "job_cancelled",
+                f"Job '{job['name']}' cancelled: scheduler shut down before it started",
+            )
+
+        accepted = SchedulerService._get_execution_pool().submit(
+            job["job_class_string"],
+            execute_job_background,
+            on_cancel=cancel_job_background,
+        )
+        if not accepted:
+            record_unstarted(
+                "rejected",
+                "Execution queue is full",
+                "job_rejected",
+                f"Job '{job['name']}' rejected: execution queue is full",
+            )
+            return {
+                "success": False,
+                "message": "Execution queue is full, job run rejected",
+                "execution_id": execution_id,
+                "rejected": True,
+            }
 
         return {
             "success": True,
-            "message": "Job execution started",
-            "execution_id": str(execution_id),
+            "message": "Job execution queued",
+            "execution_id": execution_id,
         }
     
     @staticmethod
@@ -464,6 +848,45 @@ class SchedulerService:
                 "data": []
             }
     
+    @staticmethod
+    def preview_schedules(
+        job_ids: Optional[List[str]] = None,
+        schedules: Optional[List[Dict]] = None,
+        count: int = 5,
+        start: Optional[datetime] = None,
+    ) -> Dict:
+        """
+        Next fire times for stored jobs and/or ad-hoc schedules
+        Jobs sharing a schedule are computed once from the cached trigger.
+        """
+        try:
+            jobs = Job.find_jobs_by_ids(job_ids, projection=Job.SCHEDULE_PROJECTION) if job_ids else []
+            adhoc = [{**schedule, "_id": f"schedule:{idx}"} for idx, schedule in enumerate(schedules or [])]
+            fire_times = preview_schedules(jobs + adhoc, count, start)
+
+            found_ids = {str(job["_id"]) for job in jobs}
+            return {
+                "success": True,
+                "message": "Schedules previewed successfully",
+                "data": {
+                    key: [fire_time.isoformat() for fire_time in times]
+                    for key, times in fire_times.items()
+                },
+                "missing_job_ids": [job_id for job_id in job_ids or [] if job_id not in found_ids],
+            }
+        except ValueError as e:
+            return {
+                "success": False,
+                "message": f"Invalid schedule: {e}",
+                "data": {}
+            }
+        except Exception as e:
+            return {
+                "success": False,
+                "message": str(e),
+                "data": {}
+            }
+
     @staticmethod
     def update_job(job_id: str, job_data: dict) -> Dict:
         """Update a job"""
@@ -634,16 +1057,35 @@ class SchedulerService:
             }
     
     @staticmethod
-    def get_executions(job_id: Optional[str] = None, limit: int = 50) -> Dict:
-        """Get executions"""
+    def run_retention_now(collections: Optional[List[str]] = None, max_age_days: Optional[float] = None) -> Dict:
+        """Queue an on-demand retention run (a DataCleanupJob execution) and return its execution id."""
+        try:
+            return SchedulerService._execute_job(None, trigger_type="manual", job={
+                "name": "On-demand retention run",
+                "job_class_string": RETENTION_JOB_CLASS,
+                "pub_args": [],
+                "pub_kwargs": {"collections": collections, "days_old": max_age_days, "dry_run": False},
+            })
+        except Exception as e:
+            return {
+                "success": False,
+                "message": str(e),
+                "execution_id": None
+            }
+    
+    @staticmethod
+    def get_executions(job_id: Optional[str] = None, status: Optional[str] = None, limit: int = 50) -> Dict:
+        """
+        Get executions (summary fields only)
+        Heavy output/error fields are only returned by get_execution
+        """
         try:
-            if job_id:
-                executions = JobExecution.find_executions_by_job(job_id, limit)
-            else:
-                from core.database import get_db
-                db = get_db()
-                executions_collection = db['scheduler_executions']
-                executions = list(executions_collection.find().sort("created_at", -1).limit(limit))
+            executions = JobExecution.find_executions(
+                job_id=job_id,
+                status=status,
+                limit=limit,
+                projection=JobExecution.LIST_PROJECTION
+            )
             
             executions_data = []
             for execution in executions:
@@ -654,8 +1096,6 @@ class SchedulerService:
                     "job_name": execution["job_name"],
                     "job_class_string": execution["job_class_string"],
                     "status": execution["status"],
-                    "output": execution.get("output", ""),
-                    "error": execution.get("error", ""),
                     "started_at": execution.get("started_at"),
                     "completed_at": execution.get("completed_at"),
                     "created_at": execution.get("created_at")
@@ -697,6 +1137,11 @@ class SchedulerService:
                 "status": execution["status"],
                 "output": execution.get("output", ""),
                 "error": execution.get("error", ""),
+                # Offloaded text is a preview; the full content is at /executions/{id}/output
+                "output_truncated": execution.get("output_blob_id") is not None,
+                "error_truncated": execution.get("error_blob_id") is not None,
+                "output_size": execution.get("output_size"),
+                "error_size": execution.get("error_size"),
                 "started_at": execution.get("started_at"),
                 "completed_at": execution.get("completed_at"),
                 "created_at": execution.get("created_at")
@@ -714,6 +1159,33 @@ class SchedulerService:
                 "data": None
             }
 
+    @staticmethod
+    def get_execution_output(execution_id: str, field: str = "output") -> Dict:
+        """
+        Get the full output (or error) of an execution as a stream of bytes
+        Offloaded content is decompressed from GridFS chunk by chunk.
+        """
+        execution = JobExecution.find_execution_by_id(execution_id)
+        if not execution:
+            return {
+                "success": False,
+                "message": "Execution not found",
+                "stream": None
+            }
+        
+        blob_id = execution.get(f"{field}_blob_id")
+        if blob_id is not None:
+            stream = ExecutionOutput.iter_chunks(blob_id)
+        else:
+            stream = iter([(execution.get(field) or "").encode("utf-8")])
+        
+        return {
+            "success": True,
+            "message": "Execution output retrieved successfully",
+            "size": execution.get(f"{field}_size"),
+            "stream": stream
+        }
+
     @staticmethod
     def get_audit_logs(job_id: Optional[str] = None, event_type: Optional[str] = None, limit: int = 100) -> Dict:
         """Get scheduler audit logs."""
@@ -786,40 +1258,91 @@ class SchedulerService:
                 "jobs": []
             }
     
+    @staticmethod
+    def seed_execution_counters() -> Dict:
+        """
+        Count the executions stored before runs were counted as they finish
+        into the counters' seeded_counts, then write the seed marker.
+
+        New executions are flagged as counted when inserted, so the seed only
+        reads the unflagged ones and never races the per-run increments. It
+        $sets its totals, so a seed interrupted before the marker is written
+        is simply repeated on the next startup.
+        """
+        try:
+            if SchedulerCounters.is_seeded():
+                SchedulerService._counters_seeded = True
+                return {"success": True, "message": "Execution counters already seeded", "seeded": False}
+
+            seeded = {SchedulerCounters.GLOBAL_SCOPE: {}}
+            for row in JobExecution.aggregate_status_counts(group_by_user=True, uncounted_only=True):
+                status = row["_id"].get("status")
+                user_id = str(row["_id"]["user_id"]) if row["_id"].get("user_id") else None
+                for scope in SchedulerCounters.scopes(user_id):
+                    status_counts = seeded.setdefault(scope, {})
+                    status_counts[status] = status_counts.get(status, 0) + row["count"]
+
+            SchedulerCounters.set_seeded_counts(seeded)
+            SchedulerCounters.mark_seeded()
+            SchedulerService._counters_seeded = True
+            print(f"✓ Seeded execution counters from {sum(seeded[SchedulerCounters.GLOBAL_SCOPE].values())} executions")
+            return {"success": True, "message": "Execution counters seeded", "seeded": True, "counts": seeded}
+        except Exception as e:
+            print(f"✗ Error seeding execution counters: {e}")
+            return {"success": False, "message": str(e), "seeded": False}
+
+    @staticmethod
+    def _execution_counts(user_id: Optional[str] = None) -> Dict:
+        """
+        Execution totals per status: read from the scope's counters document
+        (one find_one), or one aggregation over executions - also used in
+        counters mode until the seed has finished.
+        """
+        if SCHEDULER_STATS_MODE == "counters" and not SchedulerService._counters_seeded:
+            SchedulerService._counters_seeded = SchedulerCounters.is_seeded()
+
+        if SCHEDULER_STATS_MODE == "counters" and SchedulerService._counters_seeded:
+            status_counts = {}
+            scope = SchedulerCounters.user_scope(user_id) if user_id else SchedulerCounters.GLOBAL_SCOPE
+            counters = SchedulerCounters.find_counters(scope) or {}
+            for field in ("status_counts", "seeded_counts"):
+                for status, count in counters.get(field, {}).items():
+                    status_counts[status] = status_counts.get(status, 0) + count
+        else:
+            status_counts = {
+                row["_id"].get("status"): row["count"]
+                for row in JobExecution.aggregate_status_counts(user_id=user_id)
+            }
+        return {
+            "total_executions": sum(status_counts.values()),
+            "status_counts": status_counts,
+        }
+
     @staticmethod
     def get_scheduler_stats(user_id: Optional[str] = None) -> Dict:
-        """Get scheduler statistics"""
+        """
+        Get scheduler statistics
+        One aggregation per collection; with SCHEDULER_STATS_MODE=counters the
+        executions are read from the scope's counters document instead
+        """
         try:
-            from core.database import get_db
-            db = get_db()
+            job_stats = Job.aggregate_stats(user_id=user_id)
+            execution_counts = SchedulerService._execution_counts(user_id=user_id)
             
-            if user_id:
-                user_obj_id = ObjectId(user_id) if isinstance(user_id, str) else user_id
-                total_jobs = db['scheduler_jobs'].count_documents({"user_id": user_obj_id})
-                enabled_jobs = db['scheduler_jobs'].count_documents({"user_id": user_obj_id, "is_enabled": True})
-                paused_jobs = db['scheduler_jobs'].count_documents({"user_id": user_obj_id, "is_paused": True})
-                total_executions = db['scheduler_executions'].count_documents({"user_id": user_obj_id})
-                completed_executions = db['scheduler_executions'].count_documents({"user_id": user_obj_id, "status": "completed"})
-                failed_executions = db['scheduler_executions'].count_documents({"user_id": user_obj_id, "status": "failed"})
-            else:
-                total_jobs = db['scheduler_jobs'].count_documents({})
-                enabled_jobs = db['scheduler_jobs'].count_documents({"is_enabled": True})
-                paused_jobs = db['scheduler_jobs'].count_documents({"is_paused": True})
-                total_executions = db['scheduler_executions'].count_documents({})
-                completed_executions = db['scheduler_executions'].count_documents({"status": "completed"})
-                failed_executions = db['scheduler_executions'].count_documents({"status": "failed"})
+            total_executions = execution_counts["total_executions"]
+            completed_executions = execution_counts["status_counts"].get("completed", 0)
+            failed_executions = execution_counts["status_counts"].get("failed", 0)
             
             return {
                 "success": True,
                 "message": "Stats retrieved successfully",
                 "stats": {
-                    "total_jobs": total_jobs,
-                    "enabled_jobs": enabled_jobs,
-                    "paused_jobs": paused_jobs,
+                    **job_stats,
                     "total_executions": total_executions,
                     "completed_executions": completed_executions,
                     "failed_executions": failed_executions,
-                    "success_rate": (completed_executions / total_executions * 100) if total_executions > 0 else 0
+                    "success_rate": (completed_executions / total_executions * 100) if total_executions > 0 else 0,
+                    "source": SCHEDULER_STATS_MODE
                 }
             }
         except Exception as e:
@@ -0,0 +1,85 @@
+"""Cached cron triggers and fire-time previews."""
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+from typing import Dict, List, Optional
+import os
+
+from apscheduler.triggers.cron import CronTrigger
+
+# Distinct schedules kept compiled; jobs sharing a schedule share one trigger
+SCHEDULER_TRIGGER_CACHE_SIZE = int(os.getenv("SCHEDULER_TRIGGER_CACHE_SIZE", "1024"))
+# Upper bound on fire times returned per schedule by a preview
+MAX_PREVIEW_FIRE_TIMES = 100
+
+
+def schedule_key(job_data: dict, tz: str = "UTC") -> tuple:
+    """(minute, hour, day_of_month, month, day_of_week, week, tz) of a stored or requested job."""
+    return tuple(
+        "*" if job_data.get(field) in (None, "") else str(job_data[field])
+        for field in ("minute", "hour", "day_of_month", "month", "day_of_week", "week")
+    ) + (tz,)
+
+
+@lru_cache(maxsize=SCHEDULER_TRIGGER_CACHE_SIZE)
+def compile_trigger(minute: str, hour: str, day_of_month: str, month: str, day_of_week: str, week: str, tz: str) -> CronTrigger:
+    """Parse a cron schedule once; raises ValueError for invalid expressions (not cached)."""
+    return CronTrigger(
+        minute=minute,
+        hour=hour,
+        day=day_of_month,
+        month=month,
+        day_of_week=day_of_week,
+        week=week,
+        timezone=tz,
+    )
+
+
+def get_trigger(job_data: dict, tz: str = "UTC") -> CronTrigger:
+    """Compiled trigger for a job's schedule fields."""
+    return compile_trigger(*schedule_key(job_data, tz))
+
+
+def trigger_cache_stats() -> Dict:
+    """Hit/miss counters of the trigger cache."""
+    info = compile_trigger.cache_info()
+    return {
+        "hits": info.hits,
+        "misses": info.misses,
+        "size": info.currsize,
+        "max_size": info.maxsize,
+    }
+
+
+def next_fire_times(trigger: CronTrigger, count: int, start: Optional[datetime] = None) -> List[datetime]:
+    """The next count fire times of a trigger strictly after start (now by default)."""
+    now = start or datetime.now(timezone.utc)
+    if now.tzinfo is None:
+        now = now.replace(tzinfo=timezone.utc)
+
+    fire_times = []
+    previous = None
+    # get_next_fire_time returns times >= now, so step just past the last one
+    while len(fire_times) < count:
+        fire_time = trigger.get_next_fire_time(previous, now)
+        if fire_time is None:
+            break
+        fire_times.append(fire_time)
+        previous = fire_time
+        now = fire_time + timedelta(microseconds=1)
+    return fire_times
+
+
+def preview_schedules(jobs: List[dict], count: int, start: Optional[datetime] = None) -> Dict[str, List[datetime]]:
+    """
+    Next fire times for many jobs keyed by job id
+    Jobs with identical schedules share one trigger and one computation.
+    """
+    count = min(count, MAX_PREVIEW_FIRE_TIMES)
+    by_schedule = {}
+    results = {}
+    for job in jobs:
+        key = schedule_key(job)
+        if key not in by_schedule:
+            by_schedule[key] = next_fire_times(compile_trigger(*key), count, start)
+        results[str(job["_id"])] = by_schedule[key]
+    return results
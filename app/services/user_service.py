@@ -1,32 +1,50 @@
 """User service for business logic"""
 from models.user import User
-from pymongo.errors import DuplicateKeyError
-from typing import List, Dict
+from pymongo.errors import BulkWriteError, DuplicateKeyError
+from typing import BinaryIO, Iterable, Iterator, List, Dict, Optional, Tuple, Union
 import openpyxl
 from io import BytesIO
+import json
+import os
+
+# Number of users sent to MongoDB per insert_many call
+USER_INSERT_BATCH_SIZE = int(os.getenv("USER_INSERT_BATCH_SIZE", "1000"))
+
+DUPLICATE_KEY_ERROR_CODE = 11000
+
+# Default page size for the users listing
+USERS_PAGE_SIZE = int(os.getenv("USERS_PAGE_SIZE", "1000"))
+
+# Fields that can be requested from the users listing
+USER_FIELDS = ("email", "first_name", "last_name", "user_name", "created_at")
+
+# Expected Excel header columns, in their default positions
+EXCEL_USER_COLUMNS = ("user_name__v", "user_first_name__v", "user_last_name__v", "user_email__v")
 
 
 class UserService:
     """Service for user operations"""
     
+    @staticmethod
+    def _build_user_info(user_data: dict) -> Dict:
+        """Map Vault ingest fields to the stored user fields"""
+        email = user_data.get("user_email__v")
+        return {
+            "email": email,
+            "first_name": user_data.get("user_first_name__v"),
+            "last_name": user_data.get("user_last_name__v"),
+            "user_name": user_data.get("user_name__v") or email
+        }
+    
     @staticmethod
     def create_user_from_json(user_data: dict) -> Dict:
         """
         Create a user from JSON ingest data
         Extracts email and name from nested structure
         """
+        email = user_data.get("user_email__v")
         try:
-            email = user_data.get("user_email__v")
-            first_name = user_data.get("user_first_name__v")
-            last_name = user_data.get("user_last_name__v")
-            user_name = user_data.get("user_name__v")
-            
-            user_info = {
-                "email": email,
-                "first_name": first_name,
-                "last_name": last_name,
-                "user_name": user_name or email
-            }
+            user_info = UserService._build_user_info(user_data)
             
             user_id = User.insert_user(user_info)
             return {
@@ -53,103 +71,194 @@ class UserService:
         Create multiple users from JSON payload
         """
         users = payload.get("users", [])
+        return UserService.bulk_create_users(({}, user_data) for user_data in users)
+    
+    @staticmethod
+    def insert_user_batch(batch: List[Tuple[Dict, Dict]]) -> List[Dict]:
+        """
+        Insert one batch of users with a single insert_many call
+        Returns one result per (context, user_data) entry, in input order
+        """
+        emails = [user_data.get("user_email__v") for _, user_data in batch]
+        try:
+            user_docs = [
+                User.build_user_doc(UserService._build_user_info(user_data))
+                for _, user_data in batch
+            ]
+        except Exception as e:
+            return [{"success": False, "message": str(e), "user_id": None} for _ in batch]
+        
+        write_errors = {}
+        try:
+            User.insert_users(user_docs)
+        except BulkWriteError as e:
+            for error in e.details.get("writeErrors", []):
+                write_errors[error["index"]] = error
+        except Exception as e:
+            return [{"success": False, "message": str(e), "user_id": None} for _ in batch]
+        
+        results = []
+        for index, (email, user_doc) in enumerate(zip(emails, user_docs)):
+            error = write_errors.get(index)
+            if error is None:
+                results.append({
+                    "success": True,
+                    "message": f"User {email} created successfully",
+                    "user_id": str(user_doc["_id"])
+                })
+            elif error.get("code") == DUPLICATE_KEY_ERROR_CODE:
+                results.append({
+                    "success": False,
+                    "message": f"User with email {email} already exists",
+                    "user_id": None
+                })
+            else:
+                results.append({
+                    "success": False,
+                    "message": error.get("errmsg", "Failed to insert user"),
+                    "user_id": None
+                })
+        return results
+    
+    @staticmethod
+    def iter_batches(users: Iterable[Tuple[Dict, Dict]], batch_size: int = None) -> Iterator[List[Tuple[Dict, Dict]]]:
+        """Group (context, user_data) pairs into lists of at most batch_size"""
+        batch_size = batch_size or USER_INSERT_BATCH_SIZE
+        batch = []
+        for entry in users:
+            batch.append(entry)
+            if len(batch) >= batch_size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+    
+    @staticmethod
+    def bulk_create_users(users: Iterable[Tuple[Dict, Dict]], batch_size: int = None) -> Dict:
+        """
+        Create users in batches of insert_many(ordered=False)
+        
+        `users` yields (context, user_data) pairs; context keys (e.g. "row")
+        are copied into the matching result detail. If reading or inserting
+        fails partway, the batches already inserted are still reported,
+        together with an "error".
+        """
         results = {
-            "total": len(users),
+            "total": 0,
             "successful": 0,
             "failed": 0,
             "details": []
         }
         
-        for user_data in users:
-            result = UserService.create_user_from_json(user_data)
-            if result["success"]:
-                results["successful"] += 1
-            else:
-                results["failed"] += 1
-            results["details"].append(result)
+        try:
+            for batch in UserService.iter_batches(users, batch_size):
+                batch_results = UserService.insert_user_batch(batch)
+                results["total"] += len(batch)
+                for (context, _), result in zip(batch, batch_results):
+                    if result["success"]:
+                        results["successful"] += 1
+                    else:
+                        results["failed"] += 1
+                    results["details"].append({**context, **result})
+        except Exception as e:
+            results["error"] = str(e)
         
         return results
     
     @staticmethod
-    def create_users_from_excel(file_content: bytes) -> Dict:
+    def iter_excel_users(file_obj: BinaryIO) -> Iterator[Tuple[Dict, Dict]]:
         """
-        Create users from Excel file
+        Stream users from an Excel file as (context, user_data) pairs
+        
+        The workbook is opened in read-only mode and rows are read as plain
+        value tuples, so memory stays flat regardless of sheet size.
         Expects columns: user_name__v, user_first_name__v, user_last_name__v, user_email__v
         """
+        workbook = openpyxl.load_workbook(file_obj, read_only=True, data_only=True)
         try:
-            # Load Excel file
-            excel_file = BytesIO(file_content)
-            workbook = openpyxl.load_workbook(excel_file)
-            worksheet = workbook.active
-            
-            results = {
-                "total": 0,
-                "successful": 0,
-                "failed": 0,
-                "details": []
-            }
-            
-            # Get headers from first row
-            headers = []
-            for cell in worksheet[1]:
-                if cell.value:
-                    headers.append(cell.value)
+            rows = workbook.active.iter_rows(values_only=True)
+            header = next(rows, None) or ()
             
-            # Map column indices
-            col_map = {header: idx for idx, header in enumerate(headers, 1)}
+            # Map column positions, falling back to the documented column order
+            col_map = {value: idx for idx, value in enumerate(header) if value}
+            positions = [
+                col_map.get(column, default)
+                for default, column in enumerate(EXCEL_USER_COLUMNS)
+            ]
             
-            # Process data rows (skip header)
-            for row_idx, row in enumerate(worksheet.iter_rows(min_row=2, values_only=False), start=2):
-                try:
-                    # Get values from cells
-                    user_name = worksheet.cell(row_idx, col_map.get("user_name__v", 1)).value
-                    first_name = worksheet.cell(row_idx, col_map.get("user_first_name__v", 2)).value
-                    last_name = worksheet.cell(row_idx, col_map.get("user_last_name__v", 3)).value
-                    email = worksheet.cell(row_idx, col_map.get("user_email__v", 4)).value
-                    
-                    # Skip empty rows
-                    if not email:
-                        continue
-                    
-                    results["total"] += 1
-                    
-                    user_data = {
-                        "user_name__v": user_name or email,
-                        "user_first_name__v": first_name or "",
-                        "user_last_name__v": last_name or "",
-                        "user_email__v": email
-                    }
-                    
-                    result = UserService.create_user_from_json(user_data)
-                    if result["success"]:
-                        results["successful"] += 1
-                    else:
-                        results["failed"] += 1
-                    results["details"].append({
-                        "row": row_idx,
-                        **result
-                    })
+            for row_idx, row in enumerate(rows, start=2):
+                user_name, first_name, last_name, email = (
+                    row[pos] if pos < len(row) else None for pos in positions
+                )
                 
-                except Exception as e:
-                    results["failed"] += 1
-                    results["details"].append({
-                        "row": row_idx,
-                        "success": False,
-                        "message": str(e)
-                    })
-            
-            return results
-        
-        except Exception as e:
-            return {
-                "total": 0,
-                "successful": 0,
-                "failed": 0,
-                "details": [],
-                "error": str(e)
-            }
+                # Skip empty rows
+                if not email:
+                    continue
+                
+                yield {"row": row_idx}, {
+                    "user_name__v": user_name or email,
+                    "user_first_name__v": first_name or "",
+                    "user_last_name__v": last_name or "",
+                    "user_email__v": email
+                }
+        finally:
+            workbook.close()
+    
+    @staticmethod
+    def iter_excel_user_batches(file_obj: BinaryIO, batch_size: int = None) -> Iterator[List[Tuple[Dict, Dict]]]:
+        """Stream users from an Excel file in lists of at most batch_size"""
+        return UserService.iter_batches(UserService.iter_excel_users(file_obj), batch_size)
+    
+    @staticmethod
+    def create_users_from_excel(file_content: Union[bytes, BinaryIO]) -> Dict:
+        """
+        Create users from Excel file
+        Accepts raw bytes or a seekable binary file object. A file that fails
+        partway still reports the rows inserted before the error.
+        """
+        excel_file = BytesIO(file_content) if isinstance(file_content, bytes) else file_content
+        return UserService.bulk_create_users(UserService.iter_excel_users(excel_file))
     
     @staticmethod
     def get_all_users() -> List[Dict]:
         """Get all users from database"""
         return User.find_all_users()
+    
+    @staticmethod
+    def _validate_fields(fields: Optional[List[str]]):
+        """Reject projection fields that are not part of the user document"""
+        unknown = [field for field in fields or [] if field not in USER_FIELDS]
+        if unknown:
+            raise ValueError(f"Unknown user fields: {', '.join(unknown)}")
+    
+    @staticmethod
+    def get_users_page(after: Optional[str] = None, limit: int = None, fields: Optional[List[str]] = None) -> Dict:
+        """
+        Get one page of users ordered by email
+        next_after is the cursor for the following page, or None on the last page
+        """
+        UserService._validate_fields(fields)
+        limit = limit or USERS_PAGE_SIZE
+        users = list(User.find_users_page(after=after, limit=limit, fields=fields))
+        return {
+            "data": users,
+            "next_after": users[-1]["email"] if len(users) == limit else None
+        }
+    
+    @staticmethod
+    def iter_users_ndjson(after: Optional[str] = None, limit: Optional[int] = None, fields: Optional[List[str]] = None) -> Iterator[bytes]:
+        """
+        Serialize users one JSON line at a time straight from the cursor
+        Fields are validated up front, before the first line is produced
+        """
+        UserService._validate_fields(fields)
+        
+        def generate():
+            cursor = User.find_users_page(after=after, limit=limit, fields=fields)
+            try:
+                for user in cursor:
+                    yield (json.dumps(user, default=str) + "\n").encode()
+            finally:
+                cursor.close()
+        
+        return generate()
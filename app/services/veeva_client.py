@@ -0,0 +1,196 @@
+"""Veeva Vault API client with a shared session cache."""
+from datetime import datetime, timedelta
+from threading import Lock
+from typing import Dict, Optional, Tuple
+import hashlib
+import os
+
+import requests
+
+from core.http_client import http_request
+
+VEEVA_DEFAULT_API_VERSION = "v23.2"
+# Vault sessions time out after a period of inactivity; reuse one for at most this long
+# since its last successful use (keep below the Vault's configured session timeout)
+VEEVA_SESSION_TTL_SECONDS = float(os.getenv("VEEVA_SESSION_TTL_SECONDS", "900"))
+
+
+class VeevaAuthError(Exception):
+    """Vault rejected the credentials or the auth call failed"""
+
+
+class VeevaSessionCache:
+    """
+    Session ids keyed by connection, shared across threads.
+
+    Only one thread authenticates per key at a time; the others wait for
+    and reuse its session. Expiry slides forward each time a session is used.
+    """
+
+    def __init__(self, ttl_seconds: float = VEEVA_SESSION_TTL_SECONDS):
+        self._ttl = timedelta(seconds=ttl_seconds)
+        self._lock = Lock()
+        self._key_locks: Dict[str, Lock] = {}
+        self._sessions: Dict[str, dict] = {}
+        self._stats = {"hits": 0, "misses": 0, "auths": 0, "auth_failures": 0, "invalidations": 0}
+
+    def _count(self, key: str):
+        with self._lock:
+            self._stats[key] += 1
+
+    def _key_lock(self, key: str) -> Lock:
+        with self._lock:
+            return self._key_locks.setdefault(key, Lock())
+
+    def _valid(self, key: str) -> Optional[str]:
+        with self._lock:
+            session = self._sessions.get(key)
+            if session and session["expires_at"] > datetime.utcnow():
+                return session["session_id"]
+            return None
+
+    def get(self, key: str, authenticate) -> str:
+        """Cached session id for key, calling authenticate() once if there is none."""
+        session_id = self._valid(key)
+        if session_id:
+            self._count("hits")
+            return session_id
+
+        with self._key_lock(key):
+            # Another thread may have authenticated while this one waited
+            session_id = self._valid(key)
+            if session_id:
+                self._count("hits")
+                return session_id
+
+            self._count("misses")
+            try:
+                session_id = authenticate()
+            except Exception:
+                self._count("auth_failures")
+                raise
+            self._count("auths")
+            with self._lock:
+                self._sessions[key] = {"session_id": session_id, "expires_at": datetime.utcnow() + self._ttl}
+            return session_id
+
+    def touch(self, key: str, session_id: str):
+        """Extend a session that was just used successfully."""
+        with self._lock:
+            session = self._sessions.get(key)
+            if session and session["session_id"] == session_id:
+                session["expires_at"] = datetime.utcnow() + self._ttl
+
+    def invalidate(self, key: str, session_id: str):
+        """Drop a session Vault no longer accepts (unless it was already replaced)."""
+        with self._lock:
+            session = self._sessions.get(key)
+            if session and session["session_id"] == session_id:
+                del self._sessions[key]
+                self._stats["invalidations"] += 1
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {"cached_sessions": len(self._sessions), "ttl_seconds": self._ttl.total_seconds(), **self._stats}
+
+
+session_cache = VeevaSessionCache()
+
+
+class VeevaClient:
+    """Authenticated calls to one Vault, reusing the cached session."""
+
+    def __init__(
+        self,
+        instance_url: str,
+        username: str,
+        password: str,
+        api_version: str = VEEVA_DEFAULT_API_VERSION,
+        cache_key: Optional[str] = None,
+    ):
+        self.base_url = f"{instance_url.rstrip('/')}/api/{api_version}"
+        self._username = username
+        self._password = password
+        # Keyed by Vault and credentials, so edited credentials never reuse an old session
+        self.cache_key = cache_key or hashlib.sha256(
+            f"{self.base_url}\n{username}\n{password}".encode("utf-8")
+        ).hexdigest()
+
+    @classmethod
+    def from_connection(cls, connection: dict) -> "VeevaClient":
+        """Client for a connection document or payload (config.instanceUrl, credentials.username/password)."""
+        config = connection.get("config") or {}
+        credentials = connection.get("credentials") or {}
+        return cls(
+            instance_url=config.get("instanceUrl"),
+            username=credentials.get("username"),
+            password=credentials.get("password"),
+            api_version=config.get("apiVersion") or VEEVA_DEFAULT_API_VERSION,
+        )
+
+    def _authenticate(self, timeout=None) -> str:
+        """POST /auth and return the session id."""
+        response, _ = http_request(
+            "POST",
+            f"{self.base_url}/auth",
+            data={"username": self._username, "password": self._password},
+            headers={"Accept": "application/json"},
+            timeout=timeout,
+            retry=False,
+        )
+        try:
+            body = response.json()
+        except ValueError:
+            raise VeevaAuthError(f"Vault auth failed with HTTP {response.status_code}")
+        if response.status_code != 200 or body.get("responseStatus") != "SUCCESS":
+            errors = "; ".join(error.get("message", error.get("type", "")) for error in body.get("errors", []))
+            raise VeevaAuthError(errors or f"Vault auth failed with HTTP {response.status_code}")
+        return body["sessionId"]
+
+    @staticmethod
+    def _session_rejected(response: requests.Response) -> bool:
+        """401, or a Vault FAILURE response reporting an invalid or expired session."""
+        if response.status_code == 401:
+            return True
+        if "json" not in response.headers.get("Content-Type", ""):
+            return False
+        try:
+            body = response.json()
+        except ValueError:
+            return False
+        return body.get("responseStatus") == "FAILURE" and any(
+            error.get("type") == "INVALID_SESSION_ID" for error in body.get("errors", [])
+        )
+
+    def request(self, method: str, path: str, **kwargs) -> Tuple[requests.Response, Dict]:
+        """
+        Call base_url + path with the cached session
+        A rejected session is re-authenticated once and the call repeated.
+        Returns (response, timings) like core.http_client.http_request; a
+        timeout given here also applies to the auth call.
+        """
+        headers = {"Accept": "application/json", **(kwargs.pop("headers", None) or {})}
+        timeout = kwargs.get("timeout")
+        for attempt in range(2):
+            session_id = session_cache.get(self.cache_key, lambda: self._authenticate(timeout))
+            response, timings = http_request(
+                method,
+                f"{self.base_url}{path}",
+                headers={**headers, "Authorization": session_id},
+                **kwargs,
+            )
+            if attempt == 0 and self._session_rejected(response):
+                response.close()
+                session_cache.invalidate(self.cache_key, session_id)
+                continue
+            if response.status_code < 400:
+                session_cache.touch(self.cache_key, session_id)
+            return response, timings
+
+    def get(self, path: str, **kwargs) -> Tuple[requests.Response, Dict]:
+        return self.request("GET", path, **kwargs)
+
+
+def get_session_stats() -> Dict:
+    """Veeva session cache counters."""
+    return session_cache.stats()
@@ -0,0 +1,80 @@
+"""Shared fixtures: an in-memory MongoDB (mongomock) and a stub HTTP server."""
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from threading import Thread
+import json
+
+import pytest
+
+
+@pytest.fixture
+def mongo_db(monkeypatch):
+    """A fresh mongomock database served by core.database.get_db()."""
+    mongomock = pytest.importorskip("mongomock")
+    database = pytest.importorskip("core.database")
+    db = mongomock.MongoClient()["texium_test"]
+    monkeypatch.setattr(database, "db", db)
+    return db
+
+
+class StubServer:
+    """
+    Keep-alive HTTP/1.1 server on localhost answering from a handler.
+
+    handler(request) gets {"method", "path", "headers", "body", "client_port"}
+    and returns (status, headers, body); a dict or list body is sent as JSON.
+    Every request is kept in requests, in arrival order.
+    """
+
+    def __init__(self):
+        self.handler = lambda request: (200, {}, {})
+        self.requests = []
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            # Headers and body go out in separate writes; don't let them wait on delayed ACKs
+            disable_nagle_algorithm = True
+
+            def _respond(self):
+                length = int(self.headers.get("Content-Length") or 0)
+                request = {
+                    "method": self.command,
+                    "path": self.path,
+                    "headers": dict(self.headers),
+                    "body": self.rfile.read(length).decode("utf-8") if length else "",
+                    "client_port": self.client_address[1],
+                }
+                stub.requests.append(request)
+                status, headers, body = stub.handler(request)
+                if not isinstance(body, (bytes, str)):
+                    body = json.dumps(body)
+                    headers = {"Content-Type": "application/json", **headers}
+                payload = body.encode("utf-8") if isinstance(body, str) else body
+                self.send_response(status)
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            do_GET = do_POST = do_PUT = do_DELETE = _respond
+
+            def log_message(self, format, *args):
+                pass
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._server.daemon_threads = True
+        self.url = f"http://127.0.0.1:{self._server.server_address[1]}"
+        self._thread = Thread(target=self._server.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True)
+        self._thread.start()
+
+    def close(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+
+@pytest.fixture
+def stub_server():
+    server = StubServer()
+    yield server
+    server.close()
@@ -0,0 +1,111 @@
+"""HttpClient against a local stub server: retries, backoff and connection reuse."""
+import pytest
+
+pytest.importorskip("requests")
+
+from core import http_client  # noqa: E402
+from core.http_client import HttpClient  # noqa: E402
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    """Backoff delays, recorded instead of slept."""
+    delays = []
+    monkeypatch.setattr(http_client.time, "sleep", delays.append)
+    return delays
+
+
+@pytest.fixture
+def client():
+    client = HttpClient(max_retries=2)
+    yield client
+    client.close()
+
+
+def test_retries_503_after_the_retry_after_delay(stub_server, client, sleeps):
+    answers = iter([(503, {"Retry-After": "3"}, "busy"), (200, {}, {"ok": True})])
+    stub_server.handler = lambda request: next(answers)
+
+    response, timings = client.request("GET", f"{stub_server.url}/status")
+
+    assert response.status_code == 200
+    assert response.json() == {"ok": True}
+    assert timings["attempts"] == 2
+    assert sleeps == [3.0]
+    assert timings["backoff_ms"] == 3000.0
+    assert len(stub_server.requests) == 2
+
+
+def test_retry_after_is_capped_by_the_backoff_maximum(stub_server, client, sleeps, monkeypatch):
+    monkeypatch.setattr(http_client, "HTTP_BACKOFF_MAX_SECONDS", 2.0)
+    answers = iter([(429, {"Retry-After": "120"}, "slow down"), (200, {}, "ok")])
+    stub_server.handler = lambda request: next(answers)
+
+    response, _ = client.request("GET", f"{stub_server.url}/limited")
+
+    assert response.status_code == 200
+    assert sleeps == [2.0]
+
+
+def test_malformed_retry_after_falls_back_to_jittered_backoff(stub_server, client, sleeps, monkeypatch):
+    monkeypatch.setattr(http_client, "HTTP_BACKOFF_BASE_SECONDS", 0.5)
+    answers = iter([(503, {"Retry-After": "soon"}, "busy"), (200, {}, "ok")])
+    stub_server.handler = lambda request: next(answers)
+
+    response, timings = client.request("GET", f"{stub_server.url}/status")
+
+    assert response.status_code == 200
+    assert timings["attempts"] == 2
+    assert len(sleeps) == 1
+    assert 0.0 <= sleeps[0] <= 0.5
+
+
+def test_gives_up_after_max_retries(stub_server, client, sleeps):
+    stub_server.handler = lambda request: (503, {}, "down")
+
+    response, timings = client.request("GET", f"{stub_server.url}/down")
+
+    assert response.status_code == 503
+    assert timings["attempts"] == 3
+    assert len(stub_server.requests) == 3
+    assert len(sleeps) == 2
+    assert client.stats()["hosts"][stub_server.url]["retries"] == 2
+
+
+def test_non_idempotent_requests_are_not_retried_by_default(stub_server, client, sleeps):
+    stub_server.handler = lambda request: (503, {}, "down")
+
+    response, timings = client.request("POST", f"{stub_server.url}/orders", json={"id": 1})
+
+    assert response.status_code == 503
+    assert timings["attempts"] == 1
+    assert sleeps == []
+
+
+def test_backoff_jitter_stays_within_the_exponential_bounds(stub_server, sleeps, monkeypatch):
+    monkeypatch.setattr(http_client, "HTTP_BACKOFF_BASE_SECONDS", 0.5)
+    monkeypatch.setattr(http_client, "HTTP_BACKOFF_MAX_SECONDS", 2.0)
+    stub_server.handler = lambda request: (502, {}, "bad gateway")
+    client = HttpClient(max_retries=5)
+    try:
+        for _ in range(20):
+            client.request("GET", f"{stub_server.url}/flaky")
+    finally:
+        client.close()
+
+    bounds = [0.5, 1.0, 2.0, 2.0, 2.0]
+    assert len(sleeps) == 20 * len(bounds)
+    for index, delay in enumerate(sleeps):
+        assert 0.0 <= delay <= bounds[index % len(bounds)]
+    # Full jitter: the delays are spread out, not pinned to the bound
+    assert len(set(sleeps)) > len(bounds)
+
+
+def test_sequential_calls_reuse_one_connection(stub_server, client):
+    stub_server.handler = lambda request: (200, {}, {"path": request["path"]})
+
+    timings = [client.request("GET", f"{stub_server.url}/items/{index}")[1] for index in range(5)]
+
+    assert [t["new_connections"] for t in timings] == [1, 0, 0, 0, 0]
+    assert len({request["client_port"] for request in stub_server.requests}) == 1
+    assert client.stats()["hosts"][stub_server.url]["new_connections"] == 1
@@ -0,0 +1,131 @@
+"""Two schedulers sharing one database: leadership handover and run-once fire claims."""
+from datetime import datetime, timedelta, timezone
+import threading
+
+import pytest
+
+pytest.importorskip("apscheduler")
+
+from models.lease import SchedulerFireClaim, SchedulerLease  # noqa: E402
+from services.leader_election import LeaderElector  # noqa: E402
+from services.scheduler_service import FireTimeThreadPoolExecutor, SchedulerService  # noqa: E402
+
+LEASE = "scheduler-test"
+JOB_ID = "64b000000000000000000001"
+
+
+class FakeScheduler:
+    """One scheduler process: its elector and the runs it actually started."""
+
+    def __init__(self, owner: str, runs: list):
+        self.owner = owner
+        self.runs = runs
+        self.elector = LeaderElector(
+            LEASE,
+            on_elected=lambda: None,
+            on_demoted=lambda: None,
+            ttl_seconds=30,
+            heartbeat_seconds=3600,
+            owner=owner,
+        )
+
+    def fire(self, monkeypatch, fire_time: datetime):
+        """Run the APScheduler entry point as this process would for fire_time."""
+        monkeypatch.setattr(SchedulerService, "_instance_id", self.owner)
+        SchedulerService._run_job_from_scheduler(JOB_ID, fire_time)
+
+
+@pytest.fixture
+def schedulers(mongo_db, monkeypatch):
+    runs = []
+    monkeypatch.setattr(
+        SchedulerService,
+        "_execute_job",
+        staticmethod(lambda job_id, trigger_type="manual": runs.append((SchedulerService._instance_id, job_id))),
+    )
+    return FakeScheduler("worker-a", runs), FakeScheduler("worker-b", runs), runs
+
+
+def expire_lease(mongo_db):
+    mongo_db[SchedulerLease.COLLECTION].update_one(
+        {"_id": LEASE}, {"$set": {"expires_at": datetime.utcnow() - timedelta(seconds=1)}}
+    )
+
+
+def test_follower_takes_over_only_after_lease_expires(mongo_db, schedulers):
+    a, b, _ = schedulers
+
+    a.elector.tick()
+    b.elector.tick()
+    assert a.elector.is_leader and not b.elector.is_leader
+
+    # The leader stops renewing (e.g. it hangs); nothing changes until the lease expires
+    b.elector.tick()
+    assert not b.elector.is_leader
+
+    expire_lease(mongo_db)
+    b.elector.tick()
+    assert b.elector.is_leader
+    assert SchedulerLease.find_lease(LEASE)["owner"] == "worker-b"
+
+    # The old leader notices on its next heartbeat
+    a.elector.tick()
+    assert not a.elector.is_leader
+    assert a.elector.status()["demoted"] == 1
+
+
+def test_each_fire_runs_once_across_a_handover(mongo_db, schedulers, monkeypatch):
+    a, b, runs = schedulers
+    t1 = datetime(2026, 1, 1, 12, 0, 0, tzinfo=timezone.utc)
+    t2 = t1 + timedelta(minutes=1)
+    t3 = t2 + timedelta(seconds=10)
+
+    a.elector.tick()
+    b.elector.tick()
+    a.fire(monkeypatch, t1)
+
+    expire_lease(mongo_db)
+    b.elector.tick()
+    assert a.elector.is_leader and b.elector.is_leader  # overlap until a's next heartbeat
+
+    # Both fire t2 during the overlap, a late enough to cross into the next minute;
+    # b also catches up on t1, which a already ran
+    b.fire(monkeypatch, t2)
+    a.fire(monkeypatch, t2)
+    b.fire(monkeypatch, t1)
+    a.elector.tick()
+    # A sub-minute schedule fires again ten seconds later
+    b.fire(monkeypatch, t3)
+
+    assert runs == [("worker-a", JOB_ID), ("worker-b", JOB_ID), ("worker-b", JOB_ID)]
+    claims = {
+        claim["fire_time"]: claim["owner"]
+        for claim in mongo_db[SchedulerFireClaim.COLLECTION].find({"job_id": JOB_ID})
+    }
+    assert claims == {
+        t1.replace(tzinfo=None): "worker-a",
+        t2.replace(tzinfo=None): "worker-b",
+        t3.replace(tzinfo=None): "worker-b",
+    }
+
+
+def test_executor_passes_the_scheduled_fire_time():
+    from apscheduler.schedulers.background import BackgroundScheduler
+
+    received = []
+    ran = threading.Event()
+    run_date = datetime.now(timezone.utc).replace(microsecond=0) + timedelta(seconds=1)
+
+    def job(job_id, scheduled_run_time=None):
+        received.append((job_id, scheduled_run_time))
+        ran.set()
+
+    scheduler = BackgroundScheduler(timezone="UTC", executors={"default": FireTimeThreadPoolExecutor()})
+    scheduler.start()
+    try:
+        scheduler.add_job(job, trigger="date", run_date=run_date, args=[JOB_ID])
+        assert ran.wait(5)
+    finally:
+        scheduler.shutdown(wait=True)
+
+    assert received == [(JOB_ID, run_date)]
@@ -0,0 +1,172 @@
+"""VeevaClient against a fake Vault: session reuse, expiry and re-authentication."""
+from datetime import datetime, timedelta
+from urllib.parse import parse_qs
+
+import pytest
+
+pytest.importorskip("requests")
+
+from core.http_client import close_http_client  # noqa: E402
+from services import veeva_client  # noqa: E402
+from services.veeva_client import VeevaAuthError, VeevaClient, VeevaSessionCache  # noqa: E402
+
+TTL_SECONDS = 900
+
+
+class FakeVault:
+    """Issues session ids on /auth and accepts them until revoked."""
+
+    def __init__(self, password: str = "secret"):
+        self.password = password
+        self.sessions = set()
+        self.issued = 0
+        self.accept_sessions = True
+
+    def __call__(self, request):
+        if request["path"].endswith("/auth"):
+            form = parse_qs(request["body"])
+            if form.get("password") != [self.password]:
+                return 200, {}, {
+                    "responseStatus": "FAILURE",
+                    "errors": [{"type": "USERNAME_OR_PASSWORD_INCORRECT", "message": "Authentication failed"}],
+                }
+            self.issued += 1
+            session_id = f"session-{self.issued}"
+            self.sessions.add(session_id)
+            return 200, {}, {"responseStatus": "SUCCESS", "sessionId": session_id}
+
+        if not self.accept_sessions or request["headers"].get("Authorization") not in self.sessions:
+            # Vault reports an expired session as a 200 FAILURE, not a 401
+            return 200, {}, {
+                "responseStatus": "FAILURE",
+                "errors": [{"type": "INVALID_SESSION_ID", "message": "Invalid or expired session ID."}],
+            }
+        return 200, {}, {"responseStatus": "SUCCESS", "data": []}
+
+    def revoke_all(self):
+        self.sessions.clear()
+
+
+class Clock:
+    """Stands in for datetime in the session cache."""
+
+    def __init__(self):
+        self.now = datetime(2026, 1, 1, 12, 0, 0)
+
+    def utcnow(self):
+        return self.now
+
+    def advance(self, seconds: float):
+        self.now += timedelta(seconds=seconds)
+
+
+@pytest.fixture
+def vault(stub_server):
+    fake = FakeVault()
+    stub_server.handler = fake
+    yield fake
+    close_http_client()
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(veeva_client, "datetime", clock)
+    return clock
+
+
+@pytest.fixture
+def cache(monkeypatch, clock):
+    cache = VeevaSessionCache(ttl_seconds=TTL_SECONDS)
+    monkeypatch.setattr(veeva_client, "session_cache", cache)
+    return cache
+
+
+def make_client(stub_server, password: str = "secret") -> VeevaClient:
+    return VeevaClient.from_connection({
+        "config": {"instanceUrl": stub_server.url},
+        "credentials": {"username": "integration@example.com", "password": password},
+    })
+
+
+def auth_calls(stub_server) -> int:
+    return sum(1 for request in stub_server.requests if request["path"].endswith("/auth"))
+
+
+def test_session_is_reused_across_calls_and_clients(stub_server, vault, cache):
+    for _ in range(3):
+        response, _ = make_client(stub_server).get("/objects/documents?limit=1")
+        assert response.json()["responseStatus"] == "SUCCESS"
+
+    assert auth_calls(stub_server) == 1
+    authorizations = {r["headers"].get("Authorization") for r in stub_server.requests if not r["path"].endswith("/auth")}
+    assert authorizations == {"session-1"}
+    assert cache.stats()["hits"] == 2
+
+
+def test_expiry_slides_with_use_and_lapses_when_idle(stub_server, vault, cache, clock):
+    client = make_client(stub_server)
+    client.get("/objects/documents")
+
+    # Each successful call extends the session
+    clock.advance(TTL_SECONDS - 1)
+    client.get("/objects/documents")
+    clock.advance(TTL_SECONDS - 1)
+    client.get("/objects/documents")
+    assert auth_calls(stub_server) == 1
+
+    # Left idle past the TTL, it is not reused
+    clock.advance(TTL_SECONDS + 1)
+    client.get("/objects/documents")
+    assert auth_calls(stub_server) == 2
+    assert stub_server.requests[-1]["headers"]["Authorization"] == "session-2"
+
+
+def test_invalid_session_is_reauthenticated_once(stub_server, vault, cache):
+    client = make_client(stub_server)
+    client.get("/objects/documents")
+
+    # Vault dropped the session before the cache expired it
+    vault.revoke_all()
+    response, _ = client.get("/objects/documents")
+
+    assert response.json()["responseStatus"] == "SUCCESS"
+    assert auth_calls(stub_server) == 2
+    assert stub_server.requests[-1]["headers"]["Authorization"] == "session-2"
+    assert cache.stats()["invalidations"] == 1
+
+
+def test_a_session_rejected_twice_is_returned_without_looping(stub_server, vault, cache):
+    client = make_client(stub_server)
+    vault.accept_sessions = False
+
+    response, _ = client.get("/objects/documents")
+
+    assert response.json()["errors"][0]["type"] == "INVALID_SESSION_ID"
+    assert auth_calls(stub_server) == 2
+
+
+def test_bad_credentials_raise_and_are_not_cached(stub_server, vault, cache):
+    client = make_client(stub_server, password="wrong")
+
+    for _ in range(2):
+        with pytest.raises(VeevaAuthError, match="Authentication failed"):
+            client.get("/objects/documents")
+
+    assert auth_calls(stub_server) == 2
+    assert cache.stats()["auth_failures"] == 2
+    assert cache.stats()["cached_sessions"] == 0
+
+
+def test_timeout_applies_to_the_auth_call(stub_server, vault, cache, monkeypatch):
+    timeouts = []
+    http_request = veeva_client.http_request
+
+    def recording_request(method, url, **kwargs):
+        timeouts.append((url.rsplit("/", 1)[-1], kwargs.get("timeout")))
+        return http_request(method, url, **kwargs)
+
+    monkeypatch.setattr(veeva_client, "http_request", recording_request)
+    make_client(stub_server).get("/objects/documents", timeout=(1.0, 2.0))
+
+    assert timeouts == [("auth", (1.0, 2.0)), ("documents", (1.0, 2.0))]